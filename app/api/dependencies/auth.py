@@ -1,16 +1,33 @@
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBasic, HTTPBasicCredentials
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import (
+    HTTPAuthorizationCredentials,
+    HTTPBasic,
+    HTTPBasicCredentials,
+    HTTPBearer,
+)
+from app.api.dependencies.rate_limit import get_rate_limiter, limit_account
 from app.api.dependencies.services import get_users_service
+from app.infrastructure.rate_limiter import RateLimiter
+from app.infrastructure.tokens import TokenSigner
 from app.services.users_service import UsersService
 
 
 security = HTTPBasic()
+optional_basic = HTTPBasic(auto_error=False)
+optional_bearer = HTTPBearer(auto_error=False)
 
 
-async def get_current_user_id(
+def get_token_signer(request: Request) -> TokenSigner:
+    return request.app.state.token_signer
+
+
+async def get_basic_user_id(
     credentials: HTTPBasicCredentials = Depends(security),
     service: UsersService = Depends(get_users_service),
+    limiter: RateLimiter | None = Depends(get_rate_limiter),
 ) -> int:
+    # Before bcrypt, so guessing one account's password stays cheap to refuse
+    await limit_account(limiter, f"email:{credentials.username.lower()}")
     user_id = await service.verify_credentials(
         credentials.username,
         credentials.password,
@@ -19,3 +36,35 @@ async def get_current_user_id(
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
 
     return user_id
+
+
+async def get_current_user_id(
+    token: HTTPAuthorizationCredentials | None = Depends(optional_bearer),
+    credentials: HTTPBasicCredentials | None = Depends(optional_basic),
+    signer: TokenSigner = Depends(get_token_signer),
+    service: UsersService = Depends(get_users_service),
+    limiter: RateLimiter | None = Depends(get_rate_limiter),
+) -> int:
+    """
+    Bearer token when one is given (HMAC check, no bcrypt, no DB),
+    otherwise HTTP Basic.
+    """
+    if token is not None:
+        user_id = signer.verify(token.credentials)
+        if user_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired token",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        await limit_account(limiter, f"user:{user_id}")
+        return user_id
+
+    if credentials is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Basic"},
+        )
+
+    return await get_basic_user_id(credentials, service, limiter)
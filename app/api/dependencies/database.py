@@ -1,6 +1,14 @@
+from typing import AsyncIterator
+
 from fastapi import Request
 from app.infrastructure.database import Database
 
 
 def get_db(request: Request) -> Database:
     return request.app.state.db
+
+
+async def get_request_connection(request: Request) -> AsyncIterator[None]:
+    """Request-scoped unit of work: one pooled connection per request."""
+    async with get_db(request).request_scope():
+        yield
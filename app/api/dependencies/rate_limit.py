@@ -0,0 +1,29 @@
+from fastapi import Depends, Request
+
+from app.api.models.user import UserCreateRequest
+from app.infrastructure.rate_limiter import RateLimiter
+
+
+def get_rate_limiter(request: Request) -> RateLimiter | None:
+    return request.app.state.rate_limiter
+
+
+async def limit_client(
+    request: Request,
+    limiter: RateLimiter | None = Depends(get_rate_limiter),
+) -> None:
+    """Per client address; runs before authentication and hashing."""
+    if limiter is not None and request.client is not None:
+        await limiter.check("client", request.client.host)
+
+
+async def limit_account(limiter: RateLimiter | None, account: str) -> None:
+    if limiter is not None:
+        await limiter.check("account", account)
+
+
+async def limit_registration(
+    payload: UserCreateRequest,
+    limiter: RateLimiter | None = Depends(get_rate_limiter),
+) -> None:
+    await limit_account(limiter, f"email:{payload.email.lower()}")
@@ -1,3 +1,5 @@
+from typing import cast
+
 from fastapi.responses import JSONResponse
 from fastapi import FastAPI, Request, status
 
@@ -7,8 +9,11 @@ from app.domain.exceptions import (
     InvalidCredentials,
     InvalidActivationCode,
     ActivationCodeExpired,
-    UserAlreadyActive
+    UserAlreadyActive,
+    IdempotencyKeyReused,
 )
+from app.infrastructure.database import DatabaseOverloaded
+from app.infrastructure.rate_limiter import RateLimited
 
 
 def register_exception_handlers(app: FastAPI) -> None:
@@ -22,6 +27,11 @@ def register_exception_handlers(app: FastAPI) -> None:
         ActivationCodeExpired, activation_code_expired_handler
     )
     app.add_exception_handler(UserAlreadyActive, user_already_active_handler)
+    app.add_exception_handler(
+        IdempotencyKeyReused, idempotency_key_reused_handler
+    )
+    app.add_exception_handler(DatabaseOverloaded, database_overloaded_handler)
+    app.add_exception_handler(RateLimited, rate_limited_handler)
 
 
 def domain_error_handler(_: Request, exc: Exception) -> JSONResponse:
@@ -65,3 +75,29 @@ def user_already_active_handler(_: Request, exc: Exception) -> JSONResponse:
         status_code=status.HTTP_409_CONFLICT,
         content={"detail": "User is already active"},
     )
+
+
+def idempotency_key_reused_handler(_: Request, exc: Exception) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        content={"detail": "Idempotency-Key already used for another request"},
+    )
+
+
+def database_overloaded_handler(_: Request, exc: Exception) -> JSONResponse:
+    # Starlette types handlers with Exception; only DatabaseOverloaded lands here
+    retry_after = cast(DatabaseOverloaded, exc).retry_after
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Service overloaded, retry later"},
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+def rate_limited_handler(_: Request, exc: Exception) -> JSONResponse:
+    retry_after = cast(RateLimited, exc).retry_after
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": "Too many requests"},
+        headers={"Retry-After": str(retry_after)},
+    )
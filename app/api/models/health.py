@@ -3,3 +3,17 @@ from pydantic import BaseModel
 
 class HealthResponse(BaseModel):
     status: str = "ok"
+
+
+class PoolStatsResponse(BaseModel):
+    size: int
+    free: int
+    used: int
+    waiting: int
+    max_size: int
+
+
+class ReadinessResponse(BaseModel):
+    status: str
+    database_reachable: bool | None
+    pool: PoolStatsResponse | None
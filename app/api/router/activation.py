@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends
 
 from app.services.users_service import UsersService
 from app.api.dependencies.auth import get_current_user_id
+from app.api.dependencies.rate_limit import limit_client
 from app.api.dependencies.services import get_users_service
 from app.api.models.activation import (
     ActivateAccountRequest,
@@ -11,6 +12,7 @@ from app.api.models.activation import (
 router = APIRouter(
     prefix="/activation",
     tags=["activation"],
+    dependencies=[Depends(limit_client)],
 )
 
 
@@ -25,7 +27,8 @@ async def activate_account(
 ) -> ActivateAccountResponse:
     """
     Activate a user account using a 4-digit code.
-    Basic Auth is used to identify the user.
+    The user is identified by a bearer token from /auth/token,
+    or by Basic Auth.
     """
     await service.activate(user_id, payload.code)
 
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends
+
+from app.api.dependencies.auth import get_basic_user_id, get_token_signer
+from app.api.dependencies.rate_limit import limit_client
+from app.api.models.auth import TokenResponse
+from app.infrastructure.tokens import TokenSigner
+
+router = APIRouter(
+    prefix="/auth",
+    tags=["auth"],
+    dependencies=[Depends(limit_client)],
+)
+
+
+@router.post(
+    "/token",
+    response_model=TokenResponse,
+)
+async def create_token(
+    user_id: int = Depends(get_basic_user_id),
+    signer: TokenSigner = Depends(get_token_signer),
+) -> TokenResponse:
+    """
+    Exchange Basic Auth credentials for a short-lived bearer token,
+    so later calls skip the bcrypt check.
+    """
+    return TokenResponse(
+        access_token=signer.issue(user_id),
+        expires_in=signer.ttl_seconds,
+    )
@@ -1,6 +1,14 @@
-from fastapi import APIRouter
+from dataclasses import asdict
 
-from app.api.models.health import HealthResponse
+from fastapi import APIRouter, Depends, Response, status
+
+from app.api.models.health import (
+    HealthResponse,
+    PoolStatsResponse,
+    ReadinessResponse,
+)
+from app.api.dependencies.database import get_db
+from app.infrastructure.database import Database
 
 router = APIRouter(
     prefix="/health",
@@ -14,3 +22,41 @@ router = APIRouter(
 )
 async def healthcheck() -> HealthResponse:
     return HealthResponse()
+
+
+@router.get(
+    "/ready",
+    response_model=ReadinessResponse,
+    responses={status.HTTP_503_SERVICE_UNAVAILABLE: {"model": ReadinessResponse}},
+)
+async def readiness(
+    response: Response,
+    db: Database = Depends(get_db),
+) -> ReadinessResponse:
+    """
+    Ready when the pool has a connection to spare and MySQL answers (cached
+    ping). A saturated pool is reported without pinging: the ping would
+    queue behind requests and time out as if MySQL were down. Without a
+    pool (in-memory backend) only liveness is reported.
+    """
+    if db.pool is None:
+        return ReadinessResponse(status="ok", database_reachable=None, pool=None)
+
+    stats = db.pool_stats()
+    if stats.saturated:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return ReadinessResponse(
+            status="saturated",
+            database_reachable=None,
+            pool=PoolStatsResponse(**asdict(stats)),
+        )
+
+    reachable = await db.ping()
+    if not reachable:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    return ReadinessResponse(
+        status="ok" if reachable else "unavailable",
+        database_reachable=reachable,
+        pool=PoolStatsResponse(**asdict(stats)),
+    )
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+
+from app.infrastructure.metrics import DB_POOL_CONNECTIONS, REGISTRY
+
+router = APIRouter(
+    tags=["metrics"],
+)
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+)
+async def metrics(request: Request) -> PlainTextResponse:
+    stats = request.app.state.db.pool_stats()
+    DB_POOL_CONNECTIONS.set(stats.size, "total")
+    DB_POOL_CONNECTIONS.set(stats.free, "free")
+    DB_POOL_CONNECTIONS.set(stats.used, "used")
+    DB_POOL_CONNECTIONS.set(stats.waiting, "waiting")
+
+    return PlainTextResponse(
+        REGISTRY.render(),
+        media_type="text/plain; version=0.0.4",
+    )
@@ -1,5 +1,6 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, Header, status, Depends
 
+from app.api.dependencies.rate_limit import limit_client, limit_registration
 from app.api.dependencies.services import get_users_service
 from app.services.users_service import UsersService
 from app.api.models.user import (
@@ -11,6 +12,7 @@ from app.api.models.user import (
 router = APIRouter(
     prefix="/users",
     tags=["users"],
+    dependencies=[Depends(limit_client)],
 )
 
 
@@ -18,18 +20,24 @@ router = APIRouter(
     "/register",
     response_model=UserCreateResponse,
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(limit_registration)],
 )
 async def register_user(
     payload: UserCreateRequest,
-    service: UsersService = Depends(get_users_service)
+    service: UsersService = Depends(get_users_service),
+    idempotency_key: str | None = Header(
+        default=None, alias="Idempotency-Key", max_length=255
+    ),
 ) -> UserCreateResponse:
     """
     Create a new user and send an activation code by email.
+    Retries sent with the same Idempotency-Key replay the first outcome.
     """
     try:
         await service.register(
             email=payload.email,
             password=payload.password,
+            idempotency_key=idempotency_key,
         )
     except ValueError as e:
         if str(e) == "USER_ALREADY_EXISTS":
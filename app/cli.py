@@ -0,0 +1,79 @@
+"""
+Operational commands, run from the repository root:
+
+    python -m app.cli migrate
+    python -m app.cli reap-activation-codes
+    python -m app.cli calibrate-bcrypt
+"""
+import argparse
+import asyncio
+
+from app.settings import get_settings
+from app.domain.security import calibrate_rounds
+from app.infrastructure.logging import setup_logging, shutdown_logging
+from app.infrastructure.database import Database
+from app.infrastructure.migrate_db import migrate_database
+from app.infrastructure.repositories.unit_of_work import MySQLUnitOfWork
+from app.services.activation_code_reaper import ActivationCodeReaper
+
+
+async def migrate() -> None:
+    database = Database(get_settings())
+    await database.connect()
+    try:
+        await migrate_database(database)
+    finally:
+        await database.disconnect()
+
+
+async def reap_activation_codes() -> None:
+    settings = get_settings()
+    database = Database(settings)
+    await database.connect()
+    try:
+        reaper = ActivationCodeReaper(MySQLUnitOfWork(database), settings)
+        result = await reaper.run_once()
+        print(
+            f"purged={result.purged} outbox_purged={result.outbox_purged} "
+            f"batches={result.batches} "
+            f"duration={result.duration_seconds:.3f}s"
+        )
+    finally:
+        await database.disconnect()
+
+
+async def calibrate_bcrypt() -> None:
+    settings = get_settings()
+    recommended, timings = await asyncio.to_thread(
+        calibrate_rounds, settings.bcrypt_target_seconds
+    )
+    for rounds, seconds in timings.items():
+        print(f"rounds={rounds} hash={seconds * 1000:.1f}ms")
+    print(
+        f"recommended BCRYPT_ROUNDS={recommended} "
+        f"(target {settings.bcrypt_target_seconds * 1000:.0f}ms, "
+        f"configured {settings.bcrypt_rounds})"
+    )
+
+
+COMMANDS = {
+    "migrate": migrate,
+    "reap-activation-codes": reap_activation_codes,
+    "calibrate-bcrypt": calibrate_bcrypt,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    parser.add_argument("command", choices=COMMANDS)
+    args = parser.parse_args()
+
+    setup_logging(get_settings())
+    try:
+        asyncio.run(COMMANDS[args.command]())
+    finally:
+        shutdown_logging()
+
+
+if __name__ == "__main__":
+    main()
@@ -20,3 +20,7 @@ class ActivationCodeExpired(DomainError):
 
 class UserAlreadyActive(DomainError):
     pass
+
+
+class IdempotencyKeyReused(DomainError):
+    pass
@@ -1,9 +1,107 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import AbstractContextManager, nullcontext
+from typing import Callable
+
 import bcrypt
 
+from app.settings import AppSettings
+
+
+# Called with the operation ("hash" or "verify"); times the block it wraps
+OperationTimer = Callable[[str], AbstractContextManager[None]]
+
+
+DEFAULT_BCRYPT_ROUNDS = 12
 
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+
+def hash_password(password: str, rounds: int = DEFAULT_BCRYPT_ROUNDS) -> str:
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds)).decode()
 
 
 def verify_password(password: str, hashed: str) -> bool:
     return bcrypt.checkpw(password.encode(), hashed.encode())
+
+
+def hash_rounds(hashed: str) -> int | None:
+    """Cost factor of a ``$2b$<rounds>$...`` hash, None if unrecognised."""
+    parts = hashed.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def calibrate_rounds(
+    target_seconds: float, min_rounds: int = 10, max_rounds: int = 16
+) -> tuple[int, dict[int, float]]:
+    """
+    Time one hash per cost factor, from ``min_rounds`` up until a hash takes
+    longer than ``target_seconds``. Returns the highest cost that stays
+    within the target (never below ``min_rounds``) and the timings.
+    """
+    timings: dict[int, float] = {}
+    recommended = min_rounds
+    for rounds in range(min_rounds, max_rounds + 1):
+        started = time.perf_counter()
+        hash_password("calibration-password", rounds)
+        timings[rounds] = time.perf_counter() - started
+        if timings[rounds] > target_seconds:
+            break
+        recommended = rounds
+    return recommended, timings
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt off the event loop.
+    bcrypt releases the GIL, so a thread pool is enough in most cases;
+    a process pool can be selected through settings.
+    New hashes use ``bcrypt_rounds``; hashes with another cost are reported
+    by ``needs_rehash`` so they can be upgraded on the next login.
+    ``timer`` wraps every hash and verify, e.g. to record their latency.
+    """
+
+    def __init__(self, settings: AppSettings, timer: OperationTimer | None = None):
+        self.rounds = settings.bcrypt_rounds
+        self._timer: OperationTimer = timer or (lambda _: nullcontext())
+        self._kind = settings.password_hasher_executor
+        self._max_workers = settings.password_hasher_max_workers
+        self._executor: Executor | None = None
+
+    def start(self) -> None:
+        if self._executor is not None:
+            return
+
+        if self._kind == "process":
+            self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers,
+                thread_name_prefix="password-hasher",
+            )
+
+    def shutdown(self) -> None:
+        if self._executor is None:
+            return
+
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._executor = None
+
+    async def hash_password(self, password: str) -> str:
+        loop = asyncio.get_running_loop()
+        with self._timer("hash"):
+            return await loop.run_in_executor(
+                self._executor, hash_password, password, self.rounds
+            )
+
+    async def verify_password(self, password: str, hashed: str) -> bool:
+        loop = asyncio.get_running_loop()
+        with self._timer("verify"):
+            return await loop.run_in_executor(
+                self._executor, verify_password, password, hashed
+            )
+
+    def needs_rehash(self, hashed: str) -> bool:
+        rounds = hash_rounds(hashed)
+        return rounds is not None and rounds != self.rounds
@@ -0,0 +1,58 @@
+import hashlib
+import hmac
+import secrets
+from dataclasses import dataclass
+
+from app.infrastructure.cache import TTLCache
+from app.settings import AppSettings
+
+
+@dataclass(frozen=True, slots=True)
+class CachedCredential:
+    user_id: int
+    hashed_password: str
+
+
+class CredentialCache:
+    """
+    Remembers recently verified (email, password) pairs so repeated Basic
+    Auth calls skip bcrypt. Keys are HMACs under a per-process secret, so
+    plain passwords never sit in memory. An entry is only trusted while the
+    stored hashed_password it was verified against is unchanged.
+    """
+
+    def __init__(self, settings: AppSettings):
+        self._key = secrets.token_bytes(32)
+        self._cache: TTLCache[bytes, CachedCredential] = TTLCache(
+            max_entries=settings.credential_cache_max_entries,
+            ttl_seconds=settings.credential_cache_ttl_seconds,
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def _cache_key(self, email: str, password: str) -> bytes:
+        message = email.encode() + b"\x00" + password.encode()
+        return hmac.new(self._key, message, hashlib.sha256).digest()
+
+    def lookup(self, email: str, password: str, hashed_password: str) -> int | None:
+        key = self._cache_key(email, password)
+        cached = self._cache.get(key)
+        if cached is None:
+            self.misses += 1
+            return None
+
+        if not hmac.compare_digest(cached.hashed_password, hashed_password):
+            self._cache.pop(key)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return cached.user_id
+
+    def store(
+        self, email: str, password: str, user_id: int, hashed_password: str
+    ) -> None:
+        self._cache.set(
+            self._cache_key(email, password),
+            CachedCredential(user_id=user_id, hashed_password=hashed_password),
+        )
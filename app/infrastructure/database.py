@@ -1,20 +1,79 @@
 import aiomysql
+import asyncio
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
 from typing import AsyncIterator
 import logging
+import time
 
 from app.settings import AppSettings
+from app.infrastructure.metrics import DB_POOL_WAIT_DURATION, DB_REQUESTS_SHED
 
 
 logger = logging.getLogger(__name__)
 
 
+class DatabaseOverloaded(Exception):
+    """No pooled connection could be obtained within the admission limits."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"Database pool saturated ({reason})")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True, slots=True)
+class PoolStats:
+    size: int
+    free: int
+    used: int
+    waiting: int
+    max_size: int
+
+    @property
+    def saturated(self) -> bool:
+        """
+        Every connection is checked out, so new requests would queue.
+        Waiters alone don't count: below ``max_size`` they may just be
+        waiting for the pool to open a new connection.
+        """
+        return self.size >= self.max_size and self.free == 0
+
+
+class _RequestConnection:
+    """Connection lazily checked out once and shared for a whole request."""
+
+    def __init__(self, db: "Database"):
+        self.db = db
+        self.owner = asyncio.current_task()
+        self.conn: aiomysql.Connection | None = None
+        self.active = True
+
+    def serves(self, db: "Database") -> bool:
+        # Tasks spawned during the request inherit the context variable but
+        # must not use the same connection concurrently.
+        return (
+            self.active
+            and self.db is db
+            and self.owner is asyncio.current_task()
+        )
+
+
+_request_connection: ContextVar[_RequestConnection | None] = ContextVar(
+    "request_connection", default=None
+)
+
+
 class Database:
     """Handles MySQL connection pool"""
 
     def __init__(self, settings: AppSettings):
         self.settings = settings
         self.pool: aiomysql.Pool | None = None
+        self._waiting = 0
+        self._ping_lock = asyncio.Lock()
+        self._last_ping: tuple[float, bool] | None = None
 
     async def connect(self):
         if self.settings.environment == "test":
@@ -31,6 +90,7 @@ class Database:
             maxsize=self.settings.db_pool_max_size,
             autocommit=False,
             charset="utf8mb4",
+            pool_recycle=self.settings.db_pool_recycle_seconds,
         )
 
         logger.info("Database pool created successfully")
@@ -41,13 +101,168 @@ class Database:
             await self.pool.wait_closed()
             logger.info("Database pool closed")
 
+    async def warm_up(self) -> None:
+        """
+        Check out ``minsize`` connections at once and ping each of them, so
+        the first requests neither open connections nor hit stale ones.
+        """
+        if not self.pool:
+            return
+
+        started = time.perf_counter()
+        conns = await asyncio.gather(
+            *(self.pool.acquire() for _ in range(self.pool.minsize))
+        )
+        try:
+            await asyncio.gather(*(conn.ping() for conn in conns))
+        finally:
+            for conn in conns:
+                await self._release(conn)
+        logger.info(
+            "Database pool warmed up with %d connections in %.3fs",
+            len(conns),
+            time.perf_counter() - started,
+        )
+
+    def pool_stats(self) -> PoolStats:
+        if not self.pool:
+            return PoolStats(
+                size=0, free=0, used=0, waiting=self._waiting, max_size=0
+            )
+
+        return PoolStats(
+            size=self.pool.size,
+            free=self.pool.freesize,
+            used=self.pool.size - self.pool.freesize,
+            waiting=self._waiting,
+            max_size=self.pool.maxsize,
+        )
+
+    async def ping(self) -> bool:
+        """
+        Whether MySQL answers a ping. The result is cached for
+        ``db_ping_cache_seconds`` so probes from many load balancers cost at
+        most one round trip per interval.
+        """
+        if not self.pool:
+            return False
+
+        async with self._ping_lock:
+            now = time.monotonic()
+            if (
+                self._last_ping is not None
+                and now - self._last_ping[0] < self.settings.db_ping_cache_seconds
+            ):
+                return self._last_ping[1]
+
+            try:
+                await asyncio.wait_for(
+                    self._ping(), self.settings.db_ping_timeout_seconds
+                )
+                reachable = True
+            except Exception:
+                logger.warning("Database ping failed", exc_info=True)
+                reachable = False
+
+            self._last_ping = (time.monotonic(), reachable)
+            return reachable
+
+    async def _ping(self) -> None:
+        # Bypasses admission control: probes must not count as shed traffic.
+        conn = await self._require_pool().acquire()
+        try:
+            await conn.ping(reconnect=False)
+        finally:
+            await self._release(conn)
+
+    def _shed(self, reason: str) -> DatabaseOverloaded:
+        DB_REQUESTS_SHED.inc(reason)
+        return DatabaseOverloaded(
+            reason, self.settings.db_overload_retry_after_seconds
+        )
+
+    async def _acquire(self) -> aiomysql.Connection:
+        """
+        Check out a connection, waiting at most
+        ``db_pool_acquire_timeout_seconds`` behind at most
+        ``db_pool_max_waiting`` other callers.
+        """
+        if self._waiting >= self.settings.db_pool_max_waiting:
+            raise self._shed("queue_full")
+
+        pool = self._require_pool()
+        self._waiting += 1
+        started = time.perf_counter()
+        try:
+            return await asyncio.wait_for(
+                pool.acquire(),
+                self.settings.db_pool_acquire_timeout_seconds,
+            )
+        except asyncio.TimeoutError:
+            raise self._shed("timeout") from None
+        finally:
+            self._waiting -= 1
+            DB_POOL_WAIT_DURATION.observe(time.perf_counter() - started)
+
+    @asynccontextmanager
+    async def request_scope(self) -> AsyncIterator[None]:
+        """
+        Share at most one pooled connection between everything that runs in
+        the current request. The connection is only acquired on first use
+        and is released when the scope exits or by
+        ``release_request_connection``.
+        """
+        scope = _RequestConnection(self)
+        _request_connection.set(scope)
+        try:
+            yield
+        finally:
+            scope.active = False
+            if scope.conn is not None:
+                await self._release(scope.conn)
+
+    async def release_request_connection(self) -> None:
+        """
+        Hand the request's connection back to the pool before slow work that
+        needs no database (password hashing); the next query in the request
+        checks out a connection again.
+        """
+        scope = _request_connection.get()
+        if scope is None or not scope.serves(self) or scope.conn is None:
+            return
+
+        conn, scope.conn = scope.conn, None
+        await self._release(conn)
+
+    def _require_pool(self) -> aiomysql.Pool:
+        if self.pool is None:
+            raise RuntimeError("Database pool not initialized")
+        return self.pool
+
+    async def _release(self, conn: aiomysql.Connection) -> None:
+        # aiomysql closes connections released with an open transaction,
+        # which plain reads leave behind when autocommit is off.
+        if conn.get_transaction_status():
+            await conn.rollback()
+        await self._require_pool().release(conn)
+
     @asynccontextmanager
     async def get_connection(self) -> AsyncIterator[aiomysql.Connection]:
         if not self.pool:
             raise RuntimeError("Database pool not initialized")
 
-        async with self.pool.acquire() as conn:
+        scope = _request_connection.get()
+        if scope is not None and scope.serves(self):
+            if scope.conn is None:
+                scope.conn = await self._acquire()
+            yield scope.conn
+            return
+
+        conn = await self._acquire()
+        try:
             yield conn
+        finally:
+            await self._release(conn)
 
     @asynccontextmanager
     async def transaction(self) -> AsyncIterator[aiomysql.Connection]:
@@ -0,0 +1,237 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from enum import Enum
+from typing import Awaitable, Callable
+
+from app.settings import AppSettings
+from app.infrastructure.email.client import EmailMessage
+from app.infrastructure.email.exceptions import (
+    EmailCircuitOpen,
+    EmailProviderUnavailable,
+)
+from app.infrastructure.metrics import EMAIL_CIRCUIT_STATE, EMAIL_CIRCUIT_TRIPS
+
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker.
+
+    Closed: calls go through; outcomes are kept for ``window_seconds`` and
+    the breaker opens once at least ``minimum_calls`` were seen and the
+    failure ratio reaches ``failure_rate_threshold``.
+    Open: calls are refused for ``open_seconds``.
+    Half-open: up to ``half_open_max_calls`` probes are let through; one
+    failure reopens the breaker, that many successes close it.
+    """
+
+    def __init__(
+        self,
+        failure_rate_threshold: float,
+        minimum_calls: int,
+        window_seconds: float,
+        open_seconds: float,
+        half_open_max_calls: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._threshold = failure_rate_threshold
+        self._minimum_calls = minimum_calls
+        self._window = window_seconds
+        self._open_seconds = open_seconds
+        self._half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._state = CircuitState.CLOSED
+        self._set_state(CircuitState.CLOSED)
+
+    @classmethod
+    def from_settings(cls, settings: AppSettings) -> "CircuitBreaker":
+        return cls(
+            failure_rate_threshold=settings.email_circuit_failure_rate_threshold,
+            minimum_calls=settings.email_circuit_minimum_calls,
+            window_seconds=settings.email_circuit_window_seconds,
+            open_seconds=settings.email_circuit_open_seconds,
+            half_open_max_calls=settings.email_circuit_half_open_max_calls,
+        )
+
+    @property
+    def state(self) -> CircuitState:
+        if (
+            self._state is CircuitState.OPEN
+            and self._clock() - self._opened_at >= self._open_seconds
+        ):
+            self._set_state(CircuitState.HALF_OPEN)
+        return self._state
+
+    def available_calls(self, wanted: int) -> int:
+        """How many of ``wanted`` calls would be admitted right now."""
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return wanted
+        if state is CircuitState.OPEN:
+            return 0
+        return min(wanted, self._half_open_max_calls - self._probes_in_flight)
+
+    def acquire(self) -> None:
+        """Admit one call or raise ``EmailCircuitOpen``."""
+        state = self.state
+        if state is CircuitState.OPEN:
+            raise EmailCircuitOpen("Email provider circuit is open")
+        if state is CircuitState.HALF_OPEN:
+            if self._probes_in_flight >= self._half_open_max_calls:
+                raise EmailCircuitOpen("Email provider circuit is half-open")
+            self._probes_in_flight += 1
+
+    def record_success(self) -> None:
+        if self._state is CircuitState.HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            self._probe_successes += 1
+            if self._probe_successes >= self._half_open_max_calls:
+                self._set_state(CircuitState.CLOSED)
+            return
+        self._record(True)
+
+    def release(self) -> None:
+        """Give back an admitted call that ended without an outcome."""
+        if self._state is CircuitState.HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def record_failure(self) -> None:
+        if self._state is CircuitState.HALF_OPEN:
+            self._trip()
+            return
+        if self._state is CircuitState.CLOSED:
+            self._record(False)
+            if self._should_trip():
+                self._trip()
+
+    def _record(self, ok: bool) -> None:
+        now = self._clock()
+        self._outcomes.append((now, ok))
+        while self._outcomes and self._outcomes[0][0] < now - self._window:
+            self._outcomes.popleft()
+
+    def _should_trip(self) -> bool:
+        calls = len(self._outcomes)
+        if calls < self._minimum_calls:
+            return False
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        return failures / calls >= self._threshold
+
+    def _trip(self) -> None:
+        logger.warning("Email provider circuit opened")
+        EMAIL_CIRCUIT_TRIPS.inc()
+        self._opened_at = self._clock()
+        self._set_state(CircuitState.OPEN)
+
+    def _set_state(self, state: CircuitState) -> None:
+        if state is not self._state:
+            logger.info("Email provider circuit is %s", state.value)
+        self._state = state
+        self._outcomes.clear()
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        for candidate in CircuitState:
+            EMAIL_CIRCUIT_STATE.set(int(candidate is state), candidate.value)
+
+
+class RetryBudget:
+    """
+    Caps retries to a fraction of first attempts: every call deposits
+    ``ratio`` tokens (up to ``max_tokens``) and every retry spends one, so
+    a failing provider never sees more than ``1 + ratio`` times the load.
+    """
+
+    def __init__(self, ratio: float, max_tokens: float):
+        self._ratio = ratio
+        self._max_tokens = max_tokens
+        self._tokens = max_tokens
+
+    def deposit(self) -> None:
+        self._tokens = min(self._max_tokens, self._tokens + self._ratio)
+
+    def try_spend(self) -> bool:
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+
+class CircuitBreakingEmailClient:
+    """
+    Email client guarded by a circuit breaker. Provider failures are retried
+    with full-jitter exponential backoff while the retry budget allows, and
+    calls fail fast with ``EmailCircuitOpen`` while the breaker is open.
+    """
+
+    def __init__(
+        self,
+        inner,
+        breaker: CircuitBreaker,
+        retry_budget: RetryBudget,
+        max_retries: int,
+        base_delay_seconds: float,
+    ):
+        self._inner = inner
+        self.breaker = breaker
+        self._retry_budget = retry_budget
+        self._max_retries = max_retries
+        self._base_delay = base_delay_seconds
+
+    @classmethod
+    def from_settings(cls, inner, settings: AppSettings) -> "CircuitBreakingEmailClient":
+        return cls(
+            inner,
+            breaker=CircuitBreaker.from_settings(settings),
+            retry_budget=RetryBudget(
+                ratio=settings.email_retry_budget_ratio,
+                max_tokens=settings.email_retry_budget_max_tokens,
+            ),
+            max_retries=settings.email_retry_max_retries,
+            base_delay_seconds=settings.email_retry_base_delay_seconds,
+        )
+
+    async def send(self, message: EmailMessage) -> None:
+        await self._call(lambda: self._inner.send(message))
+
+    async def send_batch(self, messages: list[EmailMessage]) -> None:
+        await self._call(lambda: self._inner.send_batch(messages))
+
+    async def _call(self, operation: Callable[[], Awaitable[None]]) -> None:
+        self._retry_budget.deposit()
+        attempt = 0
+        while True:
+            self.breaker.acquire()
+            try:
+                await operation()
+            except EmailProviderUnavailable:
+                self.breaker.record_failure()
+                if attempt >= self._max_retries or not self._retry_budget.try_spend():
+                    raise
+            except Exception:
+                self.breaker.record_failure()
+                raise
+            except BaseException:
+                # Cancelled: no outcome, but a half-open probe slot is freed
+                self.breaker.release()
+                raise
+            else:
+                self.breaker.record_success()
+                return
+
+            await asyncio.sleep(random.uniform(0, self._base_delay * 2**attempt))
+            attempt += 1
@@ -16,23 +16,44 @@ class EmailClient:
     """
     Third-party email provider accessed through HTTP API.
     This client is intentionally thin and mockable.
+    The underlying httpx client is shared and owned by the application,
+    so provider connections are pooled and kept alive between sends.
     """
-    def __init__(self, base_url: str, timeout_seconds: float):
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient,
+        base_url: str,
+        timeout_seconds: float,
+    ):
+        self._http = http_client
         self._base_url = base_url.rstrip("/")
         self._timeout = timeout_seconds
 
     async def send(self, message: EmailMessage) -> None:
-        payload = {
+        await self._post("/send", self._payload(message))
+
+    async def send_batch(self, messages: list[EmailMessage]) -> None:
+        """Deliver several messages in one provider call."""
+        await self._post(
+            "/send/batch",
+            {"messages": [self._payload(message) for message in messages]},
+        )
+
+    @staticmethod
+    def _payload(message: EmailMessage) -> dict:
+        return {
             "from": message.sender,
             "to": message.to,
             "subject": message.subject,
             "body": message.body,
         }
 
+    async def _post(self, path: str, payload: dict) -> None:
         try:
-            async with httpx.AsyncClient(timeout=self._timeout) as client:
-                resp = await client.post(f"{self._base_url}/send", json=payload)
-                resp.raise_for_status()
+            resp = await self._http.post(
+                f"{self._base_url}{path}", json=payload, timeout=self._timeout
+            )
+            resp.raise_for_status()
         except (httpx.TimeoutException, httpx.TransportError) as e:
             raise EmailProviderUnavailable(str(e)) from e
         except httpx.HTTPStatusError as e:
@@ -13,3 +13,7 @@ class ConsoleEmailClient:
             message.subject,
             message.body,
         )
+
+    async def send_batch(self, messages: list[EmailMessage]) -> None:
+        for message in messages:
+            await self.send(message)
@@ -0,0 +1,123 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+
+from app.settings import AppSettings
+from app.infrastructure.email.client import EmailMessage
+from app.infrastructure.metrics import EMAIL_DISPATCH_QUEUE_DEPTH
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class QueuedEmail:
+    message: EmailMessage
+    result: asyncio.Future = field(repr=False)
+
+
+class EmailDispatchQueue:
+    """
+    Bounded queue in front of an email client, drained by a fixed number of
+    worker tasks so bursts of messages never open more provider connections
+    than there are workers. ``send`` blocks while the queue is full.
+
+    Clients exposing ``send_batch`` get up to ``email_dispatch_batch_size``
+    queued messages coalesced into one call; others receive them one by one.
+    """
+
+    def __init__(self, email_client, settings: AppSettings):
+        self.email_client = email_client
+        self._queue: asyncio.Queue[QueuedEmail] = asyncio.Queue(
+            maxsize=settings.email_dispatch_queue_size
+        )
+        self._worker_count = settings.email_dispatch_workers
+        self._batch_size = (
+            settings.email_dispatch_batch_size
+            if hasattr(email_client, "send_batch")
+            else 1
+        )
+        self._drain_timeout = settings.email_dispatch_drain_timeout_seconds
+        self._workers: list[asyncio.Task] = []
+        self._stopping = False
+
+    def start(self) -> None:
+        if not self._workers:
+            self._stopping = False
+            self._workers = [
+                asyncio.create_task(self._work())
+                for _ in range(self._worker_count)
+            ]
+
+    async def stop(self) -> None:
+        """Deliver what is already queued, then stop the workers."""
+        if not self._workers:
+            return
+
+        self._stopping = True
+        try:
+            await asyncio.wait_for(self._queue.join(), self._drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Email dispatch queue not drained, %s messages dropped",
+                self._queue.qsize(),
+            )
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        while not self._queue.empty():
+            self._queue.get_nowait().result.cancel()
+            self._queue.task_done()
+        EMAIL_DISPATCH_QUEUE_DEPTH.set(0)
+
+    async def send(self, message: EmailMessage) -> None:
+        if not self._workers or self._stopping:
+            raise RuntimeError("Email dispatch queue not running")
+
+        queued = QueuedEmail(
+            message=message,
+            result=asyncio.get_running_loop().create_future(),
+        )
+        await self._queue.put(queued)
+        EMAIL_DISPATCH_QUEUE_DEPTH.set(self._queue.qsize())
+        await queued.result
+
+    async def _work(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self._batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            EMAIL_DISPATCH_QUEUE_DEPTH.set(self._queue.qsize())
+
+            try:
+                # Senders that gave up (cancelled) are not delivered
+                await self._deliver([q for q in batch if not q.result.done()])
+            finally:
+                for queued in batch:
+                    if not queued.result.done():
+                        queued.result.cancel()
+                    self._queue.task_done()
+
+    async def _deliver(self, batch: list[QueuedEmail]) -> None:
+        if not batch:
+            return
+
+        error: Exception | None = None
+        try:
+            if len(batch) == 1:
+                await self.email_client.send(batch[0].message)
+            else:
+                await self.email_client.send_batch([q.message for q in batch])
+        except Exception as e:
+            error = e
+
+        for queued in batch:
+            if queued.result.done():
+                continue
+            if error is None:
+                queued.result.set_result(None)
+            else:
+                queued.result.set_exception(error)
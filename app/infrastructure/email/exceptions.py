@@ -4,3 +4,7 @@ class EmailProviderError(Exception):
 
 class EmailProviderUnavailable(EmailProviderError):
     pass
+
+
+class EmailCircuitOpen(EmailProviderUnavailable):
+    """Refused without contacting the provider because the circuit is open."""
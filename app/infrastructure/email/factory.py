@@ -0,0 +1,33 @@
+import httpx
+
+from app.settings import AppSettings
+from app.infrastructure.email.circuit_breaker import CircuitBreakingEmailClient
+from app.infrastructure.email.client import EmailClient
+from app.infrastructure.email.console_client import ConsoleEmailClient
+
+
+def create_email_http_client(settings: AppSettings) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=settings.email_provider_timeout_seconds,
+        limits=httpx.Limits(
+            max_connections=settings.email_provider_max_connections,
+            max_keepalive_connections=settings.email_provider_max_keepalive_connections,
+            keepalive_expiry=settings.email_provider_keepalive_expiry_seconds,
+        ),
+    )
+
+
+def create_email_client(
+    settings: AppSettings,
+    http_client: httpx.AsyncClient | None = None,
+):
+    if settings.email_provider_mode == "http":
+        if http_client is None:
+            raise ValueError("http email provider requires a shared http client")
+        client = EmailClient(
+            http_client=http_client,
+            base_url=str(settings.email_provider_base_url),
+            timeout_seconds=settings.email_provider_timeout_seconds,
+        )
+        return CircuitBreakingEmailClient.from_settings(client, settings)
+    return ConsoleEmailClient()
@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.settings import AppSettings
+from app.infrastructure.email.circuit_breaker import CircuitBreaker
+from app.infrastructure.email.client import EmailMessage
+from app.infrastructure.metrics import (
+    EMAIL_OUTBOX_ABANDONED,
+    EMAIL_SEND_DURATION,
+    EMAIL_SEND_FAILURES,
+)
+from app.infrastructure.repositories.email_outbox_repository import OutboxEntry
+from app.infrastructure.repositories.unit_of_work import UnitOfWork
+
+
+logger = logging.getLogger(__name__)
+
+
+class EmailOutboxDispatcher:
+    """
+    Background task delivering messages written to the email_outbox table.
+    Rows are claimed in short transactions, so no database transaction is
+    held while talking to the email provider. Rows whose delivery fails
+    become claimable again once their lease expires.
+
+    When the email client is guarded by a circuit breaker, rows are only
+    claimed as far as the breaker admits calls, so messages wait in the
+    outbox while the provider is down instead of burning their attempts.
+    """
+
+    def __init__(
+        self,
+        uow: UnitOfWork,
+        email_client,
+        settings: AppSettings,
+        circuit_breaker: CircuitBreaker | None = None,
+    ):
+        self.uow = uow
+        self.email_client = email_client
+        self._batch_size = settings.email_outbox_batch_size
+        self._poll_interval = settings.email_outbox_poll_interval_seconds
+        self._lease = timedelta(seconds=settings.email_outbox_lease_seconds)
+        self._max_attempts = settings.email_outbox_max_attempts
+        self._breaker = circuit_breaker
+        self._task: asyncio.Task | None = None
+        self._stopping = asyncio.Event()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Finish and acknowledge the batch in flight, then stop."""
+        if self._task is None:
+            return
+
+        self._stopping.set()
+        await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                delivered = await self.dispatch_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Email outbox dispatch failed")
+                delivered = 0
+
+            if delivered < self._batch_size:
+                try:
+                    await asyncio.wait_for(
+                        self._stopping.wait(), self._poll_interval
+                    )
+                except asyncio.TimeoutError:
+                    pass
+
+    async def dispatch_once(self) -> int:
+        """Claim, send and acknowledge one batch. Returns the claimed count."""
+        limit = self._batch_size
+        if self._breaker is not None:
+            limit = self._breaker.available_calls(limit)
+            if limit <= 0:
+                return 0
+
+        now = datetime.now(tz=timezone.utc)
+        async with self.uow.transaction() as repos:
+            entries = await repos.outbox.claim_pending(
+                now=now,
+                lease_until=now + self._lease,
+                limit=limit,
+                max_attempts=self._max_attempts,
+            )
+
+        if not entries:
+            return 0
+
+        results = await asyncio.gather(
+            *(self._send(entry.message) for entry in entries),
+            return_exceptions=True,
+        )
+
+        delivered_ids = []
+        for entry, result in zip(entries, results):
+            if isinstance(result, BaseException):
+                self._log_failure(entry, result)
+            else:
+                delivered_ids.append(entry.id)
+
+        async with self.uow.transaction() as repos:
+            await repos.outbox.mark_delivered(
+                delivered_ids, datetime.now(tz=timezone.utc)
+            )
+
+        return len(entries)
+
+    async def _send(self, message: EmailMessage) -> None:
+        started = time.perf_counter()
+        try:
+            await self.email_client.send(message)
+        except Exception:
+            EMAIL_SEND_FAILURES.inc()
+            raise
+        finally:
+            EMAIL_SEND_DURATION.observe(time.perf_counter() - started)
+
+    def _log_failure(self, entry: OutboxEntry, error: BaseException) -> None:
+        if entry.attempts >= self._max_attempts:
+            EMAIL_OUTBOX_ABANDONED.inc()
+            logger.error(
+                "Email delivery abandoned after %s attempts (outbox_id=%s): %s",
+                entry.attempts,
+                entry.id,
+                error,
+            )
+            return
+
+        logger.warning(
+            "Email delivery failed (outbox_id=%s attempt=%s/%s): %s",
+            entry.id,
+            entry.attempts,
+            self._max_attempts,
+            error,
+        )
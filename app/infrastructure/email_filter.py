@@ -0,0 +1,188 @@
+import asyncio
+import hashlib
+import logging
+import math
+import time
+from collections import deque
+from typing import Callable
+
+from app.settings import AppSettings
+from app.infrastructure.metrics import EMAIL_FILTER_LOOKUPS, EMAIL_FILTER_STATS
+from app.infrastructure.repositories.unit_of_work import UnitOfWork
+
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    Bit-array Bloom filter sized for ``expected_items`` at
+    ``false_positive_rate``. Positions come from double hashing a single
+    128-bit BLAKE2b digest.
+    """
+
+    def __init__(self, expected_items: int, false_positive_rate: float):
+        bits = math.ceil(
+            -expected_items * math.log(false_positive_rate) / math.log(2) ** 2
+        )
+        self.size_bits = max(8, bits)
+        self.hash_count = max(1, round(self.size_bits / expected_items * math.log(2)))
+        self._bits = bytearray((self.size_bits + 7) // 8)
+        self.items = 0
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._bits)
+
+    def _positions(self, value: str):
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size_bits
+
+    def add(self, value: str) -> None:
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.items += 1
+
+    def __contains__(self, value: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(value)
+        )
+
+    def estimated_false_positive_rate(self) -> float:
+        fill = 1 - math.exp(-self.hash_count * self.items / self.size_bits)
+        return fill ** self.hash_count
+
+
+class EmailExistenceFilter:
+    """
+    Probabilistic set of registered emails (lower-cased).
+    ``might_exist`` returning False means the email is definitely not
+    registered, so lookups can skip MySQL; True means "ask the database".
+
+    The filter is built at startup by streaming users.email, grows with
+    every user created through this process, and polls for rows created
+    elsewhere every ``email_filter_refresh_seconds``. Until loaded it
+    answers True for everything.
+
+    AUTO_INCREMENT ids are handed out at insert, not at commit, so a row
+    below the highest id seen can still show up later. Each refresh
+    therefore re-reads from the highest id a sync had seen
+    ``email_filter_commit_grace_seconds`` earlier, and the whole table is
+    read once more that long after the load for transactions open during
+    it. Rows whose transaction stays open longer are not picked up.
+    """
+
+    def __init__(
+        self,
+        uow: UnitOfWork,
+        settings: AppSettings,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.uow = uow
+        self._filter = BloomFilter(
+            settings.email_filter_expected_items,
+            settings.email_filter_false_positive_rate,
+        )
+        self._refresh_interval = settings.email_filter_refresh_seconds
+        self._commit_grace = settings.email_filter_commit_grace_seconds
+        self._clock = clock
+        # (sync started at, highest user id seen so far), oldest first
+        self._watermarks: deque[tuple[float, int]] = deque()
+        self._full_rescan_at: float | None = None
+        self._loaded = False
+        self._task: asyncio.Task | None = None
+
+    async def load(self) -> None:
+        started = time.perf_counter()
+        now = self._clock()
+        self._watermarks.append((now, await self._scan(after_id=0)))
+        self._full_rescan_at = now + self._commit_grace
+        self._loaded = True
+        logger.info(
+            "Email filter loaded %s emails in %.3fs "
+            "(%s bytes, %s hashes, estimated false positive rate %.4f)",
+            self._filter.items,
+            time.perf_counter() - started,
+            self._filter.size_bytes,
+            self._filter.hash_count,
+            self._filter.estimated_false_positive_rate(),
+        )
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._refresh_interval)
+            try:
+                await self._refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Email filter refresh failed")
+
+    async def _refresh(self) -> None:
+        """Add users committed since the grace-lagged watermark."""
+        now = self._clock()
+        full = self._full_rescan_at is not None and now >= self._full_rescan_at
+        highest = await self._scan(after_id=0 if full else self._rescan_from(now))
+        if full:
+            self._full_rescan_at = None
+        self._watermarks.append((now, max(highest, self._watermarks[-1][1])))
+
+    def _rescan_from(self, now: float) -> int:
+        # Keep the newest watermark older than the grace period, or the
+        # oldest one while none is that old yet
+        while (
+            len(self._watermarks) > 1
+            and now - self._watermarks[1][0] >= self._commit_grace
+        ):
+            self._watermarks.popleft()
+        return self._watermarks[0][1]
+
+    async def _scan(self, after_id: int) -> int:
+        """Stream users above ``after_id`` into the filter; returns the last id."""
+        highest = after_id
+        async with self.uow.connection() as repos:
+            async for user_id, email in repos.users.iter_emails(after_id=after_id):
+                self.add(email)
+                highest = user_id
+        self._report()
+        return highest
+
+    def _report(self) -> None:
+        EMAIL_FILTER_STATS.set(self._filter.size_bytes, "bytes")
+        EMAIL_FILTER_STATS.set(self._filter.items, "items")
+        EMAIL_FILTER_STATS.set(
+            self._filter.estimated_false_positive_rate(), "false_positive_rate"
+        )
+
+    def add(self, email: str) -> None:
+        email = email.lower()
+        # Rescans see the same rows again; don't count them twice
+        if email not in self._filter:
+            self._filter.add(email)
+
+    def might_exist(self, email: str) -> bool:
+        if not self._loaded:
+            return True
+
+        found = email.lower() in self._filter
+        EMAIL_FILTER_LOOKUPS.inc("maybe" if found else "miss")
+        return found
@@ -1,10 +1,104 @@
+import atexit
+import copy
+import json
 import logging
+import queue
+import random
 import sys
+from logging.handlers import QueueHandler, QueueListener
 
+from app.settings import AppSettings
 
-def setup_logging():
-    logging.basicConfig(
-        level=logging.INFO,
-        stream=sys.stdout,
-        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+
+_listener: QueueListener | None = None
+_queue_handler: "DeferredFormatQueueHandler | None" = None
+
+
+class DeferredFormatQueueHandler(QueueHandler):
+    """
+    Enqueue records unformatted. The stock ``prepare`` formats on the
+    caller's thread and drops ``exc_info``; here only the message is
+    merged with its args (they may be mutated later) and the listener's
+    formatter renders everything else, tracebacks included.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """One compact JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, separators=(",", ":"), ensure_ascii=False)
+
+
+class InfoSampler(logging.Filter):
+    """Keep a fraction of INFO records; other levels always pass."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno != logging.INFO or random.random() < self.rate
+
+
+def setup_logging(settings: AppSettings | None = None) -> None:
+    """
+    Route records through a queue so the event loop never blocks on stdout:
+    a QueueListener thread formats and writes them. Calling it again while
+    the listener runs is a no-op.
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
+    log_format = settings.log_format if settings else "text"
+    sample_rate = settings.log_info_sample_rate if settings else 1.0
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(
+        JsonFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT)
     )
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_handler = DeferredFormatQueueHandler(records)
+    if sample_rate < 1.0:
+        _queue_handler.addFilter(InfoSampler(sample_rate))
+
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(_queue_handler)
+
+    _listener = QueueListener(records, stream_handler)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+    _listener.stop()
+    _listener = None
+    _queue_handler = None
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,265 @@
+"""
+Minimal in-process metrics exposed in the Prometheus text format.
+Recording is a dict lookup plus a bisect, cheap enough to stay on under
+load. Metrics are only touched from the event loop.
+"""
+import functools
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Iterator, TypeVar
+
+
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{v}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+
+    def render(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+            *self._samples(),
+        ]
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def _samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {value}"
+            for labels, value in self._values.items()
+        ]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def _samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {value}"
+            for labels, value in self._values.items()
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = buckets
+        # per label set: [bucket counts..., +Inf count], sum
+        self._counts: dict[tuple[str, ...], list[int]] = {}
+        self._sums: dict[tuple[str, ...], float] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        counts = self._counts.get(labels)
+        if counts is None:
+            counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+            self._sums[labels] = 0.0
+        counts[bisect_left(self.buckets, value)] += 1
+        self._sums[labels] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def count(self, *labels: str) -> int:
+        return sum(self._counts.get(labels, ()))
+
+    def _samples(self) -> list[str]:
+        samples = []
+        for labels, counts in self._counts.items():
+            bucket_names = self.labelnames + ("le",)
+            cumulative = 0
+            bounds = [repr(float(bound)) for bound in self.buckets] + ["+Inf"]
+            for le, count in zip(bounds, counts):
+                cumulative += count
+                samples.append(
+                    f"{self.name}_bucket"
+                    f"{_format_labels(bucket_names, labels + (le,))} {cumulative}"
+                )
+            label_str = _format_labels(self.labelnames, labels)
+            samples.append(f"{self.name}_sum{label_str} {self._sums[labels]}")
+            samples.append(f"{self.name}_count{label_str} {cumulative}")
+        return samples
+
+
+M = TypeVar("M", bound=_Metric)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric: M) -> M:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+def counter(name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+
+def gauge(name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+    return REGISTRY.register(Gauge(name, documentation, labelnames))
+
+
+def histogram(name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Histogram:
+    return REGISTRY.register(Histogram(name, documentation, labelnames))
+
+
+HTTP_REQUEST_DURATION = histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ("method", "route", "status"),
+)
+DB_POOL_CONNECTIONS = gauge(
+    "db_pool_connections",
+    "Database pool connections by state",
+    ("state",),
+)
+RATE_LIMITED_REQUESTS = counter(
+    "rate_limited_requests_total",
+    "Requests rejected with 429 by the rate limiter",
+    ("scope",),
+)
+DB_POOL_WAIT_DURATION = histogram(
+    "db_pool_acquire_wait_seconds",
+    "Time spent waiting for a pooled connection",
+)
+DB_REQUESTS_SHED = counter(
+    "db_requests_shed_total",
+    "Connection requests rejected because the pool was saturated",
+    ("reason",),
+)
+DB_QUERY_DURATION = histogram(
+    "db_query_duration_seconds",
+    "Repository method latency",
+    ("query",),
+)
+PASSWORD_HASH_DURATION = histogram(
+    "password_hash_duration_seconds",
+    "bcrypt hash and verify latency, including executor queueing",
+    ("operation",),
+)
+EMAIL_SEND_DURATION = histogram(
+    "email_send_duration_seconds",
+    "Email provider send latency",
+)
+EMAIL_SEND_FAILURES = counter(
+    "email_send_failures_total",
+    "Failed email sends",
+)
+EMAIL_DISPATCH_QUEUE_DEPTH = gauge(
+    "email_dispatch_queue_depth",
+    "Messages waiting for an email dispatch worker",
+)
+EMAIL_CIRCUIT_STATE = gauge(
+    "email_circuit_state",
+    "Email provider circuit breaker state (1 for the current state)",
+    ("state",),
+)
+EMAIL_CIRCUIT_TRIPS = counter(
+    "email_circuit_trips_total",
+    "Times the email provider circuit breaker opened",
+)
+EMAIL_FILTER_STATS = gauge(
+    "email_filter",
+    "Registered-email Bloom filter size in bytes, insertions and estimated false positive rate",
+    ("stat",),
+)
+EMAIL_FILTER_LOOKUPS = counter(
+    "email_filter_lookups_total",
+    "Registered-email filter lookups (miss skips the database)",
+    ("result",),
+)
+ACTIVATION_CODES_PURGED = counter(
+    "activation_codes_purged_total",
+    "Expired or used activation codes deleted by the reaper",
+)
+EMAIL_OUTBOX_ABANDONED = counter(
+    "email_outbox_abandoned_total",
+    "Outbox messages given up after email_outbox_max_attempts failed sends",
+)
+EMAIL_OUTBOX_PURGED = counter(
+    "email_outbox_purged_total",
+    "Delivered or abandoned outbox rows deleted by the reaper",
+)
+ACTIVATION_CODE_REAP_DURATION = histogram(
+    "activation_code_reap_duration_seconds",
+    "Duration of a full activation code reaper run",
+)
+
+
+def timed_query(func):
+    """Record the latency of a repository coroutine method."""
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            DB_QUERY_DURATION.observe(time.perf_counter() - started, name)
+
+    return wrapper
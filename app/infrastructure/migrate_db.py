@@ -1,40 +1,139 @@
 import aiomysql
+import hashlib
 import logging
+from dataclasses import dataclass
 from pathlib import Path
 
-from app.settings import get_settings, AppSettings
+from app.infrastructure.database import Database
 
 logger = logging.getLogger(__name__)
 
+MIGRATIONS_DIR = Path(__file__).parent / "migrations"
 
-async def migrate_database():
-    """Initialize database with the schema"""
-    settings: AppSettings = get_settings()
-    logger.info("test")
-    try:
-        conn = await aiomysql.connect(
-            host=settings.mysql_host,
-            port=settings.mysql_port,
-            user=settings.mysql_user,
-            password=settings.mysql_password,
-            charset='utf8mb4'
+ER_NO_SUCH_TABLE = 1146
+
+# Scoped to the current schema so replicas of different deployments sharing
+# a server do not serialize on each other.
+LOCK_NAME_SQL = "CONCAT(DATABASE(), '.schema_migrations')"
+
+
+@dataclass(frozen=True, slots=True)
+class Migration:
+    version: int
+    name: str
+    sql: str
+    checksum: str
+
+
+def load_migrations(directory: Path = MIGRATIONS_DIR) -> list[Migration]:
+    """Read ``NNNN_name.sql`` files ordered by their numeric prefix."""
+    migrations = []
+    for path in directory.glob("*.sql"):
+        prefix, _, name = path.stem.partition("_")
+        sql = path.read_text()
+        migrations.append(
+            Migration(
+                version=int(prefix),
+                name=name,
+                sql=sql,
+                checksum=hashlib.sha256(sql.encode()).hexdigest(),
+            )
         )
 
-        async with conn.cursor() as cursor:
-            await cursor.execute(f"USE {settings.mysql_database}")
+    migrations.sort(key=lambda migration: migration.version)
+    versions = [migration.version for migration in migrations]
+    if len(set(versions)) != len(versions):
+        raise ValueError(f"Duplicate migration versions in {directory}")
+    return migrations
+
 
-            schema_path = Path(__file__).parent / "schema.sql"
-            schema_sql = schema_path.read_text()
+async def _current_version(conn: aiomysql.Connection) -> int | None:
+    async with conn.cursor() as cursor:
+        try:
+            await cursor.execute("SELECT MAX(version) FROM schema_migrations")
+        except aiomysql.ProgrammingError as e:
+            if e.args[0] == ER_NO_SUCH_TABLE:
+                return None
+            raise
+        (version,) = await cursor.fetchone()
+        return version
 
-            for statement in schema_sql.split(';'):
-                if statement.strip():
-                    await cursor.execute(statement)
 
-            await conn.commit()
-            logger.info("Database schema initialized")
+async def _applied_checksums(conn: aiomysql.Connection) -> dict[int, str]:
+    async with conn.cursor() as cursor:
+        await cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INT PRIMARY KEY,
+                name VARCHAR(255) NOT NULL,
+                checksum CHAR(64) NOT NULL,
+                applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        await cursor.execute("SELECT version, checksum FROM schema_migrations")
+        return dict(await cursor.fetchall())
+
+
+async def _apply(conn: aiomysql.Connection, migration: Migration) -> None:
+    async with conn.cursor() as cursor:
+        for statement in migration.sql.split(";"):
+            if statement.strip():
+                await cursor.execute(statement)
+        await cursor.execute(
+            "INSERT INTO schema_migrations (version, name, checksum) "
+            "VALUES (%s, %s, %s)",
+            (migration.version, migration.name, migration.checksum),
+        )
+    await conn.commit()
+    logger.info("Applied migration %04d_%s", migration.version, migration.name)
+
+
+async def migrate_database(
+    db: Database, migrations: list[Migration] | None = None
+) -> None:
+    """
+    Bring the schema up to the latest migration.
+
+    When the schema is already current this costs a single query. Otherwise
+    the runner takes a MySQL advisory lock so that replicas starting at the
+    same time apply each migration exactly once.
+    """
+    if migrations is None:
+        migrations = load_migrations()
+    if not migrations:
+        return
+    latest = migrations[-1].version
+
+    async with db.get_connection() as conn:
+        if await _current_version(conn) == latest:
+            logger.info("Database schema is up to date (version %s)", latest)
+            return
+
+        async with conn.cursor() as cursor:
+            await cursor.execute(
+                f"SELECT GET_LOCK({LOCK_NAME_SQL}, %s)",
+                (db.settings.migration_lock_timeout_seconds,),
+            )
+            (locked,) = await cursor.fetchone()
+        if locked != 1:
+            raise RuntimeError("Timed out waiting for the schema migration lock")
 
-        conn.close()
+        try:
+            # Another replica may have migrated while we waited for the lock.
+            applied = await _applied_checksums(conn)
+            for migration in migrations:
+                checksum = applied.get(migration.version)
+                if checksum is None:
+                    await _apply(conn, migration)
+                elif checksum != migration.checksum:
+                    logger.warning(
+                        "Migration %04d_%s changed after it was applied",
+                        migration.version,
+                        migration.name,
+                    )
+        finally:
+            async with conn.cursor() as cursor:
+                await cursor.execute(f"SELECT RELEASE_LOCK({LOCK_NAME_SQL})")
 
-    except Exception as e:
-        logger.error(f"Failed to initialize database: {e}")
-        raise
+    logger.info("Database schema migrated to version %s", latest)
@@ -3,8 +3,7 @@ CREATE TABLE IF NOT EXISTS users (
     email VARCHAR(255) NOT NULL UNIQUE,
     hashed_password VARCHAR(255) NOT NULL,
     is_active BOOLEAN DEFAULT FALSE,
-    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-    INDEX idx_email (email)
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
 );
 CREATE TABLE IF NOT EXISTS activation_codes (
     user_id BIGINT NOT NULL,
@@ -13,4 +12,4 @@ CREATE TABLE IF NOT EXISTS activation_codes (
     used BOOLEAN NOT NULL DEFAULT FALSE,
     PRIMARY KEY (user_id),
     FOREIGN KEY (user_id) REFERENCES users(id)
-);
\ No newline at end of file
+);
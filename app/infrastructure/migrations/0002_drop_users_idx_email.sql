@@ -0,0 +1,13 @@
+SET @drop_idx_email = IF(
+    (
+        SELECT COUNT(*) FROM information_schema.statistics
+        WHERE table_schema = DATABASE()
+          AND table_name = 'users'
+          AND index_name = 'idx_email'
+    ) > 0,
+    'ALTER TABLE users DROP INDEX idx_email',
+    'DO 0'
+);
+PREPARE drop_idx_email FROM @drop_idx_email;
+EXECUTE drop_idx_email;
+DEALLOCATE PREPARE drop_idx_email;
@@ -0,0 +1,13 @@
+SET @add_idx_expires_at = IF(
+    (
+        SELECT COUNT(*) FROM information_schema.statistics
+        WHERE table_schema = DATABASE()
+          AND table_name = 'activation_codes'
+          AND index_name = 'idx_activation_codes_expires_at'
+    ) = 0,
+    'ALTER TABLE activation_codes ADD INDEX idx_activation_codes_expires_at (expires_at)',
+    'DO 0'
+);
+PREPARE add_idx_expires_at FROM @add_idx_expires_at;
+EXECUTE add_idx_expires_at;
+DEALLOCATE PREPARE add_idx_expires_at;
@@ -0,0 +1,92 @@
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Protocol
+
+from app.settings import AppSettings
+from app.infrastructure.metrics import RATE_LIMITED_REQUESTS
+
+
+class RateLimited(Exception):
+    def __init__(self, scope: str, retry_after: int):
+        super().__init__(f"Rate limit exceeded ({scope})")
+        self.scope = scope
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True, slots=True)
+class BucketLimit:
+    rate_per_second: float
+    capacity: float
+
+
+class RateLimitStore(Protocol):
+    """
+    Token bucket state. Implementations backed by a shared store (for
+    example Redis with a script doing the same arithmetic) make limits hold
+    across replicas.
+    """
+
+    async def take(self, key: str, limit: BucketLimit, now: float) -> float:
+        """Take one token. Returns 0 when allowed, else seconds to wait."""
+        ...
+
+
+class InMemoryRateLimitStore:
+    """
+    Per-process buckets, bounded to ``max_buckets`` by evicting the least
+    recently used one. An evicted bucket comes back full, which only ever
+    errs on the side of letting an idle client through.
+    """
+
+    def __init__(self, max_buckets: int):
+        self._max_buckets = max_buckets
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    async def take(self, key: str, limit: BucketLimit, now: float) -> float:
+        tokens, updated_at = self._buckets.get(key, (limit.capacity, now))
+        tokens = min(
+            limit.capacity, tokens + (now - updated_at) * limit.rate_per_second
+        )
+
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / limit.rate_per_second
+
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self._max_buckets:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+class RateLimiter:
+    """Token-bucket limits per client address and per account."""
+
+    def __init__(self, store: RateLimitStore, settings: AppSettings):
+        self._store = store
+        self._limits = {
+            "client": BucketLimit(
+                rate_per_second=settings.rate_limit_client_per_minute / 60,
+                capacity=settings.rate_limit_client_burst,
+            ),
+            "account": BucketLimit(
+                rate_per_second=settings.rate_limit_account_per_minute / 60,
+                capacity=settings.rate_limit_account_burst,
+            ),
+        }
+
+    async def check(self, scope: str, key: str) -> None:
+        """Raise ``RateLimited`` when ``key`` has no token left in ``scope``."""
+        wait = await self._store.take(
+            f"{scope}:{key}", self._limits[scope], time.monotonic()
+        )
+        if wait > 0:
+            RATE_LIMITED_REQUESTS.inc(scope)
+            raise RateLimited(scope, retry_after=math.ceil(wait))
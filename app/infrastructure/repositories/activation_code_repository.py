@@ -1,13 +1,23 @@
 import aiomysql
-from datetime import datetime, timezone
+from datetime import datetime
 
 from app.domain.models.activation_code import ActivationCode
+from app.infrastructure.metrics import timed_query
+from app.infrastructure.repositories.mapping import RowMapper, as_utc
+
+
+ACTIVATION_CODE_MAPPER: RowMapper[ActivationCode] = RowMapper(
+    ActivationCode,
+    ("user_id", "hashed_code", "expires_at", "used"),
+    converters={"expires_at": as_utc},
+)
 
 
 class ActivationCodeRepository:
     def __init__(self, conn: aiomysql.Connection):
         self._conn = conn
 
+    @timed_query
     async def create_or_replace(
         self,
         user_id: int,
@@ -28,11 +38,34 @@ class ActivationCodeRepository:
                 (user_id, hashed_code, expires_at),
             )
 
+    @timed_query
+    async def create_or_replace_many(
+        self, codes: list[tuple[int, str, datetime]]
+    ) -> None:
+        """Multi-row create_or_replace of (user_id, hashed_code, expires_at)."""
+        if not codes:
+            return
+
+        async with self._conn.cursor() as cursor:
+            await cursor.execute(
+                f"""
+                INSERT INTO activation_codes
+                (user_id, hashed_code, expires_at, used)
+                VALUES {", ".join(["(%s, %s, %s, FALSE)"] * len(codes))} AS new
+                ON DUPLICATE KEY UPDATE
+                    hashed_code = new.hashed_code,
+                    expires_at = new.expires_at,
+                    used = FALSE
+                """,
+                [value for code in codes for value in code],
+            )
+
+    @timed_query
     async def get_for_update(self, user_id: int) -> ActivationCode | None:
-        async with self._conn.cursor(aiomysql.DictCursor) as cursor:
+        async with self._conn.cursor() as cursor:
             await cursor.execute(
-                """
-                SELECT user_id, hashed_code, expires_at, used
+                f"""
+                SELECT {ACTIVATION_CODE_MAPPER.select_list()}
                 FROM activation_codes
                 WHERE user_id = %s
                 FOR UPDATE
@@ -41,16 +74,12 @@ class ActivationCodeRepository:
             )
             row = await cursor.fetchone()
 
-            if row is None:
-                return None
+        if row is None:
+            return None
 
-            return ActivationCode(
-                    user_id=row["user_id"],
-                    hashed_code=row["hashed_code"],
-                    expires_at=row["expires_at"].replace(tzinfo=timezone.utc),
-                    used=row["used"]
-                )
+        return ACTIVATION_CODE_MAPPER(row)
 
+    @timed_query
     async def mark_used(self, user_id: int) -> None:
         async with self._conn.cursor() as cursor:
             await cursor.execute(
@@ -61,3 +90,24 @@ class ActivationCodeRepository:
                 """,
                 (user_id,),
             )
+
+    @timed_query
+    async def purge_expired(
+        self, now: datetime, unused_expired_before: datetime, limit: int
+    ) -> int:
+        """
+        Delete at most `limit` expired codes: used ones as soon as they
+        expire, unused ones once they are older than the grace cutoff.
+        Returns the number of deleted rows.
+        """
+        async with self._conn.cursor() as cursor:
+            await cursor.execute(
+                """
+                DELETE FROM activation_codes
+                WHERE expires_at < %s
+                  AND (used = TRUE OR expires_at < %s)
+                LIMIT %s
+                """,
+                (now, unused_expired_before, limit),
+            )
+            return cursor.rowcount
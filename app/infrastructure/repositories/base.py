@@ -0,0 +1,71 @@
+from datetime import datetime
+from typing import AsyncIterator, Protocol
+
+from app.domain.models.activation_code import ActivationCode
+from app.domain.models.user import User
+from app.infrastructure.email.client import EmailMessage
+from app.infrastructure.repositories.email_outbox_repository import OutboxEntry
+
+
+class UsersRepositoryProtocol(Protocol):
+    async def create(self, email: str, hashed_password: str) -> int: ...
+
+    async def create_many(self, users: list[tuple[str, str]]) -> dict[str, int]: ...
+
+    async def get_by_id(self, id: int) -> User | None: ...
+
+    async def get_by_email(self, email: str) -> User | None: ...
+
+    def iter_emails(self, after_id: int = 0) -> AsyncIterator[tuple[int, str]]: ...
+
+    async def activate(self, user_id: int) -> None: ...
+
+    async def update_password_hash(
+        self, user_id: int, old_hash: str, new_hash: str
+    ) -> bool: ...
+
+    async def get_with_activation_code_for_update(
+        self, user_id: int
+    ) -> tuple[User | None, ActivationCode | None]: ...
+
+    async def activate_with_code(self, user_id: int) -> None: ...
+
+
+class ActivationCodeRepositoryProtocol(Protocol):
+    async def create_or_replace(
+        self, user_id: int, hashed_code: str, expires_at: datetime
+    ) -> None: ...
+
+    async def create_or_replace_many(
+        self, codes: list[tuple[int, str, datetime]]
+    ) -> None: ...
+
+    async def get_for_update(self, user_id: int) -> ActivationCode | None: ...
+
+    async def mark_used(self, user_id: int) -> None: ...
+
+    async def purge_expired(
+        self, now: datetime, unused_expired_before: datetime, limit: int
+    ) -> int: ...
+
+
+class EmailOutboxRepositoryProtocol(Protocol):
+    async def enqueue(self, message: EmailMessage, available_at: datetime) -> None: ...
+
+    async def enqueue_many(
+        self, messages: list[EmailMessage], available_at: datetime
+    ) -> None: ...
+
+    async def claim_pending(
+        self,
+        now: datetime,
+        lease_until: datetime,
+        limit: int,
+        max_attempts: int,
+    ) -> list[OutboxEntry]: ...
+
+    async def mark_delivered(self, ids: list[int], delivered_at: datetime) -> None: ...
+
+    async def purge_finished(
+        self, finished_before: datetime, max_attempts: int, limit: int
+    ) -> int: ...
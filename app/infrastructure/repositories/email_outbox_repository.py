@@ -0,0 +1,158 @@
+import aiomysql
+from dataclasses import dataclass
+from datetime import datetime
+
+from app.infrastructure.email.client import EmailMessage
+from app.infrastructure.metrics import timed_query
+
+
+@dataclass(frozen=True, slots=True)
+class OutboxEntry:
+    id: int
+    message: EmailMessage
+    attempts: int
+
+
+class EmailOutboxRepository:
+    def __init__(self, conn: aiomysql.Connection):
+        self._conn = conn
+
+    @timed_query
+    async def enqueue(self, message: EmailMessage, available_at: datetime) -> None:
+        async with self._conn.cursor() as cursor:
+            await cursor.execute(
+                """
+                INSERT INTO email_outbox
+                (recipient, sender, subject, body, available_at)
+                VALUES (%s, %s, %s, %s, %s)
+                """,
+                (
+                    message.to,
+                    message.sender,
+                    message.subject,
+                    message.body,
+                    available_at,
+                ),
+            )
+
+    @timed_query
+    async def enqueue_many(
+        self, messages: list[EmailMessage], available_at: datetime
+    ) -> None:
+        if not messages:
+            return
+
+        async with self._conn.cursor() as cursor:
+            await cursor.execute(
+                f"""
+                INSERT INTO email_outbox
+                (recipient, sender, subject, body, available_at)
+                VALUES {", ".join(["(%s, %s, %s, %s, %s)"] * len(messages))}
+                """,
+                [
+                    value
+                    for message in messages
+                    for value in (
+                        message.to,
+                        message.sender,
+                        message.subject,
+                        message.body,
+                        available_at,
+                    )
+                ],
+            )
+
+    @timed_query
+    async def claim_pending(
+        self,
+        now: datetime,
+        lease_until: datetime,
+        limit: int,
+        max_attempts: int,
+    ) -> list[OutboxEntry]:
+        """
+        Lock a batch of deliverable rows, skipping rows claimed by other
+        dispatchers, and push their availability forward so they are not
+        claimed again while being sent.
+        """
+        async with self._conn.cursor() as cursor:
+            await cursor.execute(
+                """
+                SELECT id, recipient, sender, subject, body, attempts
+                FROM email_outbox
+                WHERE delivered_at IS NULL
+                  AND available_at <= %s
+                  AND attempts < %s
+                ORDER BY id
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+                """,
+                (now, max_attempts, limit),
+            )
+            rows = await cursor.fetchall()
+
+            if not rows:
+                return []
+
+            ids = [row[0] for row in rows]
+            await cursor.execute(
+                f"""
+                UPDATE email_outbox
+                SET available_at = %s, attempts = attempts + 1
+                WHERE id IN ({", ".join(["%s"] * len(ids))})
+                """,
+                (lease_until, *ids),
+            )
+
+        return [
+            OutboxEntry(
+                id=row[0],
+                message=EmailMessage(
+                    to=row[1],
+                    sender=row[2],
+                    subject=row[3],
+                    body=row[4],
+                ),
+                attempts=row[5] + 1,
+            )
+            for row in rows
+        ]
+
+    @timed_query
+    async def mark_delivered(self, ids: list[int], delivered_at: datetime) -> None:
+        """Mark rows delivered and blank their body (it holds the plain code)."""
+        if not ids:
+            return
+
+        async with self._conn.cursor() as cursor:
+            await cursor.execute(
+                f"""
+                UPDATE email_outbox
+                SET delivered_at = %s, body = ''
+                WHERE id IN ({", ".join(["%s"] * len(ids))})
+                """,
+                (delivered_at, *ids),
+            )
+
+    @timed_query
+    async def purge_finished(
+        self, finished_before: datetime, max_attempts: int, limit: int
+    ) -> int:
+        """
+        Delete at most `limit` rows delivered before `finished_before`, or
+        given up after `max_attempts` with their last lease ended by then.
+        Returns the number of deleted rows.
+        """
+        async with self._conn.cursor() as cursor:
+            await cursor.execute(
+                """
+                DELETE FROM email_outbox
+                WHERE (delivered_at IS NOT NULL AND delivered_at < %s)
+                   OR (delivered_at IS NULL
+                       AND attempts >= %s
+                       AND available_at < %s)
+                LIMIT %s
+                """,
+                (finished_before, max_attempts, finished_before, limit),
+            )
+            return cursor.rowcount
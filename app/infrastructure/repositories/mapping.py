@@ -0,0 +1,50 @@
+from datetime import datetime, timezone
+from typing import Any, Callable, Generic, Sequence, TypeVar
+
+
+T = TypeVar("T")
+
+
+def as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc)
+
+
+class RowMapper(Generic[T]):
+    """
+    Maps positional rows from a plain (tuple) cursor to a model.
+    The column list is the single source of truth for both the SELECT list
+    and the constructor argument order, so no per-row dict is built.
+    """
+
+    def __init__(
+        self,
+        model: Callable[..., T],
+        columns: tuple[str, ...],
+        converters: dict[str, Callable[[Any], Any]] | None = None,
+    ):
+        self.model = model
+        self.columns = columns
+        self.width = len(columns)
+        converters = converters or {}
+        self._converters = tuple(
+            (index, converters[column])
+            for index, column in enumerate(columns)
+            if column in converters
+        )
+
+    def select_list(self, alias: str | None = None) -> str:
+        if alias is None:
+            return ", ".join(self.columns)
+        return ", ".join(f"{alias}.{column}" for column in self.columns)
+
+    def __call__(self, row: Sequence[Any], offset: int = 0) -> T:
+        if offset or len(row) != self.width:
+            row = row[offset:offset + self.width]
+
+        if not self._converters:
+            return self.model(*row)
+
+        values = list(row)
+        for index, convert in self._converters:
+            values[index] = convert(values[index])
+        return self.model(*values)
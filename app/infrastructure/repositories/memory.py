@@ -0,0 +1,328 @@
+"""
+In-memory implementation of the repository / unit-of-work contract.
+Meant for local benchmarking, profiling and fast tests: data lives in
+dicts for the lifetime of the process.
+
+Every repository call completes without yielding to the event loop, so
+individual operations are atomic. Per-user locks emulate FOR UPDATE and
+are held until the end of the transaction, and each mutation records an
+undo step replayed in reverse order if the transaction fails.
+"""
+import asyncio
+import itertools
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from typing import AsyncIterator, Callable
+
+from app.domain.exceptions import UserAlreadyExists
+from app.domain.models.activation_code import ActivationCode
+from app.domain.models.user import User
+from app.infrastructure.email.client import EmailMessage
+from app.infrastructure.repositories.email_outbox_repository import OutboxEntry
+from app.infrastructure.repositories.unit_of_work import Repositories
+
+
+@dataclass(slots=True)
+class _OutboxRow:
+    id: int
+    message: EmailMessage
+    available_at: datetime
+    attempts: int = 0
+    delivered_at: datetime | None = None
+
+
+class InMemoryStore:
+    def __init__(self):
+        self.user_ids = itertools.count(1)
+        self.outbox_ids = itertools.count(1)
+        self.users: dict[int, User] = {}
+        # emails are unique case-insensitively, like the MySQL collation
+        self.users_by_email: dict[str, int] = {}
+        self.codes: dict[int, ActivationCode] = {}
+        self.outbox: dict[int, _OutboxRow] = {}
+        self.user_locks: dict[int, asyncio.Lock] = {}
+
+    def messages_to(self, recipient: str) -> list[EmailMessage]:
+        return [
+            row.message
+            for row in self.outbox.values()
+            if row.message.to == recipient
+        ]
+
+
+class _Transaction:
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+        self._undo: list[Callable[[], None]] = []
+        self._locks: list[asyncio.Lock] = []
+        self._locked_users: set[int] = set()
+
+    def on_rollback(self, undo: Callable[[], None]) -> None:
+        self._undo.append(undo)
+
+    async def lock_user(self, user_id: int) -> None:
+        if user_id in self._locked_users:
+            return
+
+        lock = self.store.user_locks.setdefault(user_id, asyncio.Lock())
+        await lock.acquire()
+        self._locks.append(lock)
+        self._locked_users.add(user_id)
+
+    def rollback(self) -> None:
+        while self._undo:
+            self._undo.pop()()
+
+    def release(self) -> None:
+        while self._locks:
+            self._locks.pop().release()
+        self._locked_users.clear()
+        self._undo.clear()
+
+
+def _restore(mapping: dict, key, previous) -> Callable[[], None]:
+    def undo() -> None:
+        if previous is None:
+            mapping.pop(key, None)
+        else:
+            mapping[key] = previous
+    return undo
+
+
+class InMemoryUsersRepository:
+    def __init__(self, tx: _Transaction):
+        self._tx = tx
+        self._store = tx.store
+
+    async def create(self, email: str, hashed_password: str) -> int:
+        key = email.lower()
+        if key in self._store.users_by_email:
+            raise UserAlreadyExists()
+
+        user_id = next(self._store.user_ids)
+        self._store.users[user_id] = User(
+            id=user_id,
+            email=email,
+            hashed_password=hashed_password,
+            is_active=False,
+            created_at=datetime.now(tz=timezone.utc),
+        )
+        self._store.users_by_email[key] = user_id
+        self._tx.on_rollback(_restore(self._store.users, user_id, None))
+        self._tx.on_rollback(_restore(self._store.users_by_email, key, None))
+        return user_id
+
+    async def create_many(self, users: list[tuple[str, str]]) -> dict[str, int]:
+        created = {}
+        for email, hashed_password in users:
+            try:
+                created[email] = await self.create(email, hashed_password)
+            except UserAlreadyExists:
+                pass
+        return created
+
+    async def get_by_id(self, id: int) -> User | None:
+        return self._store.users.get(id)
+
+    async def get_by_email(self, email: str) -> User | None:
+        user_id = self._store.users_by_email.get(email.lower())
+        if user_id is None:
+            return None
+        return self._store.users.get(user_id)
+
+    async def iter_emails(self, after_id: int = 0) -> AsyncIterator[tuple[int, str]]:
+        for user_id in sorted(self._store.users):
+            if user_id > after_id:
+                yield user_id, self._store.users[user_id].email
+
+    async def activate(self, user_id: int) -> None:
+        user = self._store.users.get(user_id)
+        if user is None:
+            return
+
+        self._store.users[user_id] = replace(user, is_active=True)
+        self._tx.on_rollback(_restore(self._store.users, user_id, user))
+
+    async def update_password_hash(
+        self, user_id: int, old_hash: str, new_hash: str
+    ) -> bool:
+        user = self._store.users.get(user_id)
+        if user is None or user.hashed_password != old_hash:
+            return False
+
+        self._store.users[user_id] = replace(user, hashed_password=new_hash)
+        self._tx.on_rollback(_restore(self._store.users, user_id, user))
+        return True
+
+    async def get_with_activation_code_for_update(
+        self, user_id: int
+    ) -> tuple[User | None, ActivationCode | None]:
+        await self._tx.lock_user(user_id)
+        user = self._store.users.get(user_id)
+        if user is None:
+            return None, None
+        return user, self._store.codes.get(user_id)
+
+    async def activate_with_code(self, user_id: int) -> None:
+        code = self._store.codes.get(user_id)
+        if user_id not in self._store.users or code is None:
+            return
+
+        await self.activate(user_id)
+        self._store.codes[user_id] = replace(code, used=True)
+        self._tx.on_rollback(_restore(self._store.codes, user_id, code))
+
+
+class InMemoryActivationCodeRepository:
+    def __init__(self, tx: _Transaction):
+        self._tx = tx
+        self._store = tx.store
+
+    async def create_or_replace(
+        self,
+        user_id: int,
+        hashed_code: str,
+        expires_at: datetime,
+    ) -> None:
+        previous = self._store.codes.get(user_id)
+        self._store.codes[user_id] = ActivationCode(
+            user_id=user_id,
+            hashed_code=hashed_code,
+            expires_at=expires_at,
+            used=False,
+        )
+        self._tx.on_rollback(_restore(self._store.codes, user_id, previous))
+
+    async def create_or_replace_many(
+        self, codes: list[tuple[int, str, datetime]]
+    ) -> None:
+        for user_id, hashed_code, expires_at in codes:
+            await self.create_or_replace(user_id, hashed_code, expires_at)
+
+    async def get_for_update(self, user_id: int) -> ActivationCode | None:
+        await self._tx.lock_user(user_id)
+        return self._store.codes.get(user_id)
+
+    async def mark_used(self, user_id: int) -> None:
+        code = self._store.codes.get(user_id)
+        if code is None:
+            return
+
+        self._store.codes[user_id] = replace(code, used=True)
+        self._tx.on_rollback(_restore(self._store.codes, user_id, code))
+
+    async def purge_expired(
+        self, now: datetime, unused_expired_before: datetime, limit: int
+    ) -> int:
+        expired = [
+            code
+            for code in self._store.codes.values()
+            if code.expires_at < now
+            and (code.used or code.expires_at < unused_expired_before)
+        ][:limit]
+        for code in expired:
+            del self._store.codes[code.user_id]
+            self._tx.on_rollback(_restore(self._store.codes, code.user_id, code))
+        return len(expired)
+
+
+class InMemoryEmailOutboxRepository:
+    def __init__(self, tx: _Transaction):
+        self._tx = tx
+        self._store = tx.store
+
+    async def enqueue(self, message: EmailMessage, available_at: datetime) -> None:
+        row_id = next(self._store.outbox_ids)
+        self._store.outbox[row_id] = _OutboxRow(
+            id=row_id, message=message, available_at=available_at
+        )
+        self._tx.on_rollback(_restore(self._store.outbox, row_id, None))
+
+    async def enqueue_many(
+        self, messages: list[EmailMessage], available_at: datetime
+    ) -> None:
+        for message in messages:
+            await self.enqueue(message, available_at)
+
+    async def claim_pending(
+        self,
+        now: datetime,
+        lease_until: datetime,
+        limit: int,
+        max_attempts: int,
+    ) -> list[OutboxEntry]:
+        claimed: list[OutboxEntry] = []
+        for row in self._store.outbox.values():
+            if len(claimed) == limit:
+                break
+            if (
+                row.delivered_at is None
+                and row.available_at <= now
+                and row.attempts < max_attempts
+            ):
+                self._tx.on_rollback(_restore(self._store.outbox, row.id, replace(row)))
+                row.available_at = lease_until
+                row.attempts += 1
+                claimed.append(
+                    OutboxEntry(id=row.id, message=row.message, attempts=row.attempts)
+                )
+        return claimed
+
+    async def mark_delivered(self, ids: list[int], delivered_at: datetime) -> None:
+        for row_id in ids:
+            row = self._store.outbox.get(row_id)
+            if row is not None:
+                self._tx.on_rollback(_restore(self._store.outbox, row_id, replace(row)))
+                row.delivered_at = delivered_at
+                row.message = replace(row.message, body="")
+
+    async def purge_finished(
+        self, finished_before: datetime, max_attempts: int, limit: int
+    ) -> int:
+        finished = [
+            row
+            for row in self._store.outbox.values()
+            if (row.delivered_at is not None and row.delivered_at < finished_before)
+            or (
+                row.delivered_at is None
+                and row.attempts >= max_attempts
+                and row.available_at < finished_before
+            )
+        ][:limit]
+        for row in finished:
+            del self._store.outbox[row.id]
+            self._tx.on_rollback(_restore(self._store.outbox, row.id, row))
+        return len(finished)
+
+
+class InMemoryUnitOfWork:
+    def __init__(self, store: InMemoryStore | None = None):
+        self.store = store or InMemoryStore()
+
+    @staticmethod
+    def _repositories(tx: _Transaction) -> Repositories:
+        return Repositories(
+            users=InMemoryUsersRepository(tx),
+            codes=InMemoryActivationCodeRepository(tx),
+            outbox=InMemoryEmailOutboxRepository(tx),
+        )
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[Repositories]:
+        tx = _Transaction(self.store)
+        try:
+            yield self._repositories(tx)
+        except BaseException:
+            tx.rollback()
+            raise
+        finally:
+            tx.release()
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[Repositories]:
+        async with self.transaction() as repositories:
+            yield repositories
+
+    async def release_connection(self) -> None:
+        pass
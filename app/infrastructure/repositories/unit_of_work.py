@@ -0,0 +1,64 @@
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncContextManager, AsyncIterator, Protocol
+
+from app.infrastructure.database import Database
+from app.infrastructure.repositories.base import (
+    ActivationCodeRepositoryProtocol,
+    EmailOutboxRepositoryProtocol,
+    UsersRepositoryProtocol,
+)
+from app.infrastructure.repositories.users_repository import UsersRepository
+from app.infrastructure.repositories.activation_code_repository import (
+    ActivationCodeRepository
+)
+from app.infrastructure.repositories.email_outbox_repository import (
+    EmailOutboxRepository
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Repositories:
+    users: UsersRepositoryProtocol
+    codes: ActivationCodeRepositoryProtocol
+    outbox: EmailOutboxRepositoryProtocol
+
+
+class UnitOfWork(Protocol):
+    def transaction(self) -> AsyncContextManager[Repositories]:
+        """Repositories sharing one transaction, rolled back on exception."""
+        ...
+
+    def connection(self) -> AsyncContextManager[Repositories]:
+        """Repositories for plain reads, without an explicit transaction."""
+        ...
+
+    async def release_connection(self) -> None:
+        """Return a connection held for the request before slow non-DB work."""
+        ...
+
+
+class MySQLUnitOfWork:
+    def __init__(self, db: Database):
+        self.db = db
+
+    @staticmethod
+    def _repositories(conn) -> Repositories:
+        return Repositories(
+            users=UsersRepository(conn),
+            codes=ActivationCodeRepository(conn),
+            outbox=EmailOutboxRepository(conn),
+        )
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[Repositories]:
+        async with self.db.transaction() as conn:
+            yield self._repositories(conn)
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[Repositories]:
+        async with self.db.get_connection() as conn:
+            yield self._repositories(conn)
+
+    async def release_connection(self) -> None:
+        await self.db.release_request_connection()
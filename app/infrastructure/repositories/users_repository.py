@@ -1,30 +1,92 @@
 import aiomysql
+from typing import AsyncIterator
 
 from app.domain.models.user import User
+from app.domain.models.activation_code import ActivationCode
+from app.domain.exceptions import UserAlreadyExists
+from app.infrastructure.metrics import timed_query
+from app.infrastructure.repositories.mapping import RowMapper
+from app.infrastructure.repositories.activation_code_repository import (
+    ACTIVATION_CODE_MAPPER
+)
+
+
+ER_DUP_ENTRY = 1062
+
+EMAIL_STREAM_BATCH_SIZE = 1000
+
+USER_MAPPER: RowMapper[User] = RowMapper(
+    User,
+    ("id", "email", "hashed_password", "is_active", "created_at"),
+)
 
 
 class UsersRepository:
     def __init__(self, conn: aiomysql.Connection):
         self.conn = conn
 
+    @timed_query
     async def create(self, email: str, hashed_password: str) -> int:
+        """Insert a user, relying on the unique email index for duplicates."""
+        async with self.conn.cursor() as cursor:
+            try:
+                await cursor.execute(
+                    """
+                    INSERT INTO users (email, hashed_password, is_active)
+                    VALUES (%s, %s, %s)
+                    """,
+                    (email, hashed_password, False),
+                )
+            except aiomysql.IntegrityError as e:
+                if e.args and e.args[0] == ER_DUP_ENTRY:
+                    raise UserAlreadyExists() from e
+                raise
+            return cursor.lastrowid
+
+    @timed_query
+    async def create_many(
+        self, users: list[tuple[str, str]]
+    ) -> dict[str, int]:
+        """
+        Insert (email, hashed_password) pairs with one multi-row INSERT.
+        Returns the ids of the rows inserted by this call, keyed by email;
+        emails that already existed are left out. bcrypt hashes are salted,
+        so a matching hashed_password identifies our own row.
+        """
+        if not users:
+            return {}
+
         async with self.conn.cursor() as cursor:
             await cursor.execute(
-                """
+                f"""
                 INSERT INTO users (email, hashed_password, is_active)
-                VALUES (%s, %s, %s)
+                VALUES {", ".join(["(%s, %s, FALSE)"] * len(users))}
+                ON DUPLICATE KEY UPDATE id = id
                 """,
-                (email, hashed_password, False),
+                [value for user in users for value in user],
             )
-            return cursor.lastrowid
+            await cursor.execute(
+                f"""
+                SELECT id, email, hashed_password
+                FROM users
+                WHERE email IN ({", ".join(["%s"] * len(users))})
+                """,
+                [email for email, _ in users],
+            )
+            rows = await cursor.fetchall()
+
+        inserted = {hashed_password: email for email, hashed_password in users}
+        return {
+            inserted[hashed_password]: user_id
+            for user_id, _, hashed_password in rows
+            if hashed_password in inserted
+        }
 
+    @timed_query
     async def get_by_id(self, id: int) -> User | None:
-        async with self.conn.cursor(aiomysql.DictCursor) as cursor:
+        async with self.conn.cursor() as cursor:
             await cursor.execute(
-                """
-                SELECT id, email, hashed_password, is_active, created_at
-                FROM users WHERE id = %s
-                """,
+                f"SELECT {USER_MAPPER.select_list()} FROM users WHERE id = %s",
                 (id,),
             )
             row = await cursor.fetchone()
@@ -32,21 +94,13 @@ class UsersRepository:
         if row is None:
             return None
 
-        return User(
-            id=row["id"],
-            email=row["email"],
-            hashed_password=row["hashed_password"],
-            is_active=row["is_active"],
-            created_at=row["created_at"]
-        )
+        return USER_MAPPER(row)
 
+    @timed_query
     async def get_by_email(self, email: str) -> User | None:
-        async with self.conn.cursor(aiomysql.DictCursor) as cursor:
+        async with self.conn.cursor() as cursor:
             await cursor.execute(
-                """
-                SELECT id, email, hashed_password, is_active, created_at
-                FROM users WHERE email = %s
-                """,
+                f"SELECT {USER_MAPPER.select_list()} FROM users WHERE email = %s",
                 (email,),
             )
             row = await cursor.fetchone()
@@ -54,17 +108,78 @@ class UsersRepository:
         if row is None:
             return None
 
-        return User(
-            id=row["id"],
-            email=row["email"],
-            hashed_password=row["hashed_password"],
-            is_active=row["is_active"],
-            created_at=row["created_at"]
-        )
+        return USER_MAPPER(row)
+
+    async def iter_emails(self, after_id: int = 0) -> AsyncIterator[tuple[int, str]]:
+        """Stream (id, email) in id order through a server-side cursor."""
+        async with self.conn.cursor(aiomysql.SSCursor) as cursor:
+            await cursor.execute(
+                "SELECT id, email FROM users WHERE id > %s ORDER BY id",
+                (after_id,),
+            )
+            while rows := await cursor.fetchmany(EMAIL_STREAM_BATCH_SIZE):
+                for row in rows:
+                    yield row
 
+    @timed_query
     async def activate(self, user_id: int) -> None:
         async with self.conn.cursor() as cursor:
             await cursor.execute(
                 "UPDATE users SET is_active=TRUE WHERE id=%s",
                 (user_id,)
             )
+
+    @timed_query
+    async def update_password_hash(
+        self, user_id: int, old_hash: str, new_hash: str
+    ) -> bool:
+        """Replace the hash only if it is still ``old_hash``."""
+        async with self.conn.cursor() as cursor:
+            await cursor.execute(
+                "UPDATE users SET hashed_password=%s "
+                "WHERE id=%s AND hashed_password=%s",
+                (new_hash, user_id, old_hash),
+            )
+            return cursor.rowcount == 1
+
+    @timed_query
+    async def get_with_activation_code_for_update(
+        self, user_id: int
+    ) -> tuple[User | None, ActivationCode | None]:
+        """Lock and fetch a user and its activation code in one round trip."""
+        async with self.conn.cursor() as cursor:
+            await cursor.execute(
+                f"""
+                SELECT {USER_MAPPER.select_list("u")},
+                       {ACTIVATION_CODE_MAPPER.select_list("c")}
+                FROM users u
+                LEFT JOIN activation_codes c ON c.user_id = u.id
+                WHERE u.id = %s
+                FOR UPDATE
+                """,
+                (user_id,),
+            )
+            row = await cursor.fetchone()
+
+        if row is None:
+            return None, None
+
+        user = USER_MAPPER(row)
+        if row[USER_MAPPER.width] is None:
+            return user, None
+
+        return user, ACTIVATION_CODE_MAPPER(row, offset=USER_MAPPER.width)
+
+    @timed_query
+    async def activate_with_code(self, user_id: int) -> None:
+        """Activate the user and consume its activation code in one statement."""
+        async with self.conn.cursor() as cursor:
+            await cursor.execute(
+                """
+                UPDATE users u
+                JOIN activation_codes c ON c.user_id = u.id
+                SET u.is_active = TRUE, c.used = TRUE
+                WHERE u.id = %s
+                """,
+                (user_id,)
+            )
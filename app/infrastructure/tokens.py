@@ -0,0 +1,48 @@
+import base64
+import hashlib
+import hmac
+import logging
+import secrets
+import time
+
+from app.settings import AppSettings
+
+
+logger = logging.getLogger(__name__)
+
+
+class TokenSigner:
+    """
+    Stateless bearer tokens of the form ``<user_id>.<expires_at>.<mac>``,
+    where mac is an HMAC-SHA256 of the first two fields. Verification is a
+    constant-time comparison with no database access, so tokens stay valid
+    until they expire even if the password changes; keep the TTL short.
+    """
+
+    def __init__(self, settings: AppSettings):
+        if settings.auth_token_secret:
+            self._key = settings.auth_token_secret.encode()
+        else:
+            # Tokens are then only valid on this process until it restarts
+            logger.warning("AUTH_TOKEN_SECRET not set, using a random key")
+            self._key = secrets.token_bytes(32)
+        self.ttl_seconds = settings.auth_token_ttl_seconds
+
+    def _mac(self, claims: str) -> str:
+        digest = hmac.new(self._key, claims.encode(), hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+    def issue(self, user_id: int) -> str:
+        claims = f"{user_id}.{int(time.time()) + self.ttl_seconds}"
+        return f"{claims}.{self._mac(claims)}"
+
+    def verify(self, token: str) -> int | None:
+        """The user id carried by a valid, unexpired token, else None."""
+        claims, _, mac = token.rpartition(".")
+        if not hmac.compare_digest(mac.encode(), self._mac(claims).encode()):
+            return None
+
+        user_id, _, expires_at = claims.partition(".")
+        if int(expires_at) <= time.time():
+            return None
+        return int(user_id)
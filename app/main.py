@@ -1,40 +1,156 @@
 from fastapi import FastAPI
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
-from app.settings import AppSettings
-from app.infrastructure.logging import setup_logging
+from app.settings import AppSettings, get_settings
+from app.infrastructure.logging import setup_logging, shutdown_logging
 from app.api.router.healthcheck import router as healthcheck_router
 from app.api.exception_handlers import register_exception_handlers
 from app.api.router.users import router as user_router
 from app.api.router.activation import router as activation_router
+from app.api.router.auth import router as auth_router
+from app.api.router.metrics import router as metrics_router
+from app.api.middleware import MetricsMiddleware
 from app.infrastructure.migrate_db import migrate_database
 from app.infrastructure.database import Database
+from app.infrastructure.repositories.unit_of_work import MySQLUnitOfWork, UnitOfWork
+from app.infrastructure.repositories.memory import InMemoryUnitOfWork
+from app.domain.security import PasswordHasher, calibrate_rounds
+from app.infrastructure.credential_cache import CredentialCache
+from app.infrastructure.tokens import TokenSigner
+from app.infrastructure.email_filter import EmailExistenceFilter
+from app.infrastructure.rate_limiter import InMemoryRateLimitStore, RateLimiter
+from app.infrastructure.metrics import PASSWORD_HASH_DURATION
+from app.infrastructure.email.factory import (
+    create_email_client,
+    create_email_http_client,
+)
+from app.infrastructure.email.dispatch_queue import EmailDispatchQueue
+from app.infrastructure.email.outbox_dispatcher import EmailOutboxDispatcher
+from app.services.users_service import UsersService
+from app.services.registration_batcher import RegistrationBatcher
+from app.services.activation_code_reaper import ActivationCodeReaper
 
 
 def create_app(settings: AppSettings | None = None) -> FastAPI:
-    setup_logging()
-    logger = logging.getLogger(__name__)
-
     if settings is None:
-        settings = AppSettings()
+        settings = get_settings()
+
+    setup_logging(settings)
+    logger = logging.getLogger(__name__)
 
     database = Database(settings)
+    uses_mysql = settings.repository_backend == "mysql"
+    unit_of_work: UnitOfWork = (
+        MySQLUnitOfWork(database) if uses_mysql else InMemoryUnitOfWork()
+    )
+    password_hasher = PasswordHasher(settings, timer=PASSWORD_HASH_DURATION.time)
+    credential_cache = (
+        CredentialCache(settings) if settings.credential_cache_enabled else None
+    )
+    token_signer = TokenSigner(settings)
+    rate_limiter = (
+        RateLimiter(
+            InMemoryRateLimitStore(settings.rate_limit_max_buckets), settings
+        )
+        if settings.rate_limit_enabled
+        else None
+    )
+    registration_batcher = (
+        RegistrationBatcher(unit_of_work, settings)
+        if settings.registration_batching_enabled
+        else None
+    )
+    activation_code_reaper = ActivationCodeReaper(unit_of_work, settings)
+    email_filter = (
+        EmailExistenceFilter(unit_of_work, settings)
+        if settings.email_filter_enabled
+        else None
+    )
+    users_service = UsersService(
+        unit_of_work,
+        settings,
+        password_hasher,
+        credential_cache,
+        registration_batcher,
+        email_filter,
+    )
 
     @asynccontextmanager
     async def lifespan(app: FastAPI):
+        setup_logging(settings)
         logger.info("starting application")
 
-        await database.connect()
-        if settings.environment != "test":
-            await migrate_database()
+        if uses_mysql:
+            await database.connect()
+            await database.warm_up()
+            if settings.environment != "test":
+                await migrate_database(database)
 
+        password_hasher.start()
+        if settings.bcrypt_calibrate_on_startup:
+            recommended, _ = await asyncio.get_running_loop().run_in_executor(
+                None, calibrate_rounds, settings.bcrypt_target_seconds
+            )
+            logger.info(
+                "bcrypt calibration: %s rounds fit %.0fms on this host "
+                "(configured: %s)",
+                recommended,
+                settings.bcrypt_target_seconds * 1000,
+                settings.bcrypt_rounds,
+            )
+        if registration_batcher is not None:
+            registration_batcher.start()
+
+        http_client = None
+        if settings.email_provider_mode == "http":
+            http_client = create_email_http_client(settings)
+        email_client = create_email_client(settings, http_client)
+        email_queue = EmailDispatchQueue(email_client, settings)
+        email_dispatcher = EmailOutboxDispatcher(
+            unit_of_work,
+            email_queue,
+            settings,
+            circuit_breaker=getattr(email_client, "breaker", None),
+        )
+        if not uses_mysql or settings.environment != "test":
+            email_queue.start()
+            email_dispatcher.start()
+            if settings.activation_code_reaper_enabled:
+                activation_code_reaper.start()
+            if email_filter is not None:
+                await email_filter.load()
+                email_filter.start()
+
+        app.state.settings = settings
         app.state.db = database
+        app.state.unit_of_work = unit_of_work
+        app.state.password_hasher = password_hasher
+        app.state.credential_cache = credential_cache
+        app.state.token_signer = token_signer
+        app.state.rate_limiter = rate_limiter
+        app.state.http_client = http_client
+        app.state.email_client = email_client
+        app.state.email_queue = email_queue
+        app.state.users_service = users_service
 
         yield
 
         logger.info("shutting down application")
+        if registration_batcher is not None:
+            await registration_batcher.stop()
+        await email_dispatcher.stop()
+        await email_queue.stop()
+        await activation_code_reaper.stop()
+        if email_filter is not None:
+            await email_filter.stop()
+        if http_client is not None:
+            await http_client.aclose()
         await database.disconnect()
+        password_hasher.shutdown()
+        logger.info("application stopped")
+        shutdown_logging()
 
     app = FastAPI(
         title=settings.app_name,
@@ -43,9 +159,15 @@ def create_app(settings: AppSettings | None = None) -> FastAPI:
         lifespan=lifespan,
     )
 
-    for router in (healthcheck_router, user_router, activation_router):
+    for router in (
+        healthcheck_router, user_router, auth_router, activation_router
+    ):
         app.include_router(router)
 
+    if settings.metrics_enabled:
+        app.include_router(metrics_router)
+        app.add_middleware(MetricsMiddleware)
+
     register_exception_handlers(app)
 
     return app
@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+
+from app.settings import AppSettings
+from app.infrastructure.metrics import (
+    ACTIVATION_CODE_REAP_DURATION,
+    ACTIVATION_CODES_PURGED,
+    EMAIL_OUTBOX_PURGED,
+)
+from app.infrastructure.repositories.unit_of_work import Repositories, UnitOfWork
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class ReapResult:
+    purged: int
+    outbox_purged: int
+    batches: int
+    duration_seconds: float
+
+
+class ActivationCodeReaper:
+    """
+    Deletes used or expired activation codes in small batches, then the
+    email_outbox rows that carried them once delivered or abandoned.
+    Each batch is its own short transaction and batches are paced, so the
+    reaper never holds locks on either table for long.
+    """
+
+    def __init__(self, uow: UnitOfWork, settings: AppSettings):
+        self.uow = uow
+        self._interval = settings.activation_code_reaper_interval_seconds
+        self._batch_size = settings.activation_code_reaper_batch_size
+        self._pause = settings.activation_code_reaper_pause_seconds
+        self._retention = settings.activation_code_retention
+        self._outbox_retention = settings.email_outbox_retention
+        self._outbox_max_attempts = settings.email_outbox_max_attempts
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Activation code reaper run failed")
+            await asyncio.sleep(self._interval)
+
+    async def run_once(self) -> ReapResult:
+        started = time.perf_counter()
+        now = datetime.now(tz=timezone.utc)
+
+        purged, code_batches = await self._purge_in_batches(
+            lambda repos: repos.codes.purge_expired(
+                now=now,
+                unused_expired_before=now - self._retention,
+                limit=self._batch_size,
+            )
+        )
+        ACTIVATION_CODES_PURGED.inc(amount=purged)
+
+        outbox_purged, outbox_batches = await self._purge_in_batches(
+            lambda repos: repos.outbox.purge_finished(
+                finished_before=now - self._outbox_retention,
+                max_attempts=self._outbox_max_attempts,
+                limit=self._batch_size,
+            )
+        )
+        EMAIL_OUTBOX_PURGED.inc(amount=outbox_purged)
+
+        result = ReapResult(
+            purged=purged,
+            outbox_purged=outbox_purged,
+            batches=code_batches + outbox_batches,
+            duration_seconds=time.perf_counter() - started,
+        )
+        ACTIVATION_CODE_REAP_DURATION.observe(result.duration_seconds)
+        logger.info(
+            "Purged %s activation codes and %s outbox rows in %s batches (%.3fs)",
+            result.purged,
+            result.outbox_purged,
+            result.batches,
+            result.duration_seconds,
+        )
+        return result
+
+    async def _purge_in_batches(
+        self, purge: Callable[[Repositories], Awaitable[int]]
+    ) -> tuple[int, int]:
+        """Run ``purge`` until a batch comes back short. Returns (rows, batches)."""
+        purged = 0
+        batches = 0
+        while True:
+            async with self.uow.transaction() as repos:
+                deleted = await purge(repos)
+            batches += 1
+            purged += deleted
+
+            if deleted < self._batch_size:
+                return purged, batches
+            await asyncio.sleep(self._pause)
@@ -0,0 +1,156 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from app.settings import AppSettings
+from app.domain.exceptions import UserAlreadyExists
+from app.infrastructure.email.client import EmailMessage
+from app.infrastructure.repositories.unit_of_work import UnitOfWork
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class PendingRegistration:
+    email: str
+    hashed_password: str
+    hashed_code: str
+    expires_at: datetime
+    message: EmailMessage
+    result: asyncio.Future = field(repr=False)
+
+
+class RegistrationBatcher:
+    """
+    Group commit for registrations.
+    Concurrent register calls are collected for a short window (or until
+    the batch is full) and written with multi-row INSERTs in a single
+    transaction. Each caller gets its own user id or UserAlreadyExists.
+    """
+
+    def __init__(self, uow: UnitOfWork, settings: AppSettings):
+        self.uow = uow
+        self._max_batch_size = settings.registration_batch_max_size
+        self._window = settings.registration_batch_window_ms / 1000
+        self._pending: list[PendingRegistration] = []
+        self._wakeup = asyncio.Event()
+        self._full = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush pending registrations, then stop the background task."""
+        if self._task is None:
+            return
+
+        self._stopping = True
+        self._full.set()
+        self._wakeup.set()
+        await self._task
+        self._task = None
+
+    async def submit(
+        self,
+        email: str,
+        hashed_password: str,
+        hashed_code: str,
+        expires_at: datetime,
+        message: EmailMessage,
+    ) -> int:
+        if self._task is None or self._stopping:
+            raise RuntimeError("Registration batcher not running")
+
+        registration = PendingRegistration(
+            email=email,
+            hashed_password=hashed_password,
+            hashed_code=hashed_code,
+            expires_at=expires_at,
+            message=message,
+            result=asyncio.get_running_loop().create_future(),
+        )
+        self._pending.append(registration)
+        if len(self._pending) >= self._max_batch_size:
+            self._full.set()
+        self._wakeup.set()
+
+        return await registration.result
+
+    def _take_batch(self) -> list[PendingRegistration]:
+        batch = self._pending[:self._max_batch_size]
+        self._pending = self._pending[self._max_batch_size:]
+        return batch
+
+    async def _run(self) -> None:
+        while not (self._stopping and not self._pending):
+            await self._wakeup.wait()
+            if len(self._pending) < self._max_batch_size:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self._window)
+                except asyncio.TimeoutError:
+                    pass
+
+            batch = self._take_batch()
+            if not self._stopping:
+                if len(self._pending) < self._max_batch_size:
+                    self._full.clear()
+                if not self._pending:
+                    self._wakeup.clear()
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[PendingRegistration]) -> None:
+        batch = [r for r in batch if not r.result.done()]
+        if not batch:
+            return
+
+        # The unique index on users.email is case-insensitive
+        unique: dict[str, PendingRegistration] = {}
+        for registration in batch:
+            key = registration.email.lower()
+            if key in unique:
+                registration.result.set_exception(UserAlreadyExists())
+            else:
+                unique[key] = registration
+        registrations = list(unique.values())
+
+        try:
+            user_ids = await self._write(registrations)
+        except Exception as e:
+            logger.exception("Registration batch of %s failed", len(registrations))
+            for registration in registrations:
+                if not registration.result.done():
+                    registration.result.set_exception(e)
+            return
+
+        for registration in registrations:
+            if registration.result.done():
+                continue
+            user_id = user_ids.get(registration.email)
+            if user_id is None:
+                registration.result.set_exception(UserAlreadyExists())
+            else:
+                registration.result.set_result(user_id)
+
+    async def _write(self, registrations: list[PendingRegistration]) -> dict[str, int]:
+        now = datetime.now(tz=timezone.utc)
+        async with self.uow.transaction() as repos:
+            user_ids = await repos.users.create_many(
+                [(r.email, r.hashed_password) for r in registrations]
+            )
+            created = [r for r in registrations if r.email in user_ids]
+
+            await repos.codes.create_or_replace_many(
+                [(user_ids[r.email], r.hashed_code, r.expires_at) for r in created]
+            )
+            await repos.outbox.enqueue_many(
+                [r.message for r in created], available_at=now
+            )
+
+        return user_ids
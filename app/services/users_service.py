@@ -1,32 +1,72 @@
 from datetime import datetime, timezone
 from hashlib import sha256
+from dataclasses import dataclass, field
 from typing import Optional
+import asyncio
+import hmac
+import logging
 import secrets
 
 from app.settings import AppSettings
-from app.domain.security import hash_password, verify_password
+from app.domain.security import PasswordHasher
 from app.domain.models.user import User
 from app.domain.models.activation_code import ActivationCode
 from app.infrastructure.email.client import EmailMessage
-from app.infrastructure.database import Database
-from app.infrastructure.repositories.users_repository import UsersRepository
-from app.infrastructure.repositories.activation_code_repository import (
-    ActivationCodeRepository
-)
+from app.infrastructure.cache import TTLCache
+from app.infrastructure.credential_cache import CredentialCache
+from app.infrastructure.email_filter import EmailExistenceFilter
+from app.infrastructure.repositories.unit_of_work import UnitOfWork
+from app.services.registration_batcher import RegistrationBatcher
 from app.domain.exceptions import (
-    UserAlreadyExists,
+    DomainError,
+    IdempotencyKeyReused,
     InvalidCredentials,
     InvalidActivationCode,
     ActivationCodeExpired,
-    UserAlreadyActive
+    UserAlreadyActive,
+    UserAlreadyExists,
 )
 
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class _InFlightRegistration:
+    password: str
+    result: asyncio.Future = field(repr=False)
+
+
+@dataclass(frozen=True, slots=True)
+class _IdempotentResult:
+    fingerprint: bytes
+    # The error class, not the instance: a cached instance would keep its
+    # traceback (and the frames' password locals) alive and grow on replay
+    outcome: int | type[DomainError]
+
+
 class UsersService:
-    def __init__(self, db: Database, email_client, settings: AppSettings):
+    def __init__(
+        self,
+        uow: UnitOfWork,
+        settings: AppSettings,
+        password_hasher: PasswordHasher | None = None,
+        credential_cache: CredentialCache | None = None,
+        registration_batcher: RegistrationBatcher | None = None,
+        email_filter: EmailExistenceFilter | None = None,
+    ):
         self.settings: AppSettings = settings
-        self.db = db
-        self.email_client = email_client
+        self.uow = uow
+        self.password_hasher = password_hasher or PasswordHasher(settings)
+        self.credential_cache = credential_cache
+        self.registration_batcher = registration_batcher
+        self.email_filter = email_filter
+        self._registrations: dict[str, _InFlightRegistration] = {}
+        self._idempotency_secret = secrets.token_bytes(32)
+        self._idempotent_results: TTLCache[str, _IdempotentResult] = TTLCache(
+            max_entries=settings.idempotency_key_max_entries,
+            ttl_seconds=settings.idempotency_key_ttl_seconds,
+        )
 
     def _generate_activation_code(self) -> str:
         if self.settings.environment == "integration":
@@ -36,49 +76,141 @@ class UsersService:
     def _hash_activation_code(self, code: str) -> str:
         return sha256(code.encode()).hexdigest()
 
-    async def register(self, email: str, password: str) -> int:
-        now = datetime.now(tz=timezone.utc)
-        async with self.db.transaction() as conn:
-            users_repo: UsersRepository = UsersRepository(conn)
-            codes_repo: ActivationCodeRepository = ActivationCodeRepository(conn)
+    def _request_fingerprint(self, email: str, password: str) -> bytes:
+        # HMAC under a per-process secret: no plain password is kept
+        message = email.lower().encode() + b"\x00" + password.encode()
+        return hmac.new(self._idempotency_secret, message, sha256).digest()
 
-            user = await users_repo.get_by_email(email)
-            if user:
+    async def register(
+        self, email: str, password: str, idempotency_key: str | None = None
+    ) -> int:
+        """
+        Create the user, its activation code and activation email.
+
+        Concurrent calls for the same email share one execution: a duplicate
+        with the same password gets the first call's outcome, any other
+        gets UserAlreadyExists. With an ``idempotency_key`` the outcome is
+        also replayed to retries for ``idempotency_key_ttl_seconds``.
+        """
+        if idempotency_key is None:
+            return await self._register_once(email, password)
+
+        fingerprint = self._request_fingerprint(email, password)
+        cached = self._idempotent_results.get(idempotency_key)
+        if cached is not None:
+            if not hmac.compare_digest(cached.fingerprint, fingerprint):
+                raise IdempotencyKeyReused()
+            if isinstance(cached.outcome, type):
+                raise cached.outcome()
+            return cached.outcome
+
+        try:
+            user_id = await self._register_once(email, password)
+        except DomainError as e:
+            self._idempotent_results.set(
+                idempotency_key, _IdempotentResult(fingerprint, type(e))
+            )
+            raise
+        self._idempotent_results.set(
+            idempotency_key, _IdempotentResult(fingerprint, user_id)
+        )
+        return user_id
+
+    async def _register_once(self, email: str, password: str) -> int:
+        key = email.lower()
+        leader = self._registrations.get(key)
+        if leader is not None:
+            try:
+                user_id = await asyncio.shield(leader.result)
+            except asyncio.CancelledError:
+                if not leader.result.cancelled():
+                    raise
+                return await self._register_once(email, password)
+            if not hmac.compare_digest(leader.password.encode(), password.encode()):
                 raise UserAlreadyExists()
+            return user_id
+
+        registration = _InFlightRegistration(
+            password=password,
+            result=asyncio.get_running_loop().create_future(),
+        )
+        self._registrations[key] = registration
+        try:
+            user_id = await self._register(email, password)
+        except asyncio.CancelledError:
+            registration.result.cancel()
+            raise
+        except Exception as e:
+            registration.result.set_exception(e)
+            # Duplicates may not exist; don't log it as never retrieved
+            registration.result.exception()
+            raise
+        else:
+            registration.result.set_result(user_id)
+            return user_id
+        finally:
+            del self._registrations[key]
 
-            user_id = await users_repo.create(email, hash_password(password))
-            code = self._generate_activation_code()
-            hashed_code = self._hash_activation_code(code)
-            expires_at = now + self.settings.activation_code_ttl
+    async def _register(self, email: str, password: str) -> int:
+        if self.email_filter is not None and self.email_filter.might_exist(email):
+            # Probably taken: one indexed lookup spares a bcrypt hash. Misses
+            # skip it and rely on the unique index as before.
+            async with self.uow.connection() as repos:
+                if await repos.users.get_by_email(email) is not None:
+                    raise UserAlreadyExists()
+            await self.uow.release_connection()
 
-            await codes_repo.create_or_replace(
+        user_id = await self._create_user(email, password)
+        if self.email_filter is not None:
+            self.email_filter.add(email)
+        return user_id
+
+    async def _create_user(self, email: str, password: str) -> int:
+        now = datetime.now(tz=timezone.utc)
+        hashed_password = await self.password_hasher.hash_password(password)
+        code = self._generate_activation_code()
+        hashed_code = self._hash_activation_code(code)
+        expires_at = now + self.settings.activation_code_ttl
+        message = EmailMessage(
+            to=email,
+            sender=self.settings.email_from,
+            subject="Activate your account",
+            body=f"Your activation code is: {code} (valid for 1 minute)",
+        )
+
+        if self.registration_batcher is not None:
+            return await self.registration_batcher.submit(
+                email=email,
+                hashed_password=hashed_password,
+                hashed_code=hashed_code,
+                expires_at=expires_at,
+                message=message,
+            )
+
+        async with self.uow.transaction() as repos:
+            # Raises UserAlreadyExists on a duplicate email
+            user_id = await repos.users.create(email, hashed_password)
+
+            await repos.codes.create_or_replace(
                 user_id=user_id,
                 hashed_code=hashed_code,
                 expires_at=expires_at
             )
 
-            await self.email_client.send(
-                EmailMessage(
-                    to=email,
-                    sender=self.settings.email_from,
-                    subject="Activate your account",
-                    body=f"Your activation code is: {code} (valid for 1 minute)",
-                )
-            )
+            # Delivered by EmailOutboxDispatcher once this transaction commits
+            await repos.outbox.enqueue(message, available_at=now)
             return user_id
 
     async def activate(self, user_id: int, code: str) -> None:
         now = datetime.now(tz=timezone.utc)
 
-        async with self.db.transaction() as conn:
-            users_repo: UsersRepository = UsersRepository(conn)
-            codes_repo: ActivationCodeRepository = ActivationCodeRepository(
-                conn
+        async with self.uow.transaction() as repos:
+            user: Optional[User]
+            activation_code: Optional[ActivationCode]
+            user, activation_code = (
+                await repos.users.get_with_activation_code_for_update(user_id)
             )
 
-            user: Optional[User] = await users_repo.get_by_id(user_id)
-            activation_code: Optional[ActivationCode] = await codes_repo.get_for_update(user_id)
-
             if not user:
                 raise InvalidCredentials()
 
@@ -94,16 +226,55 @@ class UsersService:
             if activation_code.expires_at < now:
                 raise ActivationCodeExpired()
 
-            await users_repo.activate(user_id)
-            await codes_repo.mark_used(user_id)
+            await repos.users.activate_with_code(user_id)
 
     async def verify_credentials(self, email: str, password: str):
-        async with self.db.get_connection() as conn:
-            users_repo: UsersRepository = UsersRepository(conn)
-            user = await users_repo.get_by_email(email)
+        if self.email_filter is not None and not self.email_filter.might_exist(email):
+            raise InvalidCredentials()
+
+        async with self.uow.connection() as repos:
+            user = await repos.users.get_by_email(email)
         if not user:
             raise InvalidCredentials()
 
-        if not verify_password(password, user.hashed_password):
+        if self.credential_cache is not None:
+            cached_user_id = self.credential_cache.lookup(
+                email, password, user.hashed_password
+            )
+            if cached_user_id == user.id:
+                return user.id
+
+        # Don't hold a pooled connection through bcrypt
+        await self.uow.release_connection()
+
+        if not await self.password_hasher.verify_password(
+            password, user.hashed_password
+        ):
             raise InvalidCredentials()
+
+        hashed_password = user.hashed_password
+        if self.password_hasher.needs_rehash(hashed_password):
+            hashed_password = await self._rehash(user, password)
+
+        if self.credential_cache is not None:
+            self.credential_cache.store(
+                email, password, user.id, hashed_password
+            )
         return user.id
+
+    async def _rehash(self, user: User, password: str) -> str:
+        """
+        Upgrade a hash made with another bcrypt cost. The write is a
+        compare-and-set, so a concurrent password change always wins.
+        """
+        try:
+            new_hash = await self.password_hasher.hash_password(password)
+            async with self.uow.transaction() as repos:
+                updated = await repos.users.update_password_hash(
+                    user.id, user.hashed_password, new_hash
+                )
+        except Exception:
+            logger.exception("Password rehash failed for user %s", user.id)
+            return user.hashed_password
+
+        return new_hash if updated else user.hashed_password
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from datetime import timedelta
 from pydantic import Field, AnyUrl
@@ -10,6 +11,15 @@ class AppSettings(BaseSettings):
     version: str = "0.1.0"
     environment: str = Field(default="production")
 
+    metrics_enabled: bool = Field(default=True)
+
+    # Logging: "text" or "json"; fraction of INFO records kept (1.0 = all)
+    log_format: str = Field(default="text")
+    log_info_sample_rate: float = Field(default=1.0)
+
+    # Repository backend ("mysql" | "memory")
+    repository_backend: str = Field(default="mysql")
+
     # MySQL Database
     mysql_host: str = Field(...)
     mysql_port: int = Field(...)
@@ -20,15 +30,108 @@ class AppSettings(BaseSettings):
     # Pool settings
     db_pool_min_size: int = Field(default=5)
     db_pool_max_size: int = Field(default=20)
+    # Connections older than this are reopened (-1 disables recycling)
+    db_pool_recycle_seconds: int = Field(default=3600)
+    # Admission control: shed requests instead of queueing without bound
+    db_pool_acquire_timeout_seconds: float = Field(default=2.0)
+    db_pool_max_waiting: int = Field(default=100)
+    db_overload_retry_after_seconds: int = Field(default=1)
+    # Readiness probe: DB ping result is reused for this long
+    db_ping_cache_seconds: float = Field(default=2.0)
+    db_ping_timeout_seconds: float = Field(default=1.0)
+
+    # Schema migrations: how long a replica waits for another one to finish
+    migration_lock_timeout_seconds: int = Field(default=60)
+
+    # Password hashing executor ("thread" | "process")
+    password_hasher_executor: str = Field(default="thread")
+    password_hasher_max_workers: int = Field(default=4)
+    # bcrypt cost factor; stored hashes with another cost are rehashed on login
+    bcrypt_rounds: int = Field(default=12, ge=4, le=31)
+    # Log a recommended cost for this host at startup (see app.cli calibrate-bcrypt)
+    bcrypt_calibrate_on_startup: bool = Field(default=False)
+    bcrypt_target_seconds: float = Field(default=0.25)
+
+    # Bearer tokens issued by POST /auth/token (random per-process key if unset)
+    auth_token_secret: str = Field(default="")
+    auth_token_ttl_seconds: int = Field(default=900)
+
+    # Token-bucket rate limits in front of bcrypt-heavy endpoints
+    rate_limit_enabled: bool = Field(default=False)
+    rate_limit_client_per_minute: float = Field(default=120.0)
+    rate_limit_client_burst: float = Field(default=30.0)
+    rate_limit_account_per_minute: float = Field(default=10.0)
+    rate_limit_account_burst: float = Field(default=5.0)
+    rate_limit_max_buckets: int = Field(default=100_000)
+
+    # Verified credentials cache (Basic Auth)
+    credential_cache_enabled: bool = Field(default=True)
+    credential_cache_max_entries: int = Field(default=10_000)
+    credential_cache_ttl_seconds: float = Field(default=60.0)
+
+    # Registered-email Bloom filter (opt-in): definite misses skip MySQL.
+    # Rows created by other replicas are picked up every refresh interval.
+    email_filter_enabled: bool = Field(default=False)
+    email_filter_expected_items: int = Field(default=1_000_000)
+    email_filter_false_positive_rate: float = Field(default=0.01, gt=0, lt=1)
+    email_filter_refresh_seconds: float = Field(default=5.0)
+    # rows committed this long after their id was allocated are still found
+    email_filter_commit_grace_seconds: float = Field(default=60.0)
+
+    # Replay window for POST /users/register with an Idempotency-Key header
+    idempotency_key_ttl_seconds: float = Field(default=300.0)
+    idempotency_key_max_entries: int = Field(default=10_000)
+
+    # Registration group commit (opt-in)
+    registration_batching_enabled: bool = Field(default=False)
+    registration_batch_max_size: int = Field(default=100)
+    registration_batch_window_ms: float = Field(default=5.0)
 
     # activation code tll
     activation_code_ttl: timedelta = timedelta(minutes=1)
 
+    # expired activation code reaper
+    activation_code_reaper_enabled: bool = Field(default=True)
+    activation_code_reaper_interval_seconds: float = Field(default=300.0)
+    activation_code_reaper_batch_size: int = Field(default=1000)
+    activation_code_reaper_pause_seconds: float = Field(default=0.1)
+    # unused expired codes are kept this long so activation still answers 410
+    activation_code_retention: timedelta = timedelta(days=1)
+
     # fakse smtp provider
     email_provider_base_url: AnyUrl = Field(default="http://mailhog:8025")
     email_provider_timeout_seconds: float = 2.0
     email_from: str = "no-reply@registration.local"
     email_provider_mode: str = "console"
+    email_provider_max_connections: int = Field(default=20)
+    email_provider_max_keepalive_connections: int = Field(default=10)
+    email_provider_keepalive_expiry_seconds: float = Field(default=30.0)
+
+    # Email provider circuit breaker and retry budget (http mode)
+    email_circuit_failure_rate_threshold: float = Field(default=0.5)
+    email_circuit_minimum_calls: int = Field(default=10)
+    email_circuit_window_seconds: float = Field(default=30.0)
+    email_circuit_open_seconds: float = Field(default=15.0)
+    email_circuit_half_open_max_calls: int = Field(default=3)
+    email_retry_max_retries: int = Field(default=2)
+    email_retry_base_delay_seconds: float = Field(default=0.1)
+    email_retry_budget_ratio: float = Field(default=0.2)
+    email_retry_budget_max_tokens: float = Field(default=10.0)
+
+    # email dispatch queue: bounded concurrency towards the provider
+    email_dispatch_queue_size: int = Field(default=1000)
+    email_dispatch_workers: int = Field(default=4)
+    # >1 coalesces queued messages for clients supporting send_batch
+    email_dispatch_batch_size: int = Field(default=1)
+    email_dispatch_drain_timeout_seconds: float = Field(default=10.0)
+
+    # email outbox dispatcher
+    email_outbox_batch_size: int = Field(default=50)
+    email_outbox_poll_interval_seconds: float = Field(default=0.5)
+    email_outbox_lease_seconds: float = Field(default=30.0)
+    email_outbox_max_attempts: int = Field(default=5)
+    # delivered or abandoned rows are purged by the reaper after this long
+    email_outbox_retention: timedelta = timedelta(days=1)
 
     model_config = SettingsConfigDict(
         env_prefix="",
@@ -43,5 +146,7 @@ class AppSettings(BaseSettings):
         )
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> AppSettings:
+    """Process-wide settings, read from the environment once."""
     return AppSettings()
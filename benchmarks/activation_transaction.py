@@ -0,0 +1,111 @@
+"""
+Duration of the activation transaction against a real MySQL instance.
+
+Compares the previous four-statement flow (get_by_id, get_for_update,
+activate, mark_used) with the single locked JOIN plus multi-table UPDATE.
+Connection settings are read from the usual MYSQL_* environment
+variables; the schema must already exist.
+
+    python -m benchmarks.activation_transaction --users 500
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.settings import AppSettings
+from app.infrastructure.database import Database
+from app.infrastructure.repositories.users_repository import UsersRepository
+from app.infrastructure.repositories.activation_code_repository import (
+    ActivationCodeRepository,
+)
+
+
+async def seed_users(db: Database, prefix: str, count: int) -> list[int]:
+    expires_at = datetime.now(tz=timezone.utc) + timedelta(hours=1)
+    user_ids = []
+    async with db.transaction() as conn:
+        users_repo = UsersRepository(conn)
+        codes_repo = ActivationCodeRepository(conn)
+        for i in range(count):
+            user_id = await users_repo.create(f"{prefix}-{i}@bench.local", "x")
+            await codes_repo.create_or_replace(user_id, "0" * 64, expires_at)
+            user_ids.append(user_id)
+    return user_ids
+
+
+async def cleanup(db: Database, prefix: str) -> None:
+    async with db.transaction() as conn:
+        async with conn.cursor() as cursor:
+            await cursor.execute(
+                """
+                DELETE c FROM activation_codes c
+                JOIN users u ON u.id = c.user_id
+                WHERE u.email LIKE %s
+                """,
+                (f"{prefix}-%",),
+            )
+            await cursor.execute(
+                "DELETE FROM users WHERE email LIKE %s", (f"{prefix}-%",)
+            )
+
+
+async def activate_four_statements(db: Database, user_id: int) -> None:
+    async with db.transaction() as conn:
+        users_repo = UsersRepository(conn)
+        codes_repo = ActivationCodeRepository(conn)
+        await users_repo.get_by_id(user_id)
+        await codes_repo.get_for_update(user_id)
+        await users_repo.activate(user_id)
+        await codes_repo.mark_used(user_id)
+
+
+async def activate_single_round_trip(db: Database, user_id: int) -> None:
+    async with db.transaction() as conn:
+        users_repo = UsersRepository(conn)
+        await users_repo.get_with_activation_code_for_update(user_id)
+        await users_repo.activate_with_code(user_id)
+
+
+async def measure(db: Database, flow, user_ids: list[int]) -> list[float]:
+    durations = []
+    for user_id in user_ids:
+        started = time.perf_counter()
+        await flow(db, user_id)
+        durations.append(time.perf_counter() - started)
+    return durations
+
+
+def report(name: str, durations: list[float]) -> None:
+    durations = sorted(durations)
+    p95 = durations[int(len(durations) * 0.95) - 1]
+    print(
+        f"{name:<20} transactions={len(durations)} "
+        f"mean={statistics.mean(durations) * 1000:.3f}ms "
+        f"p50={statistics.median(durations) * 1000:.3f}ms "
+        f"p95={p95 * 1000:.3f}ms"
+    )
+
+
+async def main(users: int) -> None:
+    db = Database(AppSettings(environment="benchmark"))
+    await db.connect()
+    prefix = f"bench-{uuid.uuid4().hex[:8]}"
+    try:
+        before = await seed_users(db, f"{prefix}-a", users)
+        after = await seed_users(db, f"{prefix}-b", users)
+
+        report("four statements", await measure(db, activate_four_statements, before))
+        report("single round trip", await measure(db, activate_single_round_trip, after))
+    finally:
+        await cleanup(db, prefix)
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.users))
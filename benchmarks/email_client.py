@@ -0,0 +1,150 @@
+"""
+Per-send latency of EmailClient against a local stub provider.
+
+Compares the previous behaviour (one httpx.AsyncClient, hence one TCP
+connection, per message) with the shared keep-alive client used by the
+application.
+
+    python -m benchmarks.email_client --messages 500 --concurrency 10
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from app.infrastructure.email.client import EmailClient, EmailMessage
+
+
+MESSAGE = EmailMessage(
+    to="bench@example.com",
+    subject="Activate your account",
+    body="Your activation code is: 1234 (valid for 1 minute)",
+    sender="no-reply@registration.local",
+)
+
+RESPONSE = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: application/json\r\n"
+    b"Content-Length: 2\r\n"
+    b"\r\n"
+    b"{}"
+)
+
+
+async def _handle_provider_connection(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    delay: float,
+) -> None:
+    try:
+        while True:
+            headers = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in headers.split(b"\r\n"):
+                name, _, value = line.partition(b":")
+                if name.strip().lower() == b"content-length":
+                    length = int(value.strip())
+            await reader.readexactly(length)
+
+            if delay:
+                await asyncio.sleep(delay)
+            writer.write(RESPONSE)
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionResetError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_stub_provider(delay: float) -> asyncio.Server:
+    return await asyncio.start_server(
+        lambda r, w: _handle_provider_connection(r, w, delay),
+        host="127.0.0.1",
+        port=0,
+    )
+
+
+class PerSendEmailClient:
+    """Previous implementation: a new AsyncClient for every message."""
+
+    def __init__(self, base_url: str, timeout_seconds: float):
+        self._base_url = base_url
+        self._timeout = timeout_seconds
+
+    async def send(self, message: EmailMessage) -> None:
+        async with httpx.AsyncClient(timeout=self._timeout) as client:
+            resp = await client.post(
+                f"{self._base_url}/send",
+                json={
+                    "from": message.sender,
+                    "to": message.to,
+                    "subject": message.subject,
+                    "body": message.body,
+                },
+            )
+            resp.raise_for_status()
+
+
+async def measure(client, messages: int, concurrency: int) -> list[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def send_one() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await client.send(MESSAGE)
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(send_one() for _ in range(messages)))
+    return latencies
+
+
+def report(name: str, latencies: list[float], elapsed: float) -> None:
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{name:<10} sends={len(latencies)} "
+        f"mean={statistics.mean(latencies) * 1000:.2f}ms "
+        f"p50={statistics.median(latencies) * 1000:.2f}ms "
+        f"p95={p95 * 1000:.2f}ms "
+        f"throughput={len(latencies) / elapsed:.0f}/s"
+    )
+
+
+async def main(messages: int, concurrency: int, delay_ms: float) -> None:
+    server = await start_stub_provider(delay_ms / 1000)
+    host, port = server.sockets[0].getsockname()[:2]
+    base_url = f"http://{host}:{port}"
+
+    async with server:
+        per_send = PerSendEmailClient(base_url, timeout_seconds=5.0)
+        started = time.perf_counter()
+        latencies = await measure(per_send, messages, concurrency)
+        report("per-send", latencies, time.perf_counter() - started)
+
+        async with httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=concurrency,
+                max_keepalive_connections=concurrency,
+            ),
+        ) as http_client:
+            shared = EmailClient(http_client, base_url, timeout_seconds=5.0)
+            started = time.perf_counter()
+            latencies = await measure(shared, messages, concurrency)
+            report("shared", latencies, time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument(
+        "--delay-ms",
+        type=float,
+        default=0.0,
+        help="simulated provider processing time",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.messages, args.concurrency, args.delay_ms))
@@ -0,0 +1,202 @@
+"""
+Throughput and latency of the HTTP API, driven in-process through ASGI.
+
+Scenarios:
+- register:     POST /users/register with fresh emails
+- activate:     POST /activation for freshly registered users
+- auth-failure: POST /activation with a wrong password
+
+The memory backend (REPOSITORY_BACKEND=memory) keeps all data in process
+so UsersService, bcrypt and the HTTP stack are measured in isolation. The
+mysql backend runs the real application against the database configured
+through MYSQL_* (e.g. the docker compose MySQL container).
+
+    python -m benchmarks.load --backend memory --requests 200 --concurrency 20
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+import uuid
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+
+import httpx
+
+from app.main import create_app
+from app.settings import AppSettings
+
+
+PASSWORD = "BenchmarkPassword123"
+INTEGRATION_CODE = "1234"
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    latencies: list[float] = field(default_factory=list)
+    statuses: dict[int, int] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    def percentile(self, q: float) -> float:
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))
+        return ordered[index]
+
+    def report(self) -> str:
+        return (
+            f"{self.name:<13} requests={len(self.latencies)} "
+            f"rps={len(self.latencies) / self.elapsed:.1f} "
+            f"p50={self.percentile(0.50) * 1000:.1f}ms "
+            f"p95={self.percentile(0.95) * 1000:.1f}ms "
+            f"p99={self.percentile(0.99) * 1000:.1f}ms "
+            f"mean={statistics.mean(self.latencies) * 1000:.1f}ms "
+            f"statuses={dict(sorted(self.statuses.items()))}"
+        )
+
+
+class Benchmark:
+    def __init__(self, client: httpx.AsyncClient, concurrency: int, code_for):
+        self.client = client
+        self.concurrency = concurrency
+        self.code_for = code_for
+        self.prefix = uuid.uuid4().hex[:8]
+        self._counter = 0
+
+    def new_email(self) -> str:
+        self._counter += 1
+        return f"load-{self.prefix}-{self._counter}@example.com"
+
+    async def register(self, email: str) -> httpx.Response:
+        return await self.client.post(
+            "/users/register", json={"email": email, "password": PASSWORD}
+        )
+
+    async def activate(self, email: str, password: str = PASSWORD) -> httpx.Response:
+        return await self.client.post(
+            "/activation",
+            json={"code": self.code_for(email)},
+            auth=(email, password),
+        )
+
+    async def run(self, name: str, calls) -> ScenarioResult:
+        result = ScenarioResult(name)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def timed(call) -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                response = await call()
+                result.latencies.append(time.perf_counter() - started)
+                result.statuses[response.status_code] = (
+                    result.statuses.get(response.status_code, 0) + 1
+                )
+
+        started = time.perf_counter()
+        await asyncio.gather(*(timed(call) for call in calls))
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    async def prepare_users(self, count: int) -> list[str]:
+        emails = [self.new_email() for _ in range(count)]
+        await self.run("setup", [lambda e=e: self.register(e) for e in emails])
+        return emails
+
+    async def scenario_register(self, requests: int) -> ScenarioResult:
+        emails = [self.new_email() for _ in range(requests)]
+        return await self.run(
+            "register", [lambda e=e: self.register(e) for e in emails]
+        )
+
+    async def scenario_activate(self, requests: int) -> ScenarioResult:
+        emails = await self.prepare_users(requests)
+        return await self.run(
+            "activate", [lambda e=e: self.activate(e) for e in emails]
+        )
+
+    async def scenario_auth_failure(self, requests: int) -> ScenarioResult:
+        email, = await self.prepare_users(1)
+        return await self.run(
+            "auth-failure",
+            [lambda: self.activate(email, "WrongPassword123") for _ in range(requests)],
+        )
+
+
+SCENARIOS = {
+    "register": Benchmark.scenario_register,
+    "activate": Benchmark.scenario_activate,
+    "auth-failure": Benchmark.scenario_auth_failure,
+}
+
+
+# One INFO line per request or email would interleave with the results and
+# add formatting and I/O to the measured latency
+CHATTY_LOGGERS = ("httpx", "app.infrastructure.email.console_client")
+
+
+def fixed_code(email: str) -> str:
+    return INTEGRATION_CODE
+
+
+async def main(args: argparse.Namespace) -> None:
+    async with AsyncExitStack() as stack:
+        # integration environment: fixed activation code, since delivered
+        # outbox bodies are blanked and the code cannot be read back
+        if args.backend == "memory":
+            settings = AppSettings(
+                environment="integration",
+                repository_backend="memory",
+                mysql_host="unused",
+                mysql_port=3306,
+                mysql_user="unused",
+                mysql_password="unused",
+                mysql_database="unused",
+                metrics_enabled=False,
+            )
+        else:
+            # real migrations against the configured MySQL
+            settings = AppSettings(
+                environment="integration",
+                metrics_enabled=False,
+            )
+        app = create_app(settings)
+        if not args.verbose:
+            for name in CHATTY_LOGGERS:
+                logging.getLogger(name).setLevel(logging.WARNING)
+
+        await stack.enter_async_context(app.router.lifespan_context(app))
+        client = await stack.enter_async_context(
+            httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app),
+                base_url="http://benchmark",
+            )
+        )
+
+        benchmark = Benchmark(client, args.concurrency, fixed_code)
+        print(
+            f"backend={args.backend} requests={args.requests} "
+            f"concurrency={args.concurrency}"
+        )
+        for name in args.scenarios:
+            result = await SCENARIOS[name](benchmark, args.requests)
+            print(result.report())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backend", choices=("memory", "mysql"), default="memory")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument(
+        "--scenarios",
+        type=lambda value: value.split(","),
+        default=list(SCENARIOS),
+        help="comma separated subset of: " + ", ".join(SCENARIOS),
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="keep per-request and per-email log lines",
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,76 @@
+"""
+Time and allocations per fetched row when mapping users.
+
+Compares the previous DictCursor approach (a dict built per row, then
+copied field by field into User) with plain tuple rows passed through the
+shared positional RowMapper. Rows are synthesized, so no database is
+needed: only the Python-side mapping cost is measured.
+
+    python -m benchmarks.row_mapping --rows 100000
+"""
+import argparse
+import timeit
+import tracemalloc
+from datetime import datetime
+
+from app.domain.models.user import User
+from app.infrastructure.repositories.users_repository import USER_MAPPER
+
+
+def dict_row(columns: tuple[str, ...], row: tuple, keep: list | None = None) -> User:
+    # What DictCursor does for every row, then the old manual copy
+    record = dict(zip(columns, row))
+    if keep is not None:
+        keep.append(record)
+    return User(
+        id=record["id"],
+        email=record["email"],
+        hashed_password=record["hashed_password"],
+        is_active=record["is_active"],
+        created_at=record["created_at"],
+    )
+
+
+def tuple_row(columns: tuple[str, ...], row: tuple, keep: list | None = None) -> User:
+    return USER_MAPPER(row)
+
+
+def bytes_per_row(mapper, columns, rows) -> float:
+    """Bytes allocated per row, keeping intermediate objects alive."""
+    keep: list = []
+    tracemalloc.start()
+    results = [mapper(columns, row, keep) for row in rows]
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results, keep
+    return allocated / len(rows)
+
+
+def main(rows: int, repeat: int) -> None:
+    columns = USER_MAPPER.columns
+    created_at = datetime(2025, 1, 1)
+    data = [
+        (i, f"user{i}@example.com", "$2b$12$" + "x" * 53, 0, created_at)
+        for i in range(rows)
+    ]
+
+    for name, mapper in (("dict cursor", dict_row), ("tuple mapper", tuple_row)):
+        best = min(
+            timeit.repeat(
+                lambda: [mapper(columns, row) for row in data],
+                number=1,
+                repeat=repeat,
+            )
+        )
+        print(
+            f"{name:<13} {best / rows * 1e9:.0f}ns/row "
+            f"allocated={bytes_per_row(mapper, columns, data):.0f}B/row"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.rows, args.repeat)
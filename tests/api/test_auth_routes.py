@@ -0,0 +1,57 @@
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock
+
+from app.main import create_app
+from app.settings import AppSettings
+from app.api.dependencies.services import get_users_service
+
+
+@pytest.fixture()
+def auth_client(users_service_mock) -> TestClient:
+    app = create_app(AppSettings())
+    app.dependency_overrides[get_users_service] = lambda: users_service_mock
+
+    with TestClient(app) as client:
+        yield client
+
+
+def test_token_authenticates_activation_without_password_check(
+    auth_client, users_service_mock
+):
+    users_service_mock.verify_credentials = AsyncMock(return_value=7)
+
+    response = auth_client.post("/auth/token", auth=("user@example.com", "secret"))
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["token_type"] == "bearer"
+    assert body["expires_in"] > 0
+    users_service_mock.verify_credentials.assert_awaited_once()
+
+    response = auth_client.post(
+        "/activation",
+        json={"code": "1234"},
+        headers={"Authorization": f"Bearer {body['access_token']}"},
+    )
+
+    assert response.status_code == 200
+    users_service_mock.activate.assert_awaited_once_with(7, "1234")
+    users_service_mock.verify_credentials.assert_awaited_once()
+
+
+def test_invalid_token_is_rejected(auth_client):
+    response = auth_client.post(
+        "/activation",
+        json={"code": "1234"},
+        headers={"Authorization": "Bearer 7.1.forged"},
+    )
+
+    assert response.status_code == 401
+    assert response.headers["WWW-Authenticate"] == "Bearer"
+
+
+def test_token_endpoint_requires_credentials(auth_client):
+    response = auth_client.post("/auth/token")
+
+    assert response.status_code == 401
@@ -0,0 +1,22 @@
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+from app.settings import AppSettings, get_settings
+from app.api.dependencies.services import get_users_service
+
+
+def test_get_settings_is_cached():
+    assert get_settings() is get_settings()
+
+
+def test_users_service_is_app_scoped():
+    settings = AppSettings()
+    app = create_app(settings)
+
+    with TestClient(app):
+        request = type("FakeRequest", (), {"app": app})()
+
+        service = get_users_service(request)
+
+        assert service is get_users_service(request)
+        assert service.settings is settings
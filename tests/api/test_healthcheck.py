@@ -1,5 +1,61 @@
+from app.api.dependencies.database import get_db
+from app.infrastructure.database import PoolStats
+
+
 def test_healthcheck_ok(client):
     response = client.get("/health")
 
     assert response.status_code == 200
     assert response.json() == {"status": "ok"}
+
+
+def test_readiness_without_pool_reports_liveness_only(client):
+    response = client.get("/health/ready")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "status": "ok",
+        "database_reachable": None,
+        "pool": None,
+    }
+
+
+class SaturatedDatabase:
+    pool = object()
+
+    async def ping(self):
+        raise AssertionError("a saturated pool must not be pinged")
+
+    def pool_stats(self):
+        return PoolStats(size=5, free=0, used=5, waiting=3, max_size=5)
+
+
+def test_readiness_fails_when_pool_is_saturated(client):
+    client.app.dependency_overrides[get_db] = SaturatedDatabase
+
+    response = client.get("/health/ready")
+
+    assert response.status_code == 503
+    assert response.json()["status"] == "saturated"
+    assert response.json()["database_reachable"] is None
+    assert response.json()["pool"]["waiting"] == 3
+
+
+class UnreachableDatabase:
+    pool = object()
+
+    async def ping(self):
+        return False
+
+    def pool_stats(self):
+        return PoolStats(size=2, free=2, used=0, waiting=0, max_size=5)
+
+
+def test_readiness_fails_when_database_is_unreachable(client):
+    client.app.dependency_overrides[get_db] = UnreachableDatabase
+
+    response = client.get("/health/ready")
+
+    assert response.status_code == 503
+    assert response.json()["status"] == "unavailable"
+    assert response.json()["database_reachable"] is False
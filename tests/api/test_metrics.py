@@ -0,0 +1,22 @@
+def test_metrics_exposes_route_latency(client):
+    client.get("/health")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/health",status="200"}'
+        in body
+    )
+    assert 'db_pool_connections{state="waiting"} 0' in body
+
+
+def test_metrics_records_unmatched_routes(client):
+    client.get("/does-not-exist")
+
+    body = client.get("/metrics").text
+
+    assert 'route="unmatched",status="404"' in body
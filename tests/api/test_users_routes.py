@@ -1,3 +1,9 @@
+from app.api.dependencies.rate_limit import get_rate_limiter
+from app.infrastructure.database import DatabaseOverloaded
+from app.infrastructure.rate_limiter import InMemoryRateLimitStore, RateLimiter
+from app.settings import AppSettings
+
+
 def test_register_user_ok(client, users_service_mock):
     users_service_mock.register.return_value = 1
 
@@ -15,6 +21,7 @@ def test_register_user_ok(client, users_service_mock):
     users_service_mock.register.assert_awaited_once_with(
         email="test@example.com",
         password="StrongPassword123",
+        idempotency_key=None,
     )
 
     def test_register_user_already_exists(client, users_service_mock):
@@ -30,3 +37,34 @@ def test_register_user_ok(client, users_service_mock):
 
         assert response.status_code == 409
         assert response.json()["detail"] == "User already exists"
+
+
+def test_register_user_sheds_load_when_database_is_saturated(
+    client, users_service_mock
+):
+    users_service_mock.register.side_effect = DatabaseOverloaded("timeout", 3)
+
+    response = client.post(
+        "/users/register",
+        json={
+            "email": "test@example.com",
+            "password": "StrongPassword123",
+        },
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
+
+
+def test_register_is_rate_limited_per_email(client, users_service_mock):
+    limiter = RateLimiter(InMemoryRateLimitStore(max_buckets=100), AppSettings())
+    client.app.dependency_overrides[get_rate_limiter] = lambda: limiter
+    users_service_mock.register.return_value = 1
+    payload = {"email": "test@example.com", "password": "StrongPassword123"}
+
+    responses = [client.post("/users/register", json=payload) for _ in range(6)]
+
+    assert [r.status_code for r in responses[:5]] == [201] * 5
+    assert responses[5].status_code == 429
+    assert int(responses[5].headers["Retry-After"]) > 0
+    assert users_service_mock.register.await_count == 5
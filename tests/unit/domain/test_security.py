@@ -0,0 +1,76 @@
+from contextlib import contextmanager
+
+import pytest
+
+from app.domain.security import (
+    PasswordHasher,
+    calibrate_rounds,
+    hash_password,
+    hash_rounds,
+)
+
+
+class FakeSettings:
+    password_hasher_executor = "thread"
+    password_hasher_max_workers = 2
+    bcrypt_rounds = 4
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_roundtrip():
+    hasher = PasswordHasher(FakeSettings())
+    hasher.start()
+    try:
+        hashed = await hasher.hash_password("password123")
+
+        assert await hasher.verify_password("password123", hashed)
+        assert not await hasher.verify_password("wrong-password", hashed)
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_falls_back_to_default_executor():
+    hasher = PasswordHasher(FakeSettings())
+
+    hashed = await hasher.hash_password("password123")
+
+    assert await hasher.verify_password("password123", hashed)
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_times_operations_with_injected_timer():
+    timed = []
+
+    @contextmanager
+    def timer(operation):
+        yield
+        timed.append(operation)
+
+    hasher = PasswordHasher(FakeSettings(), timer=timer)
+
+    hashed = await hasher.hash_password("password123")
+    await hasher.verify_password("password123", hashed)
+
+    assert timed == ["hash", "verify"]
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_uses_configured_rounds():
+    hasher = PasswordHasher(FakeSettings())
+
+    hashed = await hasher.hash_password("password123")
+
+    assert hash_rounds(hashed) == 4
+    assert not hasher.needs_rehash(hashed)
+    assert hasher.needs_rehash(hash_password("password123", rounds=5))
+    assert not hasher.needs_rehash("not-a-bcrypt-hash")
+
+
+def test_calibrate_rounds_stops_past_target():
+    recommended, timings = calibrate_rounds(
+        target_seconds=0.0, min_rounds=4, max_rounds=6
+    )
+
+    assert recommended == 4
+    assert list(timings) == [4]
@@ -0,0 +1,173 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock
+
+from app.infrastructure.email.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakingEmailClient,
+    CircuitState,
+    RetryBudget,
+)
+from app.infrastructure.email.client import EmailMessage
+from app.infrastructure.email.exceptions import (
+    EmailCircuitOpen,
+    EmailProviderUnavailable,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+MESSAGE = EmailMessage(
+    to="user@example.com",
+    subject="Activate your account",
+    body="Your activation code is: 1234",
+    sender="no-reply@test.local",
+)
+
+
+def make_breaker(clock: FakeClock) -> CircuitBreaker:
+    return CircuitBreaker(
+        failure_rate_threshold=0.5,
+        minimum_calls=4,
+        window_seconds=10.0,
+        open_seconds=5.0,
+        half_open_max_calls=2,
+        clock=clock,
+    )
+
+
+def test_breaker_opens_on_failure_rate_and_fails_fast():
+    breaker = make_breaker(FakeClock())
+
+    for ok in (True, False, True, False):
+        breaker.acquire()
+        breaker.record_success() if ok else breaker.record_failure()
+
+    assert breaker.state is CircuitState.OPEN
+    with pytest.raises(EmailCircuitOpen):
+        breaker.acquire()
+
+
+def test_breaker_ignores_failures_below_minimum_calls():
+    breaker = make_breaker(FakeClock())
+
+    for _ in range(3):
+        breaker.record_failure()
+
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_breaker_half_opens_after_cooldown_and_closes_on_probe_successes():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    for _ in range(4):
+        breaker.record_failure()
+
+    clock.now = 5.0
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert breaker.available_calls(10) == 2
+
+    breaker.acquire()
+    breaker.acquire()
+    with pytest.raises(EmailCircuitOpen):
+        breaker.acquire()
+    breaker.record_success()
+    breaker.record_success()
+
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_breaker_reopens_on_failed_probe():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    for _ in range(4):
+        breaker.record_failure()
+
+    clock.now = 5.0
+    breaker.acquire()
+    breaker.record_failure()
+
+    assert breaker.state is CircuitState.OPEN
+
+
+def test_retry_budget_is_bounded():
+    budget = RetryBudget(ratio=0.5, max_tokens=1)
+
+    assert budget.try_spend() is True
+    assert budget.try_spend() is False
+    budget.deposit()
+    budget.deposit()
+    assert budget.try_spend() is True
+
+
+@pytest.mark.asyncio
+async def test_client_retries_within_budget():
+    inner = AsyncMock()
+    inner.send.side_effect = [EmailProviderUnavailable("down"), None]
+    client = CircuitBreakingEmailClient(
+        inner,
+        make_breaker(FakeClock()),
+        RetryBudget(ratio=0.1, max_tokens=5),
+        max_retries=2,
+        base_delay_seconds=0,
+    )
+
+    await client.send(MESSAGE)
+
+    assert inner.send.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_client_stops_retrying_when_budget_is_spent():
+    inner = AsyncMock()
+    inner.send.side_effect = EmailProviderUnavailable("down")
+    client = CircuitBreakingEmailClient(
+        inner,
+        make_breaker(FakeClock()),
+        RetryBudget(ratio=0.1, max_tokens=0),
+        max_retries=2,
+        base_delay_seconds=0,
+    )
+
+    with pytest.raises(EmailProviderUnavailable):
+        await client.send(MESSAGE)
+
+    assert inner.send.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_frees_its_half_open_slot():
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        failure_rate_threshold=0.5,
+        minimum_calls=1,
+        window_seconds=10.0,
+        open_seconds=5.0,
+        half_open_max_calls=1,
+        clock=clock,
+    )
+    breaker.record_failure()
+    clock.now = 5.0
+
+    inner = AsyncMock()
+    inner.send.side_effect = asyncio.CancelledError()
+    client = CircuitBreakingEmailClient(
+        inner,
+        breaker,
+        RetryBudget(ratio=0.1, max_tokens=5),
+        max_retries=2,
+        base_delay_seconds=0,
+    )
+
+    with pytest.raises(asyncio.CancelledError):
+        await client.send(MESSAGE)
+
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert breaker.available_calls(5) == 1
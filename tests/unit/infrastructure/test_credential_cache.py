@@ -0,0 +1,41 @@
+from app.infrastructure.credential_cache import CredentialCache
+
+
+class FakeSettings:
+    credential_cache_max_entries = 2
+    credential_cache_ttl_seconds = 60.0
+
+
+def test_lookup_hit_after_store():
+    cache = CredentialCache(FakeSettings())
+    cache.store("a@example.com", "password", 1, "hash-v1")
+
+    assert cache.lookup("a@example.com", "password", "hash-v1") == 1
+    assert cache.hits == 1
+    assert cache.misses == 0
+
+
+def test_lookup_miss_on_wrong_password():
+    cache = CredentialCache(FakeSettings())
+    cache.store("a@example.com", "password", 1, "hash-v1")
+
+    assert cache.lookup("a@example.com", "other", "hash-v1") is None
+    assert cache.misses == 1
+
+
+def test_entry_invalidated_when_stored_hash_changes():
+    cache = CredentialCache(FakeSettings())
+    cache.store("a@example.com", "password", 1, "hash-v1")
+
+    assert cache.lookup("a@example.com", "password", "hash-v2") is None
+    assert cache.lookup("a@example.com", "password", "hash-v1") is None
+
+
+def test_cache_is_bounded():
+    cache = CredentialCache(FakeSettings())
+    cache.store("a@example.com", "password", 1, "hash-a")
+    cache.store("b@example.com", "password", 2, "hash-b")
+    cache.store("c@example.com", "password", 3, "hash-c")
+
+    assert cache.lookup("a@example.com", "password", "hash-a") is None
+    assert cache.lookup("c@example.com", "password", "hash-c") == 3
@@ -0,0 +1,222 @@
+import asyncio
+
+import pytest
+
+from app.infrastructure.database import Database, DatabaseOverloaded, PoolStats
+
+
+class FakeSettings:
+    environment = "test"
+    db_ping_cache_seconds = 60.0
+    db_ping_timeout_seconds = 1.0
+    db_pool_acquire_timeout_seconds = 0.05
+    db_pool_max_waiting = 2
+    db_overload_retry_after_seconds = 1
+
+
+class FakeConnection:
+    def __init__(self):
+        self.in_transaction = False
+        self.rollbacks = 0
+        self.pings = 0
+
+    async def ping(self, reconnect=True):
+        self.pings += 1
+
+    def get_transaction_status(self):
+        return self.in_transaction
+
+    async def begin(self):
+        self.in_transaction = True
+
+    async def commit(self):
+        self.in_transaction = False
+
+    async def rollback(self):
+        self.in_transaction = False
+        self.rollbacks += 1
+
+
+class FakeAcquire:
+    def __init__(self, pool):
+        self._pool = pool
+        self._conn = None
+
+    def __await__(self):
+        return self._pool._acquire().__await__()
+
+    async def __aenter__(self):
+        self._conn = await self._pool._acquire()
+        return self._conn
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._pool.release(self._conn)
+
+
+class FakePool:
+    def __init__(self):
+        self.acquired = 0
+        self.released = 0
+        self.minsize = 3
+        self.connections = []
+
+    async def _acquire(self):
+        self.acquired += 1
+        conn = FakeConnection()
+        self.connections.append(conn)
+        return conn
+
+    def acquire(self):
+        return FakeAcquire(self)
+
+    async def release(self, conn):
+        self.released += 1
+
+
+def make_database() -> Database:
+    db = Database(FakeSettings())
+    db.pool = FakePool()
+    return db
+
+
+@pytest.mark.asyncio
+async def test_request_scope_shares_one_connection():
+    db = make_database()
+
+    async with db.request_scope():
+        async with db.get_connection() as first:
+            pass
+        async with db.transaction() as second:
+            pass
+
+    assert first is second
+    assert db.pool.acquired == 1
+    assert db.pool.released == 1
+
+
+@pytest.mark.asyncio
+async def test_request_scope_is_lazy():
+    db = make_database()
+
+    async with db.request_scope():
+        pass
+
+    assert db.pool.acquired == 0
+
+
+@pytest.mark.asyncio
+async def test_request_scope_rolls_back_open_transaction_on_release():
+    db = make_database()
+
+    async with db.request_scope():
+        async with db.get_connection() as conn:
+            conn.in_transaction = True
+
+    assert conn.rollbacks == 1
+    assert db.pool.released == 1
+
+
+@pytest.mark.asyncio
+async def test_request_scope_not_shared_with_spawned_tasks():
+    db = make_database()
+
+    async def use_connection():
+        async with db.get_connection() as conn:
+            return conn
+
+    async with db.request_scope():
+        async with db.get_connection() as scoped:
+            other = await asyncio.create_task(use_connection())
+
+    assert other is not scoped
+    assert db.pool.acquired == 2
+
+
+@pytest.mark.asyncio
+async def test_release_request_connection_reacquires_on_next_use():
+    db = make_database()
+
+    async with db.request_scope():
+        async with db.get_connection() as first:
+            pass
+        await db.release_request_connection()
+        assert db.pool.released == 1
+
+        async with db.get_connection() as second:
+            pass
+
+    assert first is not second
+    assert db.pool.acquired == 2
+    assert db.pool.released == 2
+
+
+@pytest.mark.asyncio
+async def test_warm_up_pings_minsize_connections():
+    db = make_database()
+
+    await db.warm_up()
+
+    assert db.pool.acquired == 3
+    assert db.pool.released == 3
+    assert all(conn.pings == 1 for conn in db.pool.connections)
+
+
+@pytest.mark.asyncio
+async def test_ping_result_is_cached():
+    db = make_database()
+
+    assert await db.ping() is True
+    assert await db.ping() is True
+
+    assert db.pool.acquired == 1
+
+
+@pytest.mark.asyncio
+async def test_ping_reports_unreachable_database():
+    db = make_database()
+
+    async def refuse():
+        raise ConnectionError("gone")
+
+    db.pool._acquire = refuse
+
+    assert await db.ping() is False
+
+
+def test_pool_stats_saturation():
+    assert PoolStats(size=5, free=0, used=5, waiting=0, max_size=5).saturated
+    assert PoolStats(size=5, free=0, used=5, waiting=3, max_size=5).saturated
+    # still growing: the waiter is opening a new connection
+    assert not PoolStats(size=2, free=0, used=2, waiting=1, max_size=20).saturated
+    assert not PoolStats(size=5, free=1, used=4, waiting=0, max_size=5).saturated
+
+
+class ExhaustedPool(FakePool):
+    async def _acquire(self):
+        await asyncio.Event().wait()
+
+
+@pytest.mark.asyncio
+async def test_acquire_times_out_with_overload_error():
+    db = Database(FakeSettings())
+    db.pool = ExhaustedPool()
+
+    with pytest.raises(DatabaseOverloaded) as exc_info:
+        async with db.get_connection():
+            pass
+
+    assert exc_info.value.reason == "timeout"
+    assert db._waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_acquire_sheds_when_queue_is_full():
+    db = Database(FakeSettings())
+    db.pool = ExhaustedPool()
+    db._waiting = FakeSettings.db_pool_max_waiting
+
+    with pytest.raises(DatabaseOverloaded) as exc_info:
+        async with db.get_connection():
+            pass
+
+    assert exc_info.value.reason == "queue_full"
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from app.infrastructure.email.client import EmailMessage
+from app.infrastructure.email.dispatch_queue import EmailDispatchQueue
+from app.infrastructure.email.exceptions import EmailProviderUnavailable
+
+
+class FakeSettings:
+    email_dispatch_queue_size = 10
+    email_dispatch_workers = 2
+    email_dispatch_batch_size = 5
+    email_dispatch_drain_timeout_seconds = 1.0
+
+
+def make_message(n: int) -> EmailMessage:
+    return EmailMessage(
+        to=f"user{n}@example.com",
+        subject="Activate your account",
+        body="Your activation code is: 1234",
+        sender="no-reply@test.local",
+    )
+
+
+class RecordingClient:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.sends: list[EmailMessage] = []
+
+    async def send(self, message: EmailMessage) -> None:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        self.sends.append(message)
+
+
+class BatchingClient(RecordingClient):
+    def __init__(self):
+        super().__init__()
+        self.batches: list[list[EmailMessage]] = []
+
+    async def send_batch(self, messages: list[EmailMessage]) -> None:
+        self.batches.append(messages)
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded_by_workers():
+    client = RecordingClient(delay=0.01)
+    queue = EmailDispatchQueue(client, FakeSettings())
+    queue.start()
+
+    await asyncio.gather(*(queue.send(make_message(n)) for n in range(8)))
+    await queue.stop()
+
+    assert len(client.sends) == 8
+    assert client.max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_queued_messages_are_coalesced_for_batch_clients():
+    client = BatchingClient()
+    queue = EmailDispatchQueue(client, FakeSettings())
+    queue.start()
+
+    await asyncio.gather(*(queue.send(make_message(n)) for n in range(6)))
+    await queue.stop()
+
+    assert sum(len(batch) for batch in client.batches) + len(client.sends) == 6
+    assert all(len(batch) <= 5 for batch in client.batches)
+    assert client.batches
+
+
+@pytest.mark.asyncio
+async def test_send_failure_is_reported_to_sender():
+    class FailingClient:
+        async def send(self, message):
+            raise EmailProviderUnavailable("down")
+
+    queue = EmailDispatchQueue(FailingClient(), FakeSettings())
+    queue.start()
+
+    with pytest.raises(EmailProviderUnavailable):
+        await queue.send(make_message(1))
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_queued_messages_and_rejects_new_ones():
+    client = RecordingClient(delay=0.01)
+    queue = EmailDispatchQueue(client, FakeSettings())
+    queue.start()
+
+    senders = [asyncio.create_task(queue.send(make_message(n))) for n in range(4)]
+    await asyncio.sleep(0)
+    await queue.stop()
+
+    await asyncio.gather(*senders)
+    assert len(client.sends) == 4
+    with pytest.raises(RuntimeError):
+        await queue.send(make_message(5))
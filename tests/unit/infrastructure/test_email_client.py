@@ -0,0 +1,42 @@
+import httpx
+import pytest
+
+from app.infrastructure.email.client import EmailClient, EmailMessage
+from app.infrastructure.email.exceptions import EmailProviderUnavailable
+
+
+MESSAGE = EmailMessage(
+    to="test@example.com",
+    subject="Activate your account",
+    body="Your activation code is: 1234",
+    sender="no-reply@test.local",
+)
+
+
+@pytest.mark.asyncio
+async def test_send_reuses_shared_http_client():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+        client = EmailClient(http, "http://provider.local/", timeout_seconds=1.0)
+        await client.send(MESSAGE)
+        await client.send(MESSAGE)
+
+        assert not http.is_closed
+
+    assert [str(r.url) for r in requests] == ["http://provider.local/send"] * 2
+
+
+@pytest.mark.asyncio
+async def test_send_maps_http_errors():
+    transport = httpx.MockTransport(lambda request: httpx.Response(503))
+
+    async with httpx.AsyncClient(transport=transport) as http:
+        client = EmailClient(http, "http://provider.local", timeout_seconds=1.0)
+
+        with pytest.raises(EmailProviderUnavailable):
+            await client.send(MESSAGE)
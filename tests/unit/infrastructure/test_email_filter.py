@@ -0,0 +1,133 @@
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.infrastructure.email_filter import BloomFilter, EmailExistenceFilter
+from app.infrastructure.repositories.memory import InMemoryUnitOfWork
+
+
+class FakeSettings:
+    email_filter_expected_items = 1000
+    email_filter_false_positive_rate = 0.01
+    email_filter_refresh_seconds = 60.0
+    email_filter_commit_grace_seconds = 30.0
+
+
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives():
+    bloom = BloomFilter(expected_items=1000, false_positive_rate=0.01)
+    for n in range(1000):
+        bloom.add(f"user{n}@example.com")
+
+    assert all(f"user{n}@example.com" in bloom for n in range(1000))
+    false_positives = sum(f"other{n}@example.com" in bloom for n in range(10_000))
+    assert false_positives < 300
+    assert bloom.estimated_false_positive_rate() == pytest.approx(0.01, rel=0.5)
+
+
+def test_bloom_filter_is_sized_from_settings():
+    bloom = BloomFilter(expected_items=1_000_000, false_positive_rate=0.01)
+
+    # ~9.6 bits per item and 7 hashes for 1%
+    assert 1_150_000 < bloom.size_bytes < 1_250_000
+    assert bloom.hash_count == 7
+
+
+@pytest.mark.asyncio
+async def test_email_filter_loads_existing_users_and_new_rows():
+    uow = InMemoryUnitOfWork()
+    async with uow.transaction() as repos:
+        await repos.users.create("Known@Example.com", "hash")
+
+    email_filter = EmailExistenceFilter(uow, FakeSettings())
+    assert email_filter.might_exist("unknown@example.com")
+
+    await email_filter.load()
+
+    assert email_filter.might_exist("known@example.com")
+    assert not email_filter.might_exist("unknown@example.com")
+
+    async with uow.transaction() as repos:
+        await repos.users.create("late@example.com", "hash")
+    await email_filter._refresh()
+
+    assert email_filter.might_exist("late@example.com")
+
+
+class CommittedUsers:
+    """users.iter_emails over rows committed so far, in any id order."""
+
+    def __init__(self):
+        self.rows: dict[int, str] = {}
+        self.scans: list[int] = []
+
+    async def iter_emails(self, after_id: int = 0):
+        self.scans.append(after_id)
+        for user_id in sorted(self.rows):
+            if user_id > after_id:
+                yield user_id, self.rows[user_id]
+
+
+class CommittedUsersUnitOfWork:
+    def __init__(self):
+        self.users = CommittedUsers()
+
+    @asynccontextmanager
+    async def connection(self):
+        yield self
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_email_filter_picks_up_lower_ids_committed_late():
+    uow = CommittedUsersUnitOfWork()
+    clock = FakeClock()
+    email_filter = EmailExistenceFilter(uow, FakeSettings(), clock=clock)
+    uow.users.rows[1] = "first@example.com"
+    await email_filter.load()
+
+    # id 2 is allocated first but id 3 commits before it
+    uow.users.rows[3] = "fast@example.com"
+    clock.now += 5
+    await email_filter._refresh()
+    uow.users.rows[2] = "slow@example.com"
+    clock.now += 5
+    await email_filter._refresh()
+
+    assert email_filter.might_exist("fast@example.com")
+    assert email_filter.might_exist("slow@example.com")
+    assert uow.users.scans == [0, 1, 1]
+    assert email_filter._filter.items == 3
+
+
+@pytest.mark.asyncio
+async def test_email_filter_rescans_from_the_grace_lagged_watermark():
+    uow = CommittedUsersUnitOfWork()
+    clock = FakeClock()
+    email_filter = EmailExistenceFilter(uow, FakeSettings(), clock=clock)
+    uow.users.rows.update({1: "a@example.com", 5: "e@example.com"})
+    await email_filter.load()
+
+    # ids 2-4 were open during the load; 4 commits within the grace period
+    uow.users.rows[6] = "f@example.com"
+    for _ in range(5):
+        clock.now += 5
+        await email_filter._refresh()
+    uow.users.rows[4] = "d@example.com"
+    clock.now += 5
+    await email_filter._refresh()
+
+    assert email_filter.might_exist("d@example.com")
+    assert uow.users.scans[-1] == 0
+
+    uow.users.scans.clear()
+    clock.now += 5
+    await email_filter._refresh()
+
+    assert uow.users.scans == [6]
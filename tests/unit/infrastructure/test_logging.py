@@ -0,0 +1,70 @@
+import json
+import logging
+
+from app.infrastructure import logging as app_logging
+from app.infrastructure.logging import (
+    InfoSampler,
+    JsonFormatter,
+    setup_logging,
+    shutdown_logging,
+)
+
+
+class FakeSettings:
+    log_format = "json"
+    log_info_sample_rate = 1.0
+
+
+def make_record(level: int, msg: str = "hello %s", args=("world",)) -> logging.LogRecord:
+    return logging.LogRecord("app.test", level, __file__, 1, msg, args, None)
+
+
+def test_json_formatter_is_compact():
+    line = JsonFormatter().format(make_record(logging.INFO))
+
+    assert '", "' not in line and '": ' not in line
+    entry = json.loads(line)
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "app.test"
+    assert entry["msg"] == "hello world"
+
+
+def test_info_sampler_only_drops_info_records():
+    sampler = InfoSampler(rate=0.0)
+
+    assert sampler.filter(make_record(logging.INFO)) is False
+    assert sampler.filter(make_record(logging.WARNING)) is True
+    assert sampler.filter(make_record(logging.DEBUG)) is True
+
+
+def test_setup_logging_is_idempotent_and_flushes_on_shutdown(capsys):
+    shutdown_logging()
+    try:
+        setup_logging(FakeSettings())
+        listener = app_logging._listener
+        setup_logging(FakeSettings())
+        assert app_logging._listener is listener
+
+        logging.getLogger("app.test").warning("queued %s", "record")
+    finally:
+        shutdown_logging()
+
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert {"level": "WARNING", "msg": "queued record"}.items() <= lines[-1].items()
+    assert app_logging._listener is None
+
+
+def test_json_logs_keep_exceptions_out_of_the_message(capsys):
+    shutdown_logging()
+    try:
+        setup_logging(FakeSettings())
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logging.getLogger("app.test").exception("failed for %s", "user")
+    finally:
+        shutdown_logging()
+
+    entry = json.loads(capsys.readouterr().out.splitlines()[-1])
+    assert entry["msg"] == "failed for user"
+    assert "ValueError: boom" in entry["exc"]
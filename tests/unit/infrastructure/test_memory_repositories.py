@@ -0,0 +1,141 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.domain.exceptions import UserAlreadyExists
+from app.infrastructure.email.client import EmailMessage
+from app.infrastructure.repositories.memory import InMemoryUnitOfWork
+
+
+def in_a_minute() -> datetime:
+    return datetime.now(tz=timezone.utc) + timedelta(minutes=1)
+
+
+@pytest.mark.asyncio
+async def test_create_and_lookup_user():
+    uow = InMemoryUnitOfWork()
+
+    async with uow.transaction() as repos:
+        user_id = await repos.users.create("Test@Example.com", "hash")
+
+    async with uow.connection() as repos:
+        user = await repos.users.get_by_email("test@example.com")
+
+    assert user.id == user_id
+    assert user.is_active is False
+
+
+@pytest.mark.asyncio
+async def test_duplicate_email_is_rejected():
+    uow = InMemoryUnitOfWork()
+
+    async with uow.transaction() as repos:
+        await repos.users.create("test@example.com", "hash")
+
+    with pytest.raises(UserAlreadyExists):
+        async with uow.transaction() as repos:
+            await repos.users.create("TEST@example.com", "hash")
+
+
+@pytest.mark.asyncio
+async def test_transaction_rolls_back_on_exception():
+    uow = InMemoryUnitOfWork()
+
+    with pytest.raises(RuntimeError):
+        async with uow.transaction() as repos:
+            user_id = await repos.users.create("test@example.com", "hash")
+            await repos.codes.create_or_replace(user_id, "code", in_a_minute())
+            await repos.outbox.enqueue(
+                EmailMessage(to="test@example.com", subject="s", body="b", sender="x"),
+                available_at=datetime.now(tz=timezone.utc),
+            )
+            raise RuntimeError("boom")
+
+    async with uow.connection() as repos:
+        assert await repos.users.get_by_email("test@example.com") is None
+    assert uow.store.codes == {}
+    assert uow.store.outbox == {}
+
+
+@pytest.mark.asyncio
+async def test_for_update_serializes_transactions_on_the_same_user():
+    uow = InMemoryUnitOfWork()
+    async with uow.transaction() as repos:
+        user_id = await repos.users.create("test@example.com", "hash")
+        await repos.codes.create_or_replace(user_id, "code", in_a_minute())
+
+    events = []
+
+    async def activate(name: str):
+        async with uow.transaction() as repos:
+            user, _ = await repos.users.get_with_activation_code_for_update(user_id)
+            events.append((name, user.is_active))
+            await asyncio.sleep(0)
+            await repos.users.activate_with_code(user_id)
+
+    await asyncio.gather(activate("first"), activate("second"))
+
+    assert events == [("first", False), ("second", True)]
+    assert uow.store.codes[user_id].used is True
+
+
+@pytest.mark.asyncio
+async def test_purge_expired_keeps_recent_unused_codes():
+    uow = InMemoryUnitOfWork()
+    now = datetime.now(tz=timezone.utc)
+    async with uow.transaction() as repos:
+        await repos.codes.create_or_replace(1, "used", now - timedelta(minutes=1))
+        await repos.codes.mark_used(1)
+        await repos.codes.create_or_replace(2, "recent", now - timedelta(minutes=1))
+        await repos.codes.create_or_replace(3, "old", now - timedelta(days=2))
+        await repos.codes.create_or_replace(4, "valid", now + timedelta(minutes=1))
+
+    async with uow.transaction() as repos:
+        purged = await repos.codes.purge_expired(
+            now=now, unused_expired_before=now - timedelta(days=1), limit=10
+        )
+
+    assert purged == 2
+    assert sorted(uow.store.codes) == [2, 4]
+
+
+@pytest.mark.asyncio
+async def test_update_password_hash_is_compare_and_set():
+    uow = InMemoryUnitOfWork()
+
+    async with uow.transaction() as repos:
+        user_id = await repos.users.create("test@example.com", "old")
+        assert await repos.users.update_password_hash(user_id, "old", "new")
+        assert not await repos.users.update_password_hash(user_id, "old", "newer")
+
+    async with uow.connection() as repos:
+        user = await repos.users.get_by_id(user_id)
+
+    assert user.hashed_password == "new"
+
+
+@pytest.mark.asyncio
+async def test_outbox_blanks_delivered_bodies_and_purges_finished_rows():
+    uow = InMemoryUnitOfWork()
+    now = datetime.now(tz=timezone.utc)
+    long_ago = now - timedelta(days=2)
+    message = EmailMessage(to="a@example.com", subject="s", body="code", sender="x")
+
+    async with uow.transaction() as repos:
+        await repos.outbox.enqueue_many([message] * 3, available_at=long_ago)
+        delivered, abandoned, pending = await repos.outbox.claim_pending(
+            now=now, lease_until=long_ago, limit=3, max_attempts=1
+        )
+        await repos.outbox.mark_delivered([delivered.id], long_ago)
+    uow.store.outbox[pending.id].attempts = 0
+
+    assert uow.store.outbox[delivered.id].message.body == ""
+
+    async with uow.transaction() as repos:
+        purged = await repos.outbox.purge_finished(
+            finished_before=now - timedelta(days=1), max_attempts=1, limit=10
+        )
+
+    assert purged == 2
+    assert list(uow.store.outbox) == [pending.id]
@@ -0,0 +1,50 @@
+import pytest
+
+from app.infrastructure.metrics import (
+    DB_QUERY_DURATION,
+    Counter,
+    Histogram,
+    MetricsRegistry,
+    timed_query,
+)
+
+
+class Repository:
+    @timed_query
+    async def lookup(self):
+        return 1
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    latency = registry.register(
+        Histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    )
+
+    latency.observe(0.05, "/a")
+    latency.observe(0.5, "/a")
+    latency.observe(5.0, "/a")
+
+    body = registry.render()
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in body
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in body
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in body
+    assert 'latency_seconds_count{route="/a"} 3' in body
+
+
+def test_counter_renders_per_label_values():
+    registry = MetricsRegistry()
+    failures = registry.register(Counter("failures_total", "Failures", ("kind",)))
+
+    failures.inc("timeout")
+    failures.inc("timeout", amount=2)
+
+    assert 'failures_total{kind="timeout"} 3.0' in registry.render()
+
+
+@pytest.mark.asyncio
+async def test_timed_query_records_latency():
+    before = DB_QUERY_DURATION.count("Repository.lookup")
+
+    assert await Repository().lookup() == 1
+    assert DB_QUERY_DURATION.count("Repository.lookup") == before + 1
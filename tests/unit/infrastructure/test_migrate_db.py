@@ -0,0 +1,99 @@
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.infrastructure.migrate_db import Migration, load_migrations, migrate_database
+
+
+class FakeSettings:
+    migration_lock_timeout_seconds = 5
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self._result = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    async def execute(self, sql, args=None):
+        sql = " ".join(sql.split())
+        self.conn.executed.append(sql)
+        if sql.startswith("SELECT MAX(version)"):
+            self._result = [(max(self.conn.applied, default=None),)]
+        elif sql.startswith("SELECT GET_LOCK"):
+            self._result = [(1,)]
+        elif sql.startswith("SELECT version, checksum"):
+            self._result = list(self.conn.applied.items())
+        elif sql.startswith("INSERT INTO schema_migrations"):
+            self.conn.applied[args[0]] = args[2]
+
+    async def fetchone(self):
+        return self._result[0]
+
+    async def fetchall(self):
+        return self._result
+
+
+class FakeConnection:
+    def __init__(self, applied):
+        self.applied = dict(applied)
+        self.executed = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    async def commit(self):
+        pass
+
+
+class FakeDatabase:
+    settings = FakeSettings()
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    @asynccontextmanager
+    async def get_connection(self):
+        yield self.conn
+
+
+MIGRATIONS = [
+    Migration(1, "first", "CREATE TABLE a (id INT)", "c1"),
+    Migration(2, "second", "CREATE TABLE b (id INT); CREATE TABLE c (id INT)", "c2"),
+]
+
+
+def test_load_migrations_are_ordered_and_unique():
+    migrations = load_migrations()
+
+    versions = [migration.version for migration in migrations]
+    assert versions == sorted(set(versions))
+    assert versions[0] == 1
+
+
+@pytest.mark.asyncio
+async def test_current_schema_costs_a_single_query():
+    conn = FakeConnection({1: "c1", 2: "c2"})
+
+    await migrate_database(FakeDatabase(conn), MIGRATIONS)
+
+    assert conn.executed == ["SELECT MAX(version) FROM schema_migrations"]
+
+
+@pytest.mark.asyncio
+async def test_pending_migrations_are_applied_under_lock():
+    conn = FakeConnection({1: "c1"})
+
+    await migrate_database(FakeDatabase(conn), MIGRATIONS)
+
+    assert conn.applied == {1: "c1", 2: "c2"}
+    assert conn.executed[1].startswith("SELECT GET_LOCK")
+    assert "CREATE TABLE a (id INT)" not in conn.executed
+    assert "CREATE TABLE b (id INT)" in conn.executed
+    assert "CREATE TABLE c (id INT)" in conn.executed
+    assert conn.executed[-1].startswith("SELECT RELEASE_LOCK")
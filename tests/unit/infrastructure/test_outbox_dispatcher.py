@@ -0,0 +1,121 @@
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock
+
+from app.infrastructure.email.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakingEmailClient,
+    RetryBudget,
+)
+from app.infrastructure.email.client import EmailMessage
+from app.infrastructure.email.exceptions import EmailProviderUnavailable
+from app.infrastructure.email.outbox_dispatcher import EmailOutboxDispatcher
+from app.infrastructure.metrics import EMAIL_OUTBOX_ABANDONED
+from app.infrastructure.repositories.email_outbox_repository import OutboxEntry
+from app.infrastructure.repositories.unit_of_work import Repositories
+
+
+class FakeSettings:
+    email_outbox_batch_size = 10
+    email_outbox_poll_interval_seconds = 0.01
+    email_outbox_lease_seconds = 30.0
+    email_outbox_max_attempts = 5
+
+
+class FakeUnitOfWork:
+    def __init__(self):
+        self.outbox = AsyncMock()
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield Repositories(users=AsyncMock(), codes=AsyncMock(), outbox=self.outbox)
+
+
+def make_entry(entry_id: int) -> OutboxEntry:
+    return OutboxEntry(
+        id=entry_id,
+        message=EmailMessage(
+            to=f"user{entry_id}@example.com",
+            subject="Activate your account",
+            body="Your activation code is: 1234",
+            sender="no-reply@test.local",
+        ),
+        attempts=1,
+    )
+
+
+@pytest.mark.asyncio
+async def test_dispatch_once_marks_only_delivered_messages():
+    uow = FakeUnitOfWork()
+    outbox_repo = uow.outbox
+    outbox_repo.claim_pending.return_value = [make_entry(1), make_entry(2)]
+
+    email_client = AsyncMock()
+    email_client.send.side_effect = [None, EmailProviderUnavailable("down")]
+
+    dispatcher = EmailOutboxDispatcher(uow, email_client, FakeSettings())
+
+    claimed = await dispatcher.dispatch_once()
+
+    assert claimed == 2
+    assert email_client.send.await_count == 2
+    delivered_ids, _ = outbox_repo.mark_delivered.await_args.args
+    assert delivered_ids == [1]
+
+
+@pytest.mark.asyncio
+async def test_dispatch_once_without_pending_messages():
+    uow = FakeUnitOfWork()
+    outbox_repo = uow.outbox
+    outbox_repo.claim_pending.return_value = []
+    email_client = AsyncMock()
+
+    dispatcher = EmailOutboxDispatcher(uow, email_client, FakeSettings())
+
+    assert await dispatcher.dispatch_once() == 0
+    email_client.send.assert_not_called()
+    outbox_repo.mark_delivered.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_dispatch_once_leaves_messages_queued_while_circuit_is_open():
+    uow = FakeUnitOfWork()
+    breaker = CircuitBreaker(
+        failure_rate_threshold=0.5,
+        minimum_calls=1,
+        window_seconds=60.0,
+        open_seconds=60.0,
+        half_open_max_calls=1,
+    )
+    breaker.record_failure()
+    email_client = CircuitBreakingEmailClient(
+        AsyncMock(),
+        breaker,
+        RetryBudget(ratio=0.1, max_tokens=1),
+        max_retries=0,
+        base_delay_seconds=0,
+    )
+
+    dispatcher = EmailOutboxDispatcher(
+        uow, email_client, FakeSettings(), circuit_breaker=breaker
+    )
+
+    assert await dispatcher.dispatch_once() == 0
+    uow.outbox.claim_pending.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_dispatch_once_counts_messages_given_up(caplog):
+    uow = FakeUnitOfWork()
+    exhausted = OutboxEntry(
+        id=7, message=make_entry(7).message, attempts=FakeSettings.email_outbox_max_attempts
+    )
+    uow.outbox.claim_pending.return_value = [exhausted]
+    email_client = AsyncMock()
+    email_client.send.side_effect = EmailProviderUnavailable("down")
+    abandoned_before = EMAIL_OUTBOX_ABANDONED.value()
+
+    await EmailOutboxDispatcher(uow, email_client, FakeSettings()).dispatch_once()
+
+    assert EMAIL_OUTBOX_ABANDONED.value() == abandoned_before + 1
+    assert "abandoned after 5 attempts (outbox_id=7)" in caplog.text
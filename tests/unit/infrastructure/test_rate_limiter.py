@@ -0,0 +1,55 @@
+import pytest
+
+from app.infrastructure.rate_limiter import (
+    BucketLimit,
+    InMemoryRateLimitStore,
+    RateLimited,
+    RateLimiter,
+)
+
+
+class FakeSettings:
+    rate_limit_client_per_minute = 60.0
+    rate_limit_client_burst = 2.0
+    rate_limit_account_per_minute = 6.0
+    rate_limit_account_burst = 1.0
+
+
+LIMIT = BucketLimit(rate_per_second=1.0, capacity=2.0)
+
+
+@pytest.mark.asyncio
+async def test_bucket_allows_burst_then_refills():
+    store = InMemoryRateLimitStore(max_buckets=10)
+
+    assert await store.take("k", LIMIT, now=0.0) == 0
+    assert await store.take("k", LIMIT, now=0.0) == 0
+    assert await store.take("k", LIMIT, now=0.0) == pytest.approx(1.0)
+    assert await store.take("k", LIMIT, now=1.0) == 0
+
+
+@pytest.mark.asyncio
+async def test_store_evicts_least_recently_used_buckets():
+    store = InMemoryRateLimitStore(max_buckets=2)
+
+    await store.take("a", LIMIT, now=0.0)
+    await store.take("b", LIMIT, now=0.0)
+    await store.take("a", LIMIT, now=0.0)
+    await store.take("c", LIMIT, now=0.0)
+
+    assert len(store) == 2
+    # "b" was evicted and starts again from a full bucket
+    assert await store.take("b", LIMIT, now=0.0) == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_scopes_are_independent():
+    limiter = RateLimiter(InMemoryRateLimitStore(max_buckets=10), FakeSettings())
+
+    await limiter.check("account", "email:a@example.com")
+    with pytest.raises(RateLimited) as exc_info:
+        await limiter.check("account", "email:a@example.com")
+
+    assert exc_info.value.retry_after == 10
+    await limiter.check("account", "email:b@example.com")
+    await limiter.check("client", "10.0.0.1")
@@ -0,0 +1,43 @@
+from datetime import datetime, timezone
+
+from app.domain.models.activation_code import ActivationCode
+from app.domain.models.user import User
+from app.infrastructure.repositories.activation_code_repository import (
+    ACTIVATION_CODE_MAPPER,
+)
+from app.infrastructure.repositories.users_repository import USER_MAPPER
+
+
+CREATED_AT = datetime(2025, 1, 1, 12, 0)
+EXPIRES_AT = datetime(2025, 1, 1, 12, 1)
+
+
+def test_user_mapper_maps_positional_row():
+    row = (1, "test@example.com", "hash", 0, CREATED_AT)
+
+    assert USER_MAPPER(row) == User(
+        id=1,
+        email="test@example.com",
+        hashed_password="hash",
+        is_active=0,
+        created_at=CREATED_AT,
+    )
+
+
+def test_select_list_follows_column_order():
+    assert USER_MAPPER.select_list("u") == (
+        "u.id, u.email, u.hashed_password, u.is_active, u.created_at"
+    )
+
+
+def test_activation_code_mapper_applies_converters_at_offset():
+    row = (1, "test@example.com", "hash", 0, CREATED_AT, 1, "code", EXPIRES_AT, 0)
+
+    code = ACTIVATION_CODE_MAPPER(row, offset=USER_MAPPER.width)
+
+    assert code == ActivationCode(
+        user_id=1,
+        hashed_code="code",
+        expires_at=EXPIRES_AT.replace(tzinfo=timezone.utc),
+        used=0,
+    )
@@ -0,0 +1,38 @@
+import time
+
+from app.infrastructure.tokens import TokenSigner
+
+
+class FakeSettings:
+    auth_token_secret = "secret"
+    auth_token_ttl_seconds = 60
+
+
+def test_issued_token_verifies_to_user_id():
+    signer = TokenSigner(FakeSettings())
+
+    assert signer.verify(signer.issue(42)) == 42
+
+
+def test_tampered_token_is_rejected():
+    signer = TokenSigner(FakeSettings())
+    user_id, expires_at, mac = signer.issue(42).split(".")
+
+    assert signer.verify(f"43.{expires_at}.{mac}") is None
+    assert signer.verify("garbage") is None
+
+
+def test_token_from_another_key_is_rejected():
+    other = FakeSettings()
+    other.auth_token_secret = "other"
+
+    assert TokenSigner(FakeSettings()).verify(TokenSigner(other).issue(42)) is None
+
+
+def test_expired_token_is_rejected(monkeypatch):
+    signer = TokenSigner(FakeSettings())
+    token = signer.issue(42)
+
+    monkeypatch.setattr(time, "time", lambda: 10**12)
+
+    assert signer.verify(token) is None
@@ -0,0 +1,45 @@
+import aiomysql
+import pytest
+
+from app.domain.exceptions import UserAlreadyExists
+from app.infrastructure.repositories.users_repository import UsersRepository
+
+
+class FailingCursor:
+    def __init__(self, error: Exception):
+        self._error = error
+
+    async def execute(self, *args, **kwargs):
+        raise self._error
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class FakeConnection:
+    def __init__(self, error: Exception):
+        self._error = error
+
+    def cursor(self, *args, **kwargs):
+        return FailingCursor(self._error)
+
+
+@pytest.mark.asyncio
+async def test_create_maps_duplicate_key_to_user_already_exists():
+    error = aiomysql.IntegrityError(1062, "Duplicate entry for key 'email'")
+    repo = UsersRepository(FakeConnection(error))
+
+    with pytest.raises(UserAlreadyExists):
+        await repo.create("test@example.com", "hash")
+
+
+@pytest.mark.asyncio
+async def test_create_propagates_other_integrity_errors():
+    error = aiomysql.IntegrityError(1048, "Column 'email' cannot be null")
+    repo = UsersRepository(FakeConnection(error))
+
+    with pytest.raises(aiomysql.IntegrityError):
+        await repo.create(None, "hash")
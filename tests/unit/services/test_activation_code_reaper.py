@@ -0,0 +1,73 @@
+import pytest
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from unittest.mock import AsyncMock
+
+from app.infrastructure.repositories.unit_of_work import Repositories
+from app.services.activation_code_reaper import ActivationCodeReaper
+
+
+class FakeSettings:
+    activation_code_reaper_interval_seconds = 300.0
+    activation_code_reaper_batch_size = 2
+    activation_code_reaper_pause_seconds = 0.0
+    activation_code_retention = timedelta(days=1)
+    email_outbox_retention = timedelta(hours=2)
+    email_outbox_max_attempts = 5
+
+
+class FakeUnitOfWork:
+    def __init__(self):
+        self.codes = AsyncMock()
+        self.outbox = AsyncMock()
+        self.outbox.purge_finished.return_value = 0
+        self.transactions = 0
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.transactions += 1
+        yield Repositories(users=AsyncMock(), codes=self.codes, outbox=self.outbox)
+
+
+@pytest.mark.asyncio
+async def test_run_once_deletes_in_bounded_batches():
+    uow = FakeUnitOfWork()
+    uow.codes.purge_expired.side_effect = [2, 2, 1]
+
+    result = await ActivationCodeReaper(uow, FakeSettings()).run_once()
+
+    assert result.purged == 5
+    assert result.batches == 4
+    assert uow.transactions == 4
+    for call in uow.codes.purge_expired.await_args_list:
+        assert call.kwargs["limit"] == 2
+        assert call.kwargs["unused_expired_before"] == (
+            call.kwargs["now"] - timedelta(days=1)
+        )
+
+
+@pytest.mark.asyncio
+async def test_run_once_with_nothing_to_purge():
+    uow = FakeUnitOfWork()
+    uow.codes.purge_expired.return_value = 0
+
+    result = await ActivationCodeReaper(uow, FakeSettings()).run_once()
+
+    assert result.purged == 0
+    assert result.outbox_purged == 0
+    assert result.batches == 2
+
+
+@pytest.mark.asyncio
+async def test_run_once_purges_finished_outbox_rows_in_batches():
+    uow = FakeUnitOfWork()
+    uow.codes.purge_expired.return_value = 0
+    uow.outbox.purge_finished.side_effect = [2, 1]
+
+    result = await ActivationCodeReaper(uow, FakeSettings()).run_once()
+
+    assert result.outbox_purged == 3
+    assert result.batches == 3
+    for call in uow.outbox.purge_finished.await_args_list:
+        assert call.kwargs["limit"] == 2
+        assert call.kwargs["max_attempts"] == 5
@@ -0,0 +1,117 @@
+import asyncio
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock
+from datetime import datetime, timedelta, timezone
+
+from app.domain.exceptions import UserAlreadyExists
+from app.infrastructure.email.client import EmailMessage
+from app.infrastructure.repositories.unit_of_work import Repositories
+from app.services.registration_batcher import RegistrationBatcher
+
+
+class FakeSettings:
+    registration_batch_max_size = 10
+    registration_batch_window_ms = 5.0
+
+
+class FakeUnitOfWork:
+    def __init__(self):
+        self.users = AsyncMock()
+        self.codes = AsyncMock()
+        self.outbox = AsyncMock()
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield Repositories(users=self.users, codes=self.codes, outbox=self.outbox)
+
+
+@pytest.fixture()
+def uow():
+    return FakeUnitOfWork()
+
+
+@pytest.fixture()
+def repos(uow):
+    return uow.users, uow.codes, uow.outbox
+
+
+def submit(batcher: RegistrationBatcher, email: str, hashed_password: str):
+    return batcher.submit(
+        email=email,
+        hashed_password=hashed_password,
+        hashed_code="code",
+        expires_at=datetime.now(tz=timezone.utc) + timedelta(minutes=1),
+        message=EmailMessage(
+            to=email, subject="s", body="b", sender="no-reply@test.local"
+        ),
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_registrations_share_one_transaction(uow, repos):
+    users_repo, codes_repo, outbox_repo = repos
+    users_repo.create_many.return_value = {
+        "a@example.com": 1,
+        "b@example.com": 2,
+    }
+
+    batcher = RegistrationBatcher(uow, FakeSettings())
+    batcher.start()
+    try:
+        results = await asyncio.gather(
+            submit(batcher, "a@example.com", "hash-a"),
+            submit(batcher, "b@example.com", "hash-b"),
+        )
+    finally:
+        await batcher.stop()
+
+    assert results == [1, 2]
+    users_repo.create_many.assert_awaited_once_with(
+        [("a@example.com", "hash-a"), ("b@example.com", "hash-b")]
+    )
+    codes_repo.create_or_replace_many.assert_awaited_once()
+    outbox_repo.enqueue_many.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_each_caller_gets_its_own_duplicate_error(uow, repos):
+    users_repo, _, outbox_repo = repos
+    users_repo.create_many.return_value = {"a@example.com": 1}
+
+    batcher = RegistrationBatcher(uow, FakeSettings())
+    batcher.start()
+    try:
+        results = await asyncio.gather(
+            submit(batcher, "a@example.com", "hash-a"),
+            submit(batcher, "A@example.com", "hash-a2"),
+            submit(batcher, "taken@example.com", "hash-t"),
+            return_exceptions=True,
+        )
+    finally:
+        await batcher.stop()
+
+    assert results[0] == 1
+    assert isinstance(results[1], UserAlreadyExists)
+    assert isinstance(results[2], UserAlreadyExists)
+    messages, = outbox_repo.enqueue_many.await_args.args
+    assert [m.to for m in messages] == ["a@example.com"]
+
+
+@pytest.mark.asyncio
+async def test_batch_failure_is_propagated_to_all_callers(uow, repos):
+    users_repo, _, _ = repos
+    users_repo.create_many.side_effect = RuntimeError("db down")
+
+    batcher = RegistrationBatcher(uow, FakeSettings())
+    batcher.start()
+    try:
+        results = await asyncio.gather(
+            submit(batcher, "a@example.com", "hash-a"),
+            submit(batcher, "b@example.com", "hash-b"),
+            return_exceptions=True,
+        )
+    finally:
+        await batcher.stop()
+
+    assert all(isinstance(r, RuntimeError) for r in results)
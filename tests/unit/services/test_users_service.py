@@ -1,104 +1,74 @@
+import asyncio
+
 import pytest
-from unittest.mock import AsyncMock, MagicMock
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock
 from datetime import datetime, timedelta, timezone
 
 from app.services.users_service import UsersService
 from app.domain.exceptions import (
     UserAlreadyExists,
+    IdempotencyKeyReused,
     InvalidCredentials,
     InvalidActivationCode,
     ActivationCodeExpired,
     UserAlreadyActive,
 )
 from app.domain.models.user import User
+from app.domain.security import hash_password, hash_rounds
 from app.domain.models.activation_code import ActivationCode
+from app.infrastructure.credential_cache import CredentialCache
+from app.infrastructure.database import Database
+from app.infrastructure.repositories.unit_of_work import (
+    MySQLUnitOfWork,
+    Repositories,
+)
 
 
 class FakeSettings:
     activation_code_ttl = timedelta(minutes=1)
     email_from = "no-reply@test.local"
     environment = "test"
+    password_hasher_executor = "thread"
+    password_hasher_max_workers = 1
+    bcrypt_rounds = 4
+    credential_cache_max_entries = 100
+    credential_cache_ttl_seconds = 60.0
+    idempotency_key_max_entries = 100
+    idempotency_key_ttl_seconds = 60.0
 
 
-class FakeCursor:
-    async def execute(self, *args, **kwargs):
-        return None
-
-    async def fetchone(self):
-        return None
-
-    async def fetchall(self):
-        return []
-
-    @property
-    def lastrowid(self):
-        return 1
-
-    async def __aenter__(self):
-        return self
-
-    async def __aexit__(self, exc_type, exc, tb):
-        return False
-
-
-class FakeConnection:
-    def cursor(self, *args, **kwargs):
-        return FakeCursor()
-
-    async def begin(self):
-        return None
-
-    async def commit(self):
-        return None
-
-    async def rollback(self):
-        return None
-
-
-class FakeTransaction:
-    async def __aenter__(self):
-        return FakeConnection()
-
-    async def __aexit__(self, exc_type, exc, tb):
-        return False
-
-    async def __aexit__(self, exc_type, exc, tb):
-        return False
+class FakeUnitOfWork:
+    def __init__(self):
+        self.users = AsyncMock()
+        self.codes = AsyncMock()
+        self.outbox = AsyncMock()
 
+    @asynccontextmanager
+    async def transaction(self):
+        yield Repositories(users=self.users, codes=self.codes, outbox=self.outbox)
 
-class FakeDatabase:
-    def transaction(self):
-        return FakeTransaction()
+    def connection(self):
+        return self.transaction()
 
-    def get_connection(self):
-        return FakeTransaction()
+    async def release_connection(self):
+        pass
 
 
 @pytest.mark.asyncio
-async def test_register_ok(monkeypatch):
-    db = FakeDatabase()
-    email_client = AsyncMock()
+async def test_register_ok():
+    uow = FakeUnitOfWork()
     settings = FakeSettings()
 
     service = UsersService(
-        db=db,
-        email_client=email_client,
+        uow=uow,
         settings=settings,
     )
 
-    users_repo = AsyncMock()
-    codes_repo = AsyncMock()
+    users_repo = uow.users
+    codes_repo = uow.codes
+    outbox_repo = uow.outbox
 
-    monkeypatch.setattr(
-        "app.services.users_service.UsersRepository",
-        lambda conn: users_repo
-    )
-    monkeypatch.setattr(
-        "app.services.users_service.ActivationCodeRepository",
-        lambda conn: codes_repo
-    )
-
-    users_repo.get_by_email.return_value = None
     users_repo.create.return_value = 42
 
     user_id = await service.register(
@@ -107,27 +77,22 @@ async def test_register_ok(monkeypatch):
     )
 
     assert user_id == 42
-    users_repo.get_by_email.assert_awaited_once_with("test@example.com")
+    users_repo.get_by_email.assert_not_called()
     users_repo.create.assert_awaited_once()
     codes_repo.create_or_replace.assert_awaited_once()
-    email_client.send.assert_awaited_once()
+    outbox_repo.enqueue.assert_awaited_once()
 
 
 @pytest.mark.asyncio
-async def test_register_user_already_exists(monkeypatch):
-    db = FakeDatabase()
-    email_client = AsyncMock()
+async def test_register_user_already_exists():
+    uow = FakeUnitOfWork()
     settings = FakeSettings()
 
-    service = UsersService(db, email_client, settings)
-
-    users_repo = AsyncMock()
-    monkeypatch.setattr(
-        "app.services.users_service.UsersRepository",
-        lambda conn: users_repo
-    )
+    service = UsersService(uow, settings)
 
-    users_repo.get_by_email.return_value = MagicMock()
+    users_repo = uow.users
+    outbox_repo = uow.outbox
+    users_repo.create.side_effect = UserAlreadyExists()
 
     with pytest.raises(UserAlreadyExists):
         await service.register(
@@ -135,28 +100,18 @@ async def test_register_user_already_exists(monkeypatch):
             password="password123",
         )
 
-    email_client.send.assert_not_called()
+    outbox_repo.enqueue.assert_not_called()
 
 
 @pytest.mark.asyncio
-async def test_activate_ok(monkeypatch):
-    db = FakeDatabase()
+async def test_activate_ok():
+    uow = FakeUnitOfWork()
     settings = FakeSettings()
-    service = UsersService(db, AsyncMock(), settings)
+    service = UsersService(uow, settings)
 
-    users_repo = AsyncMock()
-    codes_repo = AsyncMock()
+    users_repo = uow.users
 
-    monkeypatch.setattr(
-        "app.services.users_service.UsersRepository",
-        lambda conn: users_repo
-    )
-    monkeypatch.setattr(
-        "app.services.users_service.ActivationCodeRepository",
-        lambda conn: codes_repo
-    )
-
-    users_repo.get_by_id.return_value = User(
+    user = User(
         id=1,
         email="test@example.com",
         hashed_password="hash",
@@ -165,94 +120,87 @@ async def test_activate_ok(monkeypatch):
     )
 
     code = "1234"
-    codes_repo.get_for_update.return_value = ActivationCode(
+    activation_code = ActivationCode(
         user_id=1,
         hashed_code=service._hash_activation_code(code),
         expires_at=datetime.now(tz=timezone.utc) + timedelta(minutes=1),
         used=False,
     )
+    users_repo.get_with_activation_code_for_update.return_value = (
+        user, activation_code
+    )
 
     await service.activate(user_id=1, code=code)
 
-    users_repo.activate.assert_awaited_once_with(1)
-    codes_repo.mark_used.assert_awaited_once_with(1)
+    users_repo.get_with_activation_code_for_update.assert_awaited_once_with(1)
+    users_repo.activate_with_code.assert_awaited_once_with(1)
 
 
 @pytest.mark.asyncio
-async def test_activate_user_already_active(monkeypatch):
-    db = FakeDatabase()
+async def test_activate_unknown_user():
+    uow = FakeUnitOfWork()
     settings = FakeSettings()
-    service = UsersService(db, AsyncMock(), settings)
+    service = UsersService(uow, settings)
 
-    users_repo = AsyncMock()
-    monkeypatch.setattr(
-        "app.services.users_service.UsersRepository",
-        lambda conn: users_repo
-    )
+    users_repo = uow.users
+    users_repo.get_with_activation_code_for_update.return_value = (None, None)
+
+    with pytest.raises(InvalidCredentials):
+        await service.activate(1, "1234")
+
+    users_repo.activate_with_code.assert_not_called()
 
-    users_repo.get_by_id.return_value = User(
+
+@pytest.mark.asyncio
+async def test_activate_user_already_active():
+    uow = FakeUnitOfWork()
+    settings = FakeSettings()
+    service = UsersService(uow, settings)
+
+    users_repo = uow.users
+    user = User(
         id=1,
         email="test@example.com",
         hashed_password="hash",
         is_active=True,
         created_at=datetime.now(tz=timezone.utc),
     )
+    users_repo.get_with_activation_code_for_update.return_value = (user, None)
 
     with pytest.raises(UserAlreadyActive):
         await service.activate(1, "1234")
 
 
 @pytest.mark.asyncio
-async def test_activate_invalid_code(monkeypatch):
-    db = FakeDatabase()
+async def test_activate_invalid_code():
+    uow = FakeUnitOfWork()
     settings = FakeSettings()
-    service = UsersService(db, AsyncMock(), settings)
-
-    users_repo = AsyncMock()
-    codes_repo = AsyncMock()
+    service = UsersService(uow, settings)
 
-    monkeypatch.setattr(
-        "app.services.users_service.UsersRepository",
-        lambda conn: users_repo
-    )
-    monkeypatch.setattr(
-        "app.services.users_service.ActivationCodeRepository",
-        lambda conn: codes_repo
-    )
+    users_repo = uow.users
 
-    users_repo.get_by_id.return_value = User(
+    user = User(
         id=1,
         email="test@example.com",
         hashed_password="hash",
         is_active=False,
         created_at=datetime.now(tz=timezone.utc),
     )
-
-    codes_repo.get_for_update.return_value = None
+    users_repo.get_with_activation_code_for_update.return_value = (user, None)
 
     with pytest.raises(InvalidActivationCode):
         await service.activate(1, "1234")
 
 
 @pytest.mark.asyncio
-async def test_activate_expired_code(monkeypatch):
-    db = FakeDatabase()
+async def test_activate_expired_code():
+    uow = FakeUnitOfWork()
     settings = FakeSettings()
-    service = UsersService(db, AsyncMock(), settings)
+    service = UsersService(uow, settings)
 
-    users_repo = AsyncMock()
-    codes_repo = AsyncMock()
+    users_repo = uow.users
 
-    monkeypatch.setattr(
-        "app.services.users_service.UsersRepository",
-        lambda conn: users_repo
-    )
-    monkeypatch.setattr(
-        "app.services.users_service.ActivationCodeRepository",
-        lambda conn: codes_repo
-    )
-
-    users_repo.get_by_id.return_value = User(
+    user = User(
         id=1,
         email="test@example.com",
         hashed_password="hash",
@@ -260,29 +208,29 @@ async def test_activate_expired_code(monkeypatch):
         created_at=datetime.now(tz=timezone.utc),
     )
 
-    codes_repo.get_for_update.return_value = ActivationCode(
+    activation_code = ActivationCode(
         user_id=1,
         hashed_code=service._hash_activation_code("1234"),
         expires_at=datetime.now(tz=timezone.utc) - timedelta(minutes=1),
         used=False,
     )
+    users_repo.get_with_activation_code_for_update.return_value = (
+        user, activation_code
+    )
 
     with pytest.raises(ActivationCodeExpired):
         await service.activate(1, "1234")
 
+    users_repo.activate_with_code.assert_not_called()
+
 
 @pytest.mark.asyncio
-async def test_verify_credentials_ok(monkeypatch):
-    db = FakeDatabase()
+async def test_verify_credentials_ok():
+    uow = FakeUnitOfWork()
     settings = FakeSettings()
-    service = UsersService(db, AsyncMock(), settings)
-
-    users_repo = AsyncMock()
-    monkeypatch.setattr(
-        "app.services.users_service.UsersRepository",
-        lambda conn: users_repo
-    )
+    service = UsersService(uow, settings)
 
+    users_repo = uow.users
     users_repo.get_by_email.return_value = User(
         id=1,
         email="test@example.com",
@@ -291,10 +239,7 @@ async def test_verify_credentials_ok(monkeypatch):
         created_at=datetime.now(tz=timezone.utc),
     )
 
-    monkeypatch.setattr(
-        "app.services.users_service.verify_password",
-        lambda plain, hashed: True
-    )
+    service.password_hasher.verify_password = AsyncMock(return_value=True)
 
     user_id = await service.verify_credentials(
         "test@example.com",
@@ -302,3 +247,347 @@ async def test_verify_credentials_ok(monkeypatch):
     )
 
     assert user_id == 1
+
+
+@pytest.mark.asyncio
+async def test_verify_credentials_uses_credential_cache():
+    uow = FakeUnitOfWork()
+    settings = FakeSettings()
+    cache = CredentialCache(settings)
+    service = UsersService(uow, settings, credential_cache=cache)
+
+    users_repo = uow.users
+    users_repo.get_by_email.return_value = User(
+        id=1,
+        email="test@example.com",
+        hashed_password="hashed",
+        is_active=True,
+        created_at=datetime.now(tz=timezone.utc),
+    )
+    service.password_hasher.verify_password = AsyncMock(return_value=True)
+
+    assert await service.verify_credentials("test@example.com", "password") == 1
+    assert await service.verify_credentials("test@example.com", "password") == 1
+
+    service.password_hasher.verify_password.assert_awaited_once()
+    assert cache.hits == 1
+
+
+class UserRowCursor:
+    def __init__(self, row):
+        self._row = row
+
+    async def execute(self, *args, **kwargs):
+        pass
+
+    async def fetchone(self):
+        return self._row
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class UserRowConnection:
+    def __init__(self, row):
+        self._row = row
+
+    def cursor(self, *args, **kwargs):
+        return UserRowCursor(self._row)
+
+    def get_transaction_status(self):
+        return False
+
+    async def begin(self):
+        pass
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+
+class CountingPool:
+    def __init__(self, row):
+        self._row = row
+        self.checked_out = 0
+        self.acquired = 0
+
+    async def _acquire(self):
+        self.checked_out += 1
+        self.acquired += 1
+        return UserRowConnection(self._row)
+
+    def acquire(self):
+        return self._acquire()
+
+    async def release(self, conn):
+        self.checked_out -= 1
+
+
+@pytest.mark.asyncio
+async def test_verify_credentials_holds_no_connection_during_bcrypt():
+    settings = FakeSettings()
+    settings.db_pool_max_waiting = 10
+    settings.db_pool_acquire_timeout_seconds = 1.0
+    pool = CountingPool(
+        (1, "test@example.com", "hashed", True, datetime.now(tz=timezone.utc))
+    )
+    db = Database(settings)
+    db.pool = pool
+    service = UsersService(MySQLUnitOfWork(db), settings)
+
+    held_during_verify = []
+
+    async def verify_password(password, hashed_password):
+        held_during_verify.append(pool.checked_out)
+        return True
+
+    service.password_hasher.verify_password = verify_password
+
+    async with db.request_scope():
+        assert await service.verify_credentials("test@example.com", "password") == 1
+
+    assert held_during_verify == [0]
+    assert pool.checked_out == 0
+
+
+@pytest.mark.asyncio
+async def test_cached_credential_activation_checks_out_one_connection():
+    settings = FakeSettings()
+    settings.db_pool_max_waiting = 10
+    settings.db_pool_acquire_timeout_seconds = 1.0
+    now = datetime.now(tz=timezone.utc)
+    cache = CredentialCache(settings)
+    cache.store("test@example.com", "password", 1, "hashed")
+    db = Database(settings)
+    service = UsersService(MySQLUnitOfWork(db), settings, credential_cache=cache)
+    # users columns, then the joined activation_codes columns
+    db.pool = pool = CountingPool(
+        (
+            1, "test@example.com", "hashed", False, now,
+            1, service._hash_activation_code("1234"), now + timedelta(minutes=1), False,
+        )
+    )
+    service.password_hasher.verify_password = AsyncMock(return_value=True)
+
+    async with db.request_scope():
+        user_id = await service.verify_credentials("test@example.com", "password")
+        await service.activate(user_id, "1234")
+
+    service.password_hasher.verify_password.assert_not_awaited()
+    assert pool.acquired == 1
+    assert pool.checked_out == 0
+
+
+@pytest.mark.asyncio
+async def test_register_uses_registration_batcher_when_enabled():
+    batcher = AsyncMock()
+    batcher.submit.return_value = 7
+    service = UsersService(
+        FakeUnitOfWork(), FakeSettings(), registration_batcher=batcher
+    )
+    service.password_hasher.hash_password = AsyncMock(return_value="hashed")
+
+    user_id = await service.register("test@example.com", "password123")
+
+    assert user_id == 7
+    kwargs = batcher.submit.await_args.kwargs
+    assert kwargs["email"] == "test@example.com"
+    assert kwargs["hashed_password"] == "hashed"
+    assert kwargs["message"].to == "test@example.com"
+
+
+@pytest.mark.asyncio
+async def test_verify_credentials_rehashes_outdated_cost():
+    uow = FakeUnitOfWork()
+    settings = FakeSettings()
+    cache = CredentialCache(settings)
+    service = UsersService(uow, settings, credential_cache=cache)
+
+    old_hash = hash_password("password", rounds=5)
+    uow.users.get_by_email.return_value = User(
+        id=1,
+        email="test@example.com",
+        hashed_password=old_hash,
+        is_active=True,
+        created_at=datetime.now(tz=timezone.utc),
+    )
+    uow.users.update_password_hash.return_value = True
+
+    assert await service.verify_credentials("test@example.com", "password") == 1
+
+    user_id, expected_old, new_hash = uow.users.update_password_hash.await_args.args
+    assert (user_id, expected_old) == (1, old_hash)
+    assert hash_rounds(new_hash) == settings.bcrypt_rounds
+    assert cache.lookup("test@example.com", "password", new_hash) == 1
+
+
+@pytest.mark.asyncio
+async def test_verify_credentials_skips_rehash_for_current_cost():
+    uow = FakeUnitOfWork()
+    service = UsersService(uow, FakeSettings())
+
+    uow.users.get_by_email.return_value = User(
+        id=1,
+        email="test@example.com",
+        hashed_password=hash_password("password", rounds=4),
+        is_active=True,
+        created_at=datetime.now(tz=timezone.utc),
+    )
+
+    assert await service.verify_credentials("test@example.com", "password") == 1
+    uow.users.update_password_hash.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicate_registrations_share_one_execution():
+    uow = FakeUnitOfWork()
+    service = UsersService(uow, FakeSettings())
+    uow.users.create.return_value = 42
+
+    results = await asyncio.gather(
+        service.register("test@example.com", "password123"),
+        service.register("TEST@example.com", "password123"),
+        service.register("test@example.com", "other-password"),
+        return_exceptions=True,
+    )
+
+    assert results[:2] == [42, 42]
+    assert isinstance(results[2], UserAlreadyExists)
+    uow.users.create.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_share_the_failure():
+    uow = FakeUnitOfWork()
+    service = UsersService(uow, FakeSettings())
+    uow.users.create.side_effect = UserAlreadyExists()
+
+    results = await asyncio.gather(
+        service.register("test@example.com", "password123"),
+        service.register("test@example.com", "password123"),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, UserAlreadyExists) for result in results)
+    uow.users.create.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_idempotency_key_replays_the_first_outcome():
+    uow = FakeUnitOfWork()
+    service = UsersService(uow, FakeSettings())
+    uow.users.create.return_value = 42
+
+    first = await service.register("test@example.com", "password123", "key-1")
+    retry = await service.register("test@example.com", "password123", "key-1")
+
+    assert first == retry == 42
+    uow.users.create.assert_awaited_once()
+
+    with pytest.raises(IdempotencyKeyReused):
+        await service.register("other@example.com", "password123", "key-1")
+
+
+@pytest.mark.asyncio
+async def test_idempotency_key_replays_errors_as_new_exceptions():
+    uow = FakeUnitOfWork()
+    service = UsersService(uow, FakeSettings())
+    uow.users.create.side_effect = UserAlreadyExists()
+
+    with pytest.raises(UserAlreadyExists) as first:
+        await service.register("test@example.com", "secret-pw", "key-1")
+    replays = []
+    for _ in range(3):
+        with pytest.raises(UserAlreadyExists) as replay:
+            await service.register("test@example.com", "secret-pw", "key-1")
+        replays.append(replay.value)
+
+    assert first.value not in replays
+    assert len({id(error) for error in replays}) == 3
+    for error in replays:
+        # Only the replaying register() frame, none from the first attempt
+        frames = [tb.tb_frame.f_code.co_name for tb in _walk_tb(error)]
+        assert frames.count("register") == 1
+        assert "_register_once" not in frames
+    uow.users.create.assert_awaited_once()
+
+
+def _walk_tb(error):
+    tb = error.__traceback__
+    while tb is not None:
+        yield tb
+        tb = tb.tb_next
+
+
+@pytest.mark.asyncio
+async def test_idempotency_key_rejects_a_different_password():
+    uow = FakeUnitOfWork()
+    service = UsersService(uow, FakeSettings())
+    uow.users.create.return_value = 42
+
+    await service.register("test@example.com", "password123", "key-1")
+
+    with pytest.raises(IdempotencyKeyReused):
+        await service.register("test@example.com", "other-password", "key-1")
+    assert await service.register("TEST@example.com", "password123", "key-1") == 42
+    uow.users.create.assert_awaited_once()
+
+
+class FakeEmailFilter:
+    def __init__(self, known: set[str]):
+        self.known = known
+
+    def might_exist(self, email: str) -> bool:
+        return email.lower() in self.known
+
+    def add(self, email: str) -> None:
+        self.known.add(email.lower())
+
+
+@pytest.mark.asyncio
+async def test_verify_credentials_skips_database_for_unknown_email():
+    uow = FakeUnitOfWork()
+    service = UsersService(uow, FakeSettings(), email_filter=FakeEmailFilter(set()))
+
+    with pytest.raises(InvalidCredentials):
+        await service.verify_credentials("unknown@example.com", "password")
+
+    uow.users.get_by_email.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_register_prechecks_probably_taken_email_before_hashing():
+    uow = FakeUnitOfWork()
+    email_filter = FakeEmailFilter({"test@example.com"})
+    service = UsersService(uow, FakeSettings(), email_filter=email_filter)
+    service.password_hasher.hash_password = AsyncMock()
+    uow.users.get_by_email.return_value = User(
+        id=1,
+        email="test@example.com",
+        hashed_password="hashed",
+        is_active=False,
+        created_at=datetime.now(tz=timezone.utc),
+    )
+
+    with pytest.raises(UserAlreadyExists):
+        await service.register("test@example.com", "password123")
+
+    service.password_hasher.hash_password.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_register_adds_new_email_to_filter():
+    uow = FakeUnitOfWork()
+    email_filter = FakeEmailFilter(set())
+    service = UsersService(uow, FakeSettings(), email_filter=email_filter)
+    uow.users.create.return_value = 42
+
+    await service.register("New@example.com", "password123")
+
+    uow.users.get_by_email.assert_not_called()
+    assert email_filter.might_exist("new@example.com")